@@ -0,0 +1,13 @@
+"""
+Pruebas de rendimiento de los controladores.
+
+Genera una BD sintética del tamaño que se pida (clientes, años de
+reservas y pagos), mide los métodos públicos de los controladores
+(p50 / p95 y memoria máxima) y compara con una medición anterior
+guardada para detectar empeoramientos:
+
+    python -m benchmark --clientes 100000 --guardar base.json
+    python -m benchmark --clientes 100000 --comparar base.json
+
+La BD sintética es un fichero aparte: gym.db no se toca.
+"""
@@ -0,0 +1,109 @@
+# ---------------------------------------------------------
+#   python -m benchmark
+# ---------------------------------------------------------
+
+import argparse
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+from benchmark.datos_sinteticos import generar_bd
+from benchmark import informe
+from benchmark.medicion import medir
+
+
+def _argumentos():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark",
+        description="Mide los controladores sobre una BD sintética."
+    )
+    parser.add_argument("--bd", help="fichero de la BD sintética (por defecto, en el directorio temporal)")
+    parser.add_argument("--clientes", type=int, default=10000)
+    parser.add_argument("--anios", type=int, default=2, help="años de historial de reservas y pagos")
+    parser.add_argument("--reservas-dia", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--regenerar", action="store_true", help="vuelve a crear la BD aunque exista")
+    parser.add_argument("--guardar", metavar="JSON", help="guarda los resultados como base")
+    parser.add_argument("--comparar", metavar="JSON", help="compara con una base guardada")
+    parser.add_argument("--umbral", type=float, default=0.25, help="empeoramiento tolerado (0.25 = 25 %%)")
+    parser.add_argument("--solo", metavar="TEXTO", help="mide solo los escenarios que contengan TEXTO")
+    return parser.parse_args()
+
+
+def main():
+    args = _argumentos()
+
+    ruta = os.path.abspath(args.bd or os.path.join(
+        tempfile.gettempdir(), f"gftm_bench_{args.clientes}_{args.anios}.db"
+    ))
+
+    if args.regenerar and os.path.exists(ruta):
+        os.remove(ruta)
+
+    if not os.path.exists(ruta):
+        print(f"Generando {ruta} ({args.clientes} clientes, {args.anios} años)...")
+        filas = generar_bd(ruta, args.clientes, args.anios, args.reservas_dia, semilla=args.semilla)
+        print("  " + ", ".join(f"{tabla}: {n}" for tabla, n in filas.items()))
+
+    # Los controladores abren GestorBD() sin ruta: tiene que apuntar
+    # a la BD sintética antes de crear ninguno
+    os.environ["GFTM_BD"] = ruta
+    from benchmark.escenarios import Contexto, escenarios
+
+    ctx = Contexto(args.semilla)
+    ctx.db.conectar()
+    try:
+        datos = {
+            tabla: ctx.db.obtener_datos(f"SELECT COUNT(*) FROM {tabla}")[0][0]
+            for tabla in ("Cliente", "Aparato", "Reserva", "Pago")
+        }
+    finally:
+        ctx.db.desconectar()
+
+    resultados = {}
+    try:
+        for escenario in escenarios(ctx):
+            if args.solo and args.solo.lower() not in escenario.nombre.lower():
+                continue
+            print(f"  {escenario.nombre}...", file=sys.stderr)
+            resultados[escenario.nombre] = medir(
+                escenario.funcion,
+                escenario.repeticiones or args.repeticiones,
+                antes=escenario.antes
+            )
+    finally:
+        ctx.limpiar()
+
+    resultado = {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "maquina": platform.platform(),
+        },
+        "datos": datos,
+        "resultados": resultados,
+    }
+
+    informe.imprimir(resultado)
+
+    if args.guardar:
+        informe.guardar(resultado, args.guardar)
+        print(f"\nResultados guardados en {args.guardar}")
+
+    if args.comparar:
+        regresiones = informe.comparar(resultado, informe.cargar(args.comparar), args.umbral)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresiones por encima del {args.umbral:.0%}")
+            return 1
+        print("\nSin regresiones")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
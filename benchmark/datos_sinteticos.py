@@ -0,0 +1,204 @@
+# ---------------------------------------------------------
+#   DATOS SINTÉTICOS
+#   Rellena una BD vacía con clientes, aparatos y años de
+#   reservas y pagos con el aspecto de los reales.
+# ---------------------------------------------------------
+
+import random
+from datetime import date, timedelta
+
+from data.gestor_bd import GestorBD
+from controller.motor_disponibilidad import tramo_a_hora, TRAMOS_DIA
+from util.validaciones import validar_dni
+
+LETRAS_DNI = "TRWAGMYFPDXBNJZSQVHLCKE"
+
+# Filas por executemany (y por transacción)
+TAMANO_LOTE = 5000
+
+NOMBRES = [
+    "Antonio", "Manuel", "José", "Francisco", "David", "Juan", "Javier",
+    "Daniel", "Carlos", "Alejandro", "Martín", "Sergio", "Pablo", "Raúl",
+    "María", "Carmen", "Ana", "Laura", "Lucía", "Marta", "Patricia",
+    "Cristina", "Elena", "Paula", "Sara", "Andrea", "Irene", "Sofía",
+]
+
+APELLIDOS = [
+    "García", "Rodríguez", "González", "Fernández", "López", "Martínez",
+    "Sánchez", "Pérez", "Gómez", "Martín", "Jiménez", "Ruiz", "Hernández",
+    "Díaz", "Moreno", "Muñoz", "Álvarez", "Romero", "Alonso", "Gutiérrez",
+    "Navarro", "Torres", "Domínguez", "Vázquez", "Ramos", "Gil", "Ramírez",
+    "Serrano", "Blanco", "Molina", "Morales", "Suárez", "Ortega", "Rivero",
+]
+
+APARATOS = [
+    ("Cinta de correr", "cardio"),
+    ("Elíptica", "cardio"),
+    ("Bicicleta estática", "cardio"),
+    ("Máquina de remo", "cardio"),
+    ("Banco de pesas", "fuerza"),
+    ("Prensa de piernas", "fuerza"),
+    ("Jaula de sentadillas", "fuerza"),
+    ("Polea alta", "fuerza"),
+]
+
+METODOS_PAGO = ["efectivo", "tarjeta", "transferencia", "bizum"]
+
+
+def dni_valido(numero):
+    """DNI de 8 cifras con su letra de control correcta."""
+    return f"{numero:08d}{LETRAS_DNI[numero % 23]}"
+
+
+def generar_bd(ruta, clientes=10000, anios=2, reservas_dia=200,
+               aparatos_por_modelo=5, semilla=42):
+    """
+    Crea las tablas en `ruta` (que debe estar vacía) y las rellena.
+    Devuelve {tabla: filas insertadas}.
+    """
+    azar = random.Random(semilla)
+    gestor = GestorBD(ruta)
+
+    hoy = date.today()
+    inicio = hoy - timedelta(days=365 * anios)
+
+    gestor.conectar()
+    try:
+        gestor.crear_tablas()
+
+        n_aparatos = _insertar(gestor, "Aparato", _aparatos(aparatos_por_modelo))
+        n_clientes = _insertar(gestor, "Cliente", _clientes(azar, clientes, inicio, hoy))
+
+        altas = gestor.obtener_datos("SELECT id_cliente, fecha_alta, estado FROM Cliente")
+        n_reservas = _insertar(
+            gestor, "Reserva",
+            _reservas(azar, altas, n_aparatos, inicio, hoy + timedelta(days=14), reservas_dia)
+        )
+        n_pagos = _insertar(gestor, "Pago", _pagos(azar, altas, hoy))
+
+        gestor.ejecutar_query("ANALYZE")
+    finally:
+        gestor.desconectar()
+
+    return {
+        "Aparato": n_aparatos,
+        "Cliente": n_clientes,
+        "Reserva": n_reservas,
+        "Pago": n_pagos,
+    }
+
+
+# ---------------------------------------------------------
+#   GENERADORES DE FILAS
+# ---------------------------------------------------------
+def _aparatos(por_modelo):
+    for nombre, tipo in APARATOS:
+        for i in range(1, por_modelo + 1):
+            yield {
+                "nombre": f"{nombre} {i:02d}",
+                "tipo": tipo,
+                "estado": "disponible",
+                "descripcion": f"{nombre} (datos de prueba)",
+            }
+
+
+def _clientes(azar, cantidad, inicio, hoy):
+    dias = (hoy - inicio).days
+    base = azar.randrange(10_000_000, 50_000_000)
+
+    for i in range(cantidad):
+        dni = dni_valido(base + i)
+        if not validar_dni(dni):
+            raise ValueError(f"DNI generado no válido: {dni}")
+
+        nombre = azar.choice(NOMBRES)
+        apellidos = f"{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"
+
+        yield {
+            "nombre": nombre,
+            "apellidos": apellidos,
+            "dni": dni,
+            "email": f"socio{i}@example.com",
+            "telefono": f"6{azar.randrange(10**8):08d}",
+            "fecha_alta": str(inicio + timedelta(days=azar.randrange(dias + 1))),
+            "estado": "activo" if azar.random() < 0.9 else "inactivo",
+        }
+
+
+def _reservas(azar, altas, n_aparatos, inicio, fin, por_dia):
+    """Reservas de lunes a viernes, sin solapes por aparato."""
+    ids_clientes = [c[0] for c in altas]
+    hoy = str(date.today())
+    huecos_dia = n_aparatos * (TRAMOS_DIA - 1)
+
+    dia = inicio
+    while dia <= fin:
+        if dia.weekday() < 5:
+            fecha = str(dia)
+
+            for hueco in azar.sample(range(huecos_dia), min(por_dia, huecos_dia)):
+                id_aparato, tramo = divmod(hueco, TRAMOS_DIA - 1)
+
+                if fecha < hoy:
+                    estado = "cancelada" if azar.random() < 0.05 else "confirmada"
+                else:
+                    estado = "pendiente"
+
+                yield {
+                    "id_cliente": azar.choice(ids_clientes),
+                    "id_aparato": id_aparato + 1,
+                    "fecha_reserva": fecha,
+                    "hora_inicio": tramo_a_hora(tramo),
+                    "hora_fin": tramo_a_hora(tramo + 1),
+                    "estado": estado,
+                }
+        dia += timedelta(days=1)
+
+
+def _pagos(azar, altas, hoy):
+    """Un recibo por mes desde el alta; casi todos cobrados salvo los últimos."""
+    mes_actual = hoy.strftime("%Y-%m")
+
+    for id_cliente, fecha_alta, estado in altas:
+        anio, mes = int(fecha_alta[:4]), int(fecha_alta[5:7])
+
+        while f"{anio}-{mes:02d}" <= mes_actual:
+            texto_mes = f"{anio}-{mes:02d}"
+            reciente = texto_mes == mes_actual
+            pagado = azar.random() < (0.4 if reciente else 0.97)
+            fecha_pago = f"{texto_mes}-{azar.randrange(1, 29):02d}" if pagado else None
+
+            yield {
+                "id_cliente": id_cliente,
+                "mes": texto_mes,
+                "fecha_generacion": f"{texto_mes}-01",
+                "pagado": int(pagado),
+                "fecha_pago": fecha_pago,
+                "cuota": 30,
+                "metodo_pago": azar.choice(METODOS_PAGO) if pagado else None,
+                "concepto": f"Cuota {texto_mes}",
+            }
+
+            mes += 1
+            if mes > 12:
+                anio, mes = anio + 1, 1
+
+            # Los inactivos dejan de generar recibos al cabo de un tiempo
+            if estado != "activo" and azar.random() < 0.1:
+                break
+
+
+def _insertar(gestor, tabla, filas):
+    total = 0
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) == TAMANO_LOTE:
+            gestor.insertar_lote(tabla, lote)
+            total += len(lote)
+            lote = []
+
+    if lote:
+        gestor.insertar_lote(tabla, lote)
+        total += len(lote)
+    return total
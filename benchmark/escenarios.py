@@ -0,0 +1,359 @@
+# ---------------------------------------------------------
+#   ESCENARIOS
+#   Qué se mide: los métodos públicos de los controladores
+#   con argumentos sacados de la propia BD sintética.
+# ---------------------------------------------------------
+
+import itertools
+import random
+from collections import namedtuple
+from datetime import date, timedelta
+
+from controller.aparato_controller import AparatoController
+from controller.cliente_controller import ClienteController
+from controller.pago_controller import PagoController
+from controller.reserva_controller import ReservaController
+from controller.usuario_controller import UsuarioController
+from controller.motor_disponibilidad import obtener_motor, tramo_a_hora
+from benchmark.datos_sinteticos import dni_valido
+
+# repeticiones=None → las que se pidan por línea de comandos
+Escenario = namedtuple("Escenario", "nombre funcion antes repeticiones", defaults=(None, None))
+
+# Las escrituras van a fechas y meses que los datos sintéticos no usan,
+# y se borran al terminar
+ANIO_ESCRITURAS = 2090
+
+# Columnas de Pago que cambia marcar_pago_como_pagado
+COLUMNAS_MARCAR_PAGO = ("pagado", "fecha_pago", "metodo_pago", "concepto")
+
+
+class Contexto:
+    """Controladores y argumentos de ejemplo para los escenarios."""
+
+    def __init__(self, semilla=42):
+        self.azar = random.Random(semilla)
+
+        self.clientes = ClienteController()
+        self.aparatos = AparatoController()
+        self.reservas = ReservaController()
+        self.pagos = PagoController()
+        self.usuarios = UsuarioController()
+        self.db = self.clientes.db
+
+        self.db.conectar()
+        try:
+            # Con la misma semilla sale siempre el mismo cliente, para comparar mediciones
+            total = self._uno("SELECT COUNT(*) FROM Cliente")
+            self.id_cliente = self._uno(
+                "SELECT id_cliente FROM Cliente ORDER BY id_cliente LIMIT 1 OFFSET ?",
+                (self.azar.randrange(total),)
+            )
+            nombre, apellidos, self._telefono = self.db.obtener_datos(
+                "SELECT nombre, apellidos, telefono FROM Cliente WHERE id_cliente = ?",
+                (self.id_cliente,)
+            )[0]
+            self.id_aparato = self._uno("SELECT MIN(id_aparato) FROM Aparato")
+            self.tipo = self._uno("SELECT tipo FROM Aparato WHERE id_aparato = ?", (self.id_aparato,))
+            self.fecha = self._uno(
+                "SELECT fecha_reserva FROM Reserva WHERE fecha_reserva <= date('now') "
+                "ORDER BY fecha_reserva DESC LIMIT 1"
+            ) or str(date.today())
+            self.mes = self._uno("SELECT MAX(mes) FROM Pago") or date.today().strftime("%Y-%m")
+            self.id_pago_pendiente = self._uno("SELECT MAX(id_pago) FROM Pago WHERE pagado = 0")
+            self.id_pago = self._uno(
+                "SELECT MAX(id_pago) FROM Pago WHERE id_cliente = ?", (self.id_cliente,)
+            )
+            self.id_reserva = self._uno("SELECT MAX(id_reserva) FROM Reserva WHERE fecha_reserva <= date('now')")
+
+            # Lo que toca marcar_pago_como_pagado, para dejarlo como estaba
+            self._pago_original = None
+            if self.id_pago_pendiente is not None:
+                self._pago_original = dict(zip(
+                    COLUMNAS_MARCAR_PAGO,
+                    self.db.obtener_datos(
+                        f"SELECT {', '.join(COLUMNAS_MARCAR_PAGO)} FROM Pago WHERE id_pago = ?",
+                        (self.id_pago_pendiente,)
+                    )[0]
+                ))
+        finally:
+            self.db.desconectar()
+
+        # Búsquedas típicas de recepción: inicio de apellido, nombre + apellido, DNI
+        primer_apellido = apellidos.split()[0]
+        self.busquedas = [primer_apellido[:3], f"{nombre} {primer_apellido[:4]}"]
+
+        self._dnis = (dni_valido(n) for n in itertools.count(99_000_000))
+        self._huecos = self._huecos_libres()
+        self._meses = (f"{ANIO_ESCRITURAS + i // 12}-{i % 12 + 1:02d}" for i in itertools.count())
+        # Los pagos sueltos van 50 años más allá para no chocar con los generados
+        self._meses_sueltos = (
+            f"{ANIO_ESCRITURAS + 50 + i // 12}-{i % 12 + 1:02d}" for i in itertools.count()
+        )
+        # Las series de reservas, una semana cada vez desde el año siguiente
+        self._semanas = (
+            date(ANIO_ESCRITURAS + 1, 1, 1) + timedelta(weeks=i) for i in itertools.count()
+        )
+        self._usuarios = (f"bench_{i}" for i in itertools.count())
+
+        self._creados = []          # clientes
+        self._aparatos_creados = []
+        self._usuarios_creados = []
+
+        # Filas de prueba que se modifican o se borran en cada repetición
+        self._reserva = None
+        self._pago = None
+        self._aparato = None
+        self._usuario = None
+        self._por_borrar = None
+
+    def _uno(self, query, parametros=None):
+        filas = self.db.obtener_datos(query, parametros)
+        return filas[0][0] if filas else None
+
+    def _huecos_libres(self):
+        # (aparato, día laborable, tramo) nunca usados, para crear reservas
+        dia = date(ANIO_ESCRITURAS, 1, 1)
+        while True:
+            if dia.weekday() < 5:
+                for tramo in range(46):
+                    yield str(dia), tramo
+            dia += timedelta(days=1)
+
+    # ---------------------------------------------------------
+    #   ESCRITURAS
+    # ---------------------------------------------------------
+    def crear_cliente(self):
+        cliente = self.clientes.crear_cliente(
+            "Prueba", "Rendimiento", next(self._dnis), fecha_alta=str(date.today())
+        )
+        self._creados.append(cliente.id_cliente)
+        return cliente.id_cliente
+
+    def crear_reserva(self):
+        fecha, tramo = next(self._huecos)
+        return self.reservas.crear_reserva(
+            self.id_cliente, self.id_aparato, fecha,
+            tramo_a_hora(tramo), tramo_a_hora(tramo + 1)
+        )
+
+    def generar_pagos_mes(self):
+        self.pagos.generar_pagos_mensuales(next(self._meses))
+
+    def generar_pagos_trimestre(self):
+        inicio = next(self._meses)
+        next(self._meses)
+        self.pagos.generar_pagos_periodo(inicio, next(self._meses))
+
+    def crear_serie_reservas(self):
+        lunes = next(self._semanas)
+        self.reservas.crear_serie_reservas(
+            self.id_cliente, self.id_aparato, str(lunes), str(lunes + timedelta(days=6)),
+            [0, 1, 2, 3, 4], "10:00", "10:30"
+        )
+
+    def crear_pago(self):
+        return self.pagos.crear_pago(
+            self.id_cliente, next(self._meses_sueltos), str(date.today()), "tarjeta"
+        )
+
+    def crear_aparato(self):
+        aparato = self.aparatos.crear_aparato("Aparato de prueba", self.tipo)
+        self._aparatos_creados.append(aparato.id_aparato)
+        return aparato
+
+    def crear_usuario(self):
+        usuario = next(self._usuarios)
+        self.usuarios.crear_usuario(usuario, "prueba")
+        self._usuarios_creados.append(usuario)
+        return usuario
+
+    # Modificaciones sobre filas creadas para la prueba (se crean la primera vez)
+    def actualizar_reserva(self):
+        if self._reserva is None:
+            self._reserva = self.crear_reserva()
+        # Cambiar el estado obliga a comprobar solapes, como en recepción
+        self._reserva["estado"] = "confirmada" if self._reserva["estado"] != "confirmada" else "pendiente"
+        self.reservas.actualizar_reserva(self._reserva["id_reserva"], estado=self._reserva["estado"])
+
+    def actualizar_pago(self):
+        if self._pago is None:
+            self._pago = self.crear_pago()
+        self.pagos.actualizar_pago(self._pago.id_pago, concepto="Cuota (prueba)")
+
+    def actualizar_aparato(self):
+        if self._aparato is None:
+            self._aparato = self.crear_aparato()
+        self.aparatos.actualizar_aparato(self._aparato.id_aparato, descripcion="Revisado")
+
+    def resetear_password(self):
+        if self._usuario is None:
+            self._usuario = self.crear_usuario()
+        self.usuarios.resetear_password(self._usuario, "otra")
+
+    # Borrados: `antes` (fuera del cronómetro) crea la fila que se borra
+    def preparar_borrado(self, crear):
+        def antes():
+            self._por_borrar = crear()
+        return antes
+
+    def limpiar(self):
+        """Borra todo lo que hayan escrito los escenarios."""
+        self.db.conectar()
+        try:
+            with self.db.transaccion():
+                self.db.eliminar("Reserva", "fecha_reserva >= ?", (f"{ANIO_ESCRITURAS}-01-01",))
+                self.db.eliminar("Pago", "mes >= ?", (f"{ANIO_ESCRITURAS}-01",))
+                if self._creados:
+                    self.db.eliminar("Cliente", {"id_cliente": self._creados})
+                if self._aparatos_creados:
+                    self.db.eliminar("Aparato", {"id_aparato": self._aparatos_creados})
+                if self._usuarios_creados:
+                    self.db.eliminar("Usuario", {"usuario": self._usuarios_creados})
+
+                # Lo que se modificó de los datos sintéticos vuelve a su valor
+                self.db.actualizar("Cliente", {"telefono": self._telefono}, {"id_cliente": self.id_cliente})
+                if self._pago_original is not None:
+                    self.db.actualizar("Pago", self._pago_original, {"id_pago": self.id_pago_pendiente})
+        finally:
+            self.db.desconectar()
+
+        self._creados = []
+        self._aparatos_creados = []
+        self._usuarios_creados = []
+        self._reserva = self._pago = self._aparato = self._usuario = None
+        self.clientes.directorio.invalidar()
+        obtener_motor(self.db).invalidar()
+
+
+def escenarios(ctx):
+    """Lista de escenarios a medir sobre el contexto dado."""
+    motor = obtener_motor(ctx.db)
+    directorio = ctx.clientes.directorio
+    fin_semana = str(date.fromisoformat(ctx.fecha) + timedelta(days=6))
+
+    lista = [
+        # --- Clientes ---
+        Escenario("ClienteController.obtener_todos_clientes (página 100)",
+                  lambda: ctx.clientes.obtener_todos_clientes(limite=100)),
+        Escenario("ClienteController.obtener_todos_clientes (todos)",
+                  ctx.clientes.obtener_todos_clientes, repeticiones=5),
+        Escenario("ClienteController.obtener_cliente",
+                  lambda: ctx.clientes.obtener_cliente(ctx.id_cliente)),
+        Escenario("ClienteController.actualizar_cliente",
+                  lambda: ctx.clientes.actualizar_cliente(ctx.id_cliente, telefono="600000000")),
+        Escenario("ClienteController.crear_cliente", ctx.crear_cliente),
+        Escenario("ClienteController.eliminar_cliente",
+                  lambda: ctx.clientes.eliminar_cliente(ctx._por_borrar),
+                  antes=ctx.preparar_borrado(ctx.crear_cliente)),
+        Escenario("Directorio.clientes (carga en frío)",
+                  directorio.clientes, antes=directorio.invalidar, repeticiones=5),
+
+        # --- Aparatos ---
+        Escenario("AparatoController.obtener_todos_aparatos",
+                  ctx.aparatos.obtener_todos_aparatos),
+        Escenario("AparatoController.obtener_aparatos_disponibles",
+                  ctx.aparatos.obtener_aparatos_disponibles),
+        Escenario("AparatoController.obtener_aparatos_por_tipo",
+                  lambda: ctx.aparatos.obtener_aparatos_por_tipo(ctx.tipo)),
+        Escenario("AparatoController.obtener_aparato",
+                  lambda: ctx.aparatos.obtener_aparato(ctx.id_aparato)),
+        Escenario("AparatoController.crear_aparato", ctx.crear_aparato),
+        Escenario("AparatoController.actualizar_aparato", ctx.actualizar_aparato),
+        Escenario("AparatoController.eliminar_aparato",
+                  lambda: ctx.aparatos.eliminar_aparato(ctx._por_borrar),
+                  antes=ctx.preparar_borrado(lambda: ctx.crear_aparato().id_aparato)),
+
+        # --- Reservas ---
+        Escenario("ReservaController.obtener_reservas_con_nombres (página 100)",
+                  lambda: ctx.reservas.obtener_reservas_con_nombres(limite=100)),
+        Escenario("ReservaController.obtener_reservas_con_nombres (todas)",
+                  ctx.reservas.obtener_reservas_con_nombres, repeticiones=3),
+        Escenario("ReservaController.obtener_reservas_por_fecha",
+                  lambda: ctx.reservas.obtener_reservas_por_fecha(ctx.fecha)),
+        Escenario("ReservaController.obtener_reservas_por_cliente",
+                  lambda: ctx.reservas.obtener_reservas_por_cliente(ctx.id_cliente)),
+        Escenario("ReservaController.verificar_disponibilidad (motor en frío)",
+                  lambda: ctx.reservas.verificar_disponibilidad(ctx.id_aparato, ctx.fecha, "10:00", "10:30"),
+                  antes=motor.invalidar),
+        Escenario("ReservaController.verificar_disponibilidad (motor cargado)",
+                  lambda: ctx.reservas.verificar_disponibilidad(ctx.id_aparato, ctx.fecha, "10:00", "10:30")),
+        Escenario("ReservaController.tramos_libres_por_tipo",
+                  lambda: ctx.reservas.tramos_libres_por_tipo(ctx.tipo, ctx.fecha),
+                  antes=motor.invalidar),
+        Escenario("ReservaController.buscar_huecos_libres (7 días)",
+                  lambda: ctx.reservas.buscar_huecos_libres(
+                      ctx.fecha, fin_semana, "10:00", tipo=ctx.tipo, id_cliente=ctx.id_cliente),
+                  antes=motor.invalidar),
+        Escenario("ReservaController.generar_informe_disponibilidad",
+                  lambda: ctx.reservas.generar_informe_disponibilidad(ctx.fecha)),
+        Escenario("ReservaController.generar_informe_disponibilidad_rango (7 días)",
+                  lambda: ctx.reservas.generar_informe_disponibilidad_rango(ctx.fecha, fin_semana)),
+        Escenario("ReservaController.obtener_todas_reservas",
+                  ctx.reservas.obtener_todas_reservas, repeticiones=3),
+        Escenario("ReservaController.obtener_reserva",
+                  lambda: ctx.reservas.obtener_reserva(ctx.id_reserva)),
+        Escenario("ReservaController.obtener_reserva_con_nombres",
+                  lambda: ctx.reservas.obtener_reserva_con_nombres(ctx.id_reserva)),
+        Escenario("ReservaController.obtener_reservas_por_aparato",
+                  lambda: ctx.reservas.obtener_reservas_por_aparato(ctx.id_aparato), repeticiones=5),
+        Escenario("ReservaController.validar_reserva",
+                  lambda: ctx.reservas.validar_reserva(
+                      ctx.id_cliente, ctx.id_aparato, ctx.fecha, "10:00", "10:30")),
+        Escenario("ReservaController.primer_tramo_libre",
+                  lambda: ctx.reservas.primer_tramo_libre(ctx.id_aparato, ctx.fecha, "10:00")),
+        Escenario("ReservaController.crear_reserva", ctx.crear_reserva),
+        Escenario("ReservaController.crear_serie_reservas (1 semana)", ctx.crear_serie_reservas),
+        Escenario("ReservaController.actualizar_reserva (estado)", ctx.actualizar_reserva),
+        Escenario("ReservaController.eliminar_reserva",
+                  lambda: ctx.reservas.eliminar_reserva(ctx._por_borrar),
+                  antes=ctx.preparar_borrado(lambda: ctx.crear_reserva()["id_reserva"])),
+
+        # --- Pagos ---
+        Escenario("PagoController.obtener_todos_pagos (página 100)",
+                  lambda: ctx.pagos.obtener_todos_pagos(limite=100)),
+        Escenario("PagoController.filtrar_pagos (pendientes, página 100)",
+                  lambda: ctx.pagos.filtrar_pagos(pagado=False, limite=100)),
+        Escenario("PagoController.filtrar_pagos (mes y método)",
+                  lambda: ctx.pagos.filtrar_pagos(mes_desde=ctx.mes, mes_hasta=ctx.mes,
+                                                  metodo_pago="tarjeta", limite=100)),
+        Escenario("PagoController.obtener_pagos_por_cliente",
+                  lambda: ctx.pagos.obtener_pagos_por_cliente(ctx.id_cliente)),
+        Escenario("PagoController.calcular_total_pagos_cliente",
+                  lambda: ctx.pagos.calcular_total_pagos_cliente(ctx.id_cliente)),
+        Escenario("PagoController.obtener_pagos_por_metodo",
+                  lambda: ctx.pagos.obtener_pagos_por_metodo("bizum"), repeticiones=5),
+        Escenario("PagoController.generar_pagos_mensuales (mes nuevo)",
+                  ctx.generar_pagos_mes, repeticiones=3),
+        Escenario("PagoController.generar_pagos_periodo (3 meses nuevos)",
+                  ctx.generar_pagos_trimestre, repeticiones=3),
+        Escenario("PagoController.obtener_pago",
+                  lambda: ctx.pagos.obtener_pago(ctx.id_pago)),
+        Escenario("PagoController.obtener_pagos_por_fecha (un mes)",
+                  lambda: ctx.pagos.obtener_pagos_por_fecha(f"{ctx.mes}-01", f"{ctx.mes}-31")),
+        Escenario("PagoController.crear_pago", ctx.crear_pago),
+        Escenario("PagoController.actualizar_pago", ctx.actualizar_pago),
+        Escenario("PagoController.eliminar_pago",
+                  lambda: ctx.pagos.eliminar_pago(ctx._por_borrar),
+                  antes=ctx.preparar_borrado(lambda: ctx.crear_pago().id_pago)),
+
+        # --- Usuarios ---
+        Escenario("UsuarioController.validar_login",
+                  lambda: ctx.usuarios.validar_login("admin", "admin123")),
+        Escenario("UsuarioController.hash_password",
+                  lambda: ctx.usuarios.hash_password("admin123")),
+        Escenario("UsuarioController.crear_usuario", ctx.crear_usuario),
+        Escenario("UsuarioController.resetear_password", ctx.resetear_password),
+    ]
+
+    for criterio in ctx.busquedas:
+        lista.append(Escenario(f"ClienteController.buscar_clientes ('{criterio}', 50)",
+                               lambda c=criterio: ctx.clientes.buscar_clientes(c, 50)))
+
+    if ctx.id_pago_pendiente is not None:
+        lista.append(Escenario(
+            "PagoController.marcar_pago_como_pagado",
+            lambda: ctx.pagos.marcar_pago_como_pagado(ctx.id_pago_pendiente, str(date.today()), "tarjeta")
+        ))
+
+    return lista
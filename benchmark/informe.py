@@ -0,0 +1,72 @@
+# ---------------------------------------------------------
+#   INFORME Y COMPARACIÓN CON LA BASE
+# ---------------------------------------------------------
+
+import json
+
+# Por debajo de esto las diferencias son ruido y no cuentan como regresión
+MINIMO_MS = 1.0
+MINIMO_KB = 64.0
+
+METRICAS = (
+    ("p50_ms", MINIMO_MS),
+    ("p95_ms", MINIMO_MS),
+    ("memoria_pico_kb", MINIMO_KB),
+)
+
+
+def guardar(resultado, ruta):
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+
+def cargar(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def imprimir(resultado):
+    print()
+    print(f"{'ESCENARIO':<66} {'p50 ms':>9} {'p95 ms':>9} {'memoria KB':>11}")
+    print("-" * 98)
+    for nombre, r in resultado["resultados"].items():
+        print(f"{nombre:<66} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['memoria_pico_kb']:>11.1f}")
+
+
+def comparar(resultado, base, umbral=0.25):
+    """
+    Compara con una medición anterior. Devuelve la lista de regresiones
+    (escenario, métrica, antes, ahora) de las métricas que han crecido
+    más de `umbral` (0.25 = 25 %).
+    """
+    if resultado["datos"] != base.get("datos"):
+        print("\n[AVISO] La base se midió con otro volumen de datos: "
+              f"{base.get('datos')} frente a {resultado['datos']}")
+
+    regresiones = []
+    print()
+    print(f"{'ESCENARIO':<66} {'MÉTRICA':<16} {'BASE':>10} {'AHORA':>10} {'CAMBIO':>8}")
+    print("-" * 114)
+
+    for nombre, r in resultado["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None:
+            print(f"{nombre:<66} (nuevo, sin base)")
+            continue
+
+        for metrica, minimo in METRICAS:
+            antes, ahora = anterior[metrica], r[metrica]
+            if max(antes, ahora) < minimo:
+                continue
+
+            cambio = (ahora - antes) / antes if antes else float("inf")
+            marca = ""
+            if cambio > umbral:
+                marca = "  << REGRESIÓN"
+                regresiones.append((nombre, metrica, antes, ahora))
+            elif cambio < -umbral:
+                marca = "  mejora"
+
+            print(f"{nombre:<66} {metrica:<16} {antes:>10.2f} {ahora:>10.2f} {cambio:>+8.0%}{marca}")
+
+    return regresiones
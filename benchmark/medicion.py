@@ -0,0 +1,59 @@
+# ---------------------------------------------------------
+#   MEDICIÓN
+#   Tiempos (p50 / p95) y memoria máxima de una llamada.
+# ---------------------------------------------------------
+
+import math
+import time
+import tracemalloc
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) por rango más cercano; valores ya ordenados."""
+    if not valores:
+        return 0.0
+    posicion = max(1, math.ceil(p / 100 * len(valores)))
+    return valores[posicion - 1]
+
+
+def medir(funcion, repeticiones=20, antes=None, calentamiento=1):
+    """
+    Ejecuta `funcion` varias veces y devuelve sus estadísticas.
+
+    - antes: se llama antes de cada ejecución, fuera del cronómetro
+      (p. ej. para vaciar una caché y medir la carga en frío).
+    - calentamiento: ejecuciones iniciales que no cuentan.
+
+    La memoria se mide en una ejecución aparte con tracemalloc, que
+    ralentiza Python y falsearía los tiempos.
+    """
+    for _ in range(calentamiento):
+        if antes:
+            antes()
+        funcion()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    if antes:
+        antes()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    tiempos.sort()
+    return {
+        "repeticiones": repeticiones,
+        "p50_ms": round(percentil(tiempos, 50), 3),
+        "p95_ms": round(percentil(tiempos, 95), 3),
+        "max_ms": round(tiempos[-1], 3),
+        "memoria_pico_kb": round(pico / 1024, 1),
+    }
@@ -4,9 +4,12 @@
 # ---------------------------------------------------------
 
 from data.gestor_bd import GestorBD
+from controller.directorio import obtener_directorio
+from controller.metricas import medir_controlador
 from model.aparato import Aparato
 
 
+@medir_controlador
 class AparatoController:
     """Controlador encargado de gestionar los aparatos."""
 
@@ -15,14 +18,13 @@ class AparatoController:
     # ---------------------------------------------------------
     def __init__(self):
         self.db = GestorBD()
+        self.directorio = obtener_directorio(self.db)
 
     # ---------------------------------------------------------
     #   CREAR APARATO
     # ---------------------------------------------------------
     def crear_aparato(self, nombre, tipo, descripcion="", estado="disponible"):
-        """Crea un aparato nuevo en la base de datos."""
-        self.db.conectar()
-
+        """Crea un aparato nuevo en la base de datos y lo devuelve."""
         datos = {
             "nombre": nombre,
             "tipo": tipo,
@@ -30,10 +32,15 @@ class AparatoController:
             "descripcion": descripcion
         }
 
-        nuevo_id = self.db.insertar("Aparato", datos)
+        self.db.conectar()
+        try:
+            nuevo_id = self.db.insertar("Aparato", datos)
+            aparato = self.obtener_aparato(nuevo_id)
+        finally:
+            self.db.desconectar()
 
-        self.db.desconectar()
-        return nuevo_id
+        self.directorio.refrescar_aparato(nuevo_id)
+        return aparato
 
     # ---------------------------------------------------------
     #   OBTENER UN APARATO POR ID
@@ -41,11 +48,13 @@ class AparatoController:
     def obtener_aparato(self, id_aparato):
         """Devuelve un aparato concreto según su ID."""
         self.db.conectar()
-        filas = self.db.obtener_datos(
-            "SELECT * FROM Aparato WHERE id_aparato = ?",
-            (id_aparato,)
-        )
-        self.db.desconectar()
+        try:
+            filas = self.db.obtener_datos(
+                "SELECT * FROM Aparato WHERE id_aparato = ?",
+                (id_aparato,)
+            )
+        finally:
+            self.db.desconectar()
 
         if not filas:
             return None
@@ -59,8 +68,10 @@ class AparatoController:
     def obtener_todos_aparatos(self):
         """Devuelve la lista completa de aparatos registrados."""
         self.db.conectar()
-        filas = self.db.obtener_datos("SELECT * FROM Aparato")
-        self.db.desconectar()
+        try:
+            filas = self.db.obtener_datos("SELECT * FROM Aparato")
+        finally:
+            self.db.desconectar()
 
         return [Aparato(f[0], f[1], f[2], f[3], f[4]) for f in filas]
 
@@ -69,7 +80,10 @@ class AparatoController:
     # ---------------------------------------------------------
     def actualizar_aparato(self, id_aparato, nombre=None, tipo=None,
                            estado=None, descripcion=None):
-        """Actualiza los datos de un aparato existente."""
+        """
+        Actualiza los datos de un aparato existente.
+        Devuelve el Aparato ya modificado (None si no existe o no hay cambios).
+        """
         datos = {}
 
         if nombre is not None:
@@ -83,17 +97,21 @@ class AparatoController:
 
         # Si no se pasa ningún dato, no hace nada
         if not datos:
-            return False
+            return None
 
         self.db.conectar()
-        ok = self.db.actualizar(
-            "Aparato",
-            datos,
-            f"id_aparato = {id_aparato}"
-        )
-        self.db.desconectar()
+        try:
+            self.db.actualizar(
+                "Aparato",
+                datos,
+                {"id_aparato": id_aparato}
+            )
+            aparato = self.obtener_aparato(id_aparato)
+        finally:
+            self.db.desconectar()
 
-        return ok
+        self.directorio.refrescar_aparato(id_aparato)
+        return aparato
 
     # ---------------------------------------------------------
     #   ELIMINAR APARATO
@@ -101,9 +119,12 @@ class AparatoController:
     def eliminar_aparato(self, id_aparato):
         """Elimina un aparato por su ID."""
         self.db.conectar()
-        ok = self.db.eliminar("Aparato", f"id_aparato = {id_aparato}")
-        self.db.desconectar()
+        try:
+            ok = self.db.eliminar("Aparato", {"id_aparato": id_aparato})
+        finally:
+            self.db.desconectar()
 
+        self.directorio.refrescar_aparato(id_aparato)
         return ok
 
     # ---------------------------------------------------------
@@ -112,10 +133,12 @@ class AparatoController:
     def obtener_aparatos_disponibles(self):
         """Devuelve los aparatos cuyo estado sea 'disponible'."""
         self.db.conectar()
-        filas = self.db.obtener_datos(
-            "SELECT * FROM Aparato WHERE estado = 'disponible'"
-        )
-        self.db.desconectar()
+        try:
+            filas = self.db.obtener_datos(
+                "SELECT * FROM Aparato WHERE estado = 'disponible'"
+            )
+        finally:
+            self.db.desconectar()
 
         return [Aparato(f[0], f[1], f[2], f[3], f[4]) for f in filas]
 
@@ -125,10 +148,12 @@ class AparatoController:
     def obtener_aparatos_por_tipo(self, tipo):
         """Filtra los aparatos según su tipo."""
         self.db.conectar()
-        filas = self.db.obtener_datos(
-            "SELECT * FROM Aparato WHERE tipo = ?",
-            (tipo,)
-        )
-        self.db.desconectar()
+        try:
+            filas = self.db.obtener_datos(
+                "SELECT * FROM Aparato WHERE tipo = ?",
+                (tipo,)
+            )
+        finally:
+            self.db.desconectar()
 
         return [Aparato(f[0], f[1], f[2], f[3], f[4]) for f in filas]
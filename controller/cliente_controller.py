@@ -6,12 +6,20 @@ Creación, lectura, actualización, eliminación y búsquedas.
 ---------------------------------------------------------
 """
 
+import re
+
 from data.gestor_bd import GestorBD
+from controller.directorio import obtener_directorio
+from controller.metricas import medir_controlador
 from model.cliente import Cliente
 from util.validaciones import validar_dni, validar_email, validar_telefono
 from excepciones import ErrorBaseDatos, ErrorValidacion
 
+# db_path → True/False según exista el índice cliente_fts (se mira una vez)
+_fts_disponible = {}
+
 
+@medir_controlador
 class ClienteController:
     """Controlador encargado de gestionar clientes."""
 
@@ -21,6 +29,7 @@ class ClienteController:
     def __init__(self):
         """Inicializa el controlador y el gestor de BD."""
         self.db = GestorBD()
+        self.directorio = obtener_directorio(self.db)
 
     # ---------------------------------------------------------
     #   CREAR CLIENTE
@@ -28,6 +37,7 @@ class ClienteController:
     def crear_cliente(self, nombre, apellidos, dni, email="", telefono="", fecha_alta=None):
         """
         Crea un nuevo cliente en estado activo (con validaciones previas).
+        Devuelve el Cliente creado, tal y como ha quedado en la BD.
         """
         # --- Validaciones simples ---
         if not validar_dni(dni):
@@ -53,7 +63,7 @@ class ClienteController:
             }
 
             nuevo_id = self.db.insertar("Cliente", datos)
-            return nuevo_id
+            cliente = self.obtener_cliente(nuevo_id)
 
         except ErrorBaseDatos as e:
             raise ErrorBaseDatos(f"No se pudo crear el cliente: {e}")
@@ -61,6 +71,9 @@ class ClienteController:
         finally:
             self.db.desconectar()
 
+        self.directorio.refrescar_cliente(nuevo_id)
+        return cliente
+
     # ---------------------------------------------------------
     #   OBTENER CLIENTE POR ID
     # ---------------------------------------------------------
@@ -88,11 +101,19 @@ class ClienteController:
     # ---------------------------------------------------------
     #   OBTENER TODOS LOS CLIENTES
     # ---------------------------------------------------------
-    def obtener_todos_clientes(self):
-        """Devuelve una lista con todos los clientes registrados."""
+    def obtener_todos_clientes(self, despues_de_id=None, limite=None):
+        """
+        Devuelve los clientes registrados, del más reciente al más antiguo.
+
+        Para paginar: `limite` filas con id menor que `despues_de_id`
+        (el último id de la página anterior). Sin parámetros, todos.
+        """
+        query, parametros = self.db.paginar(
+            "SELECT * FROM Cliente", "id_cliente", despues_de_id, limite
+        )
         try:
             self.db.conectar()
-            filas = self.db.obtener_datos("SELECT * FROM Cliente ORDER BY id_cliente DESC")
+            filas = self.db.obtener_datos(query, parametros)
 
         except ErrorBaseDatos as e:
             raise ErrorBaseDatos(f"No se pudo obtener la lista de clientes: {e}")
@@ -108,9 +129,10 @@ class ClienteController:
     def actualizar_cliente(self, id_cliente, **kwargs):
         """
         Actualiza cualquier dato del cliente.
+        Devuelve el Cliente ya modificado (None si no existe).
         """
         if not kwargs:
-            return False
+            return None
 
         # Validaciones si vienen ciertos campos
         if "dni" in kwargs and not validar_dni(kwargs["dni"]):
@@ -124,8 +146,8 @@ class ClienteController:
 
         try:
             self.db.conectar()
-            ok = self.db.actualizar("Cliente", kwargs, f"id_cliente = {id_cliente}")
-            return ok
+            self.db.actualizar("Cliente", kwargs, {"id_cliente": id_cliente})
+            cliente = self.obtener_cliente(id_cliente)
 
         except ErrorBaseDatos as e:
             raise ErrorBaseDatos(f"No se pudo actualizar el cliente: {e}")
@@ -133,6 +155,9 @@ class ClienteController:
         finally:
             self.db.desconectar()
 
+        self.directorio.refrescar_cliente(id_cliente)
+        return cliente
+
     # ---------------------------------------------------------
     #   ELIMINAR CLIENTE
     # ---------------------------------------------------------
@@ -140,8 +165,7 @@ class ClienteController:
         """Elimina un cliente del sistema."""
         try:
             self.db.conectar()
-            ok = self.db.eliminar("Cliente", f"id_cliente = {id_cliente}")
-            return ok
+            ok = self.db.eliminar("Cliente", {"id_cliente": id_cliente})
 
         except ErrorBaseDatos as e:
             raise ErrorBaseDatos(f"No se pudo eliminar el cliente: {e}")
@@ -149,24 +173,53 @@ class ClienteController:
         finally:
             self.db.desconectar()
 
+        self.directorio.refrescar_cliente(id_cliente)
+        return ok
+
     # ---------------------------------------------------------
     #   BUSCAR CLIENTES
     # ---------------------------------------------------------
-    def buscar_clientes(self, criterio):
+    def buscar_clientes(self, criterio, limite=None):
         """
-        Busca clientes por nombre, apellidos o DNI.
+        Busca clientes por nombre, apellidos o DNI
+        (como mucho `limite` resultados, los más relevantes).
+
+        Con el índice FTS5 cada palabra del criterio busca por prefijo
+        y sin tildes ni mayúsculas ("mart gar" encuentra a "Martín
+        García"); los resultados salen ordenados por relevancia.
+        Si la BD no tiene el índice se busca con LIKE.
         """
-        patron = f"%{criterio}%"
+        palabras = re.findall(r"\w+", criterio or "")
+        if not palabras:
+            return []
 
         try:
             self.db.conectar()
-            filas = self.db.obtener_datos(
-                """
-                SELECT * FROM Cliente
-                WHERE nombre LIKE ? OR apellidos LIKE ? OR dni LIKE ?
-                """,
-                (patron, patron, patron)
-            )
+
+            if self._hay_indice_fts():
+                # "palabra"* = prefijo; varias palabras se combinan con AND
+                consulta = " ".join(f'"{p}"*' for p in palabras)
+                filas = self.db.obtener_datos(
+                    """
+                    SELECT c.*
+                    FROM cliente_fts
+                    JOIN Cliente c ON c.id_cliente = cliente_fts.rowid
+                    WHERE cliente_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                    """,
+                    (consulta, -1 if limite is None else limite)
+                )
+            else:
+                patron = f"%{criterio}%"
+                filas = self.db.obtener_datos(
+                    """
+                    SELECT * FROM Cliente
+                    WHERE nombre LIKE ? OR apellidos LIKE ? OR dni LIKE ?
+                    LIMIT ?
+                    """,
+                    (patron, patron, patron, -1 if limite is None else limite)
+                )
 
         except ErrorBaseDatos as e:
             raise ErrorBaseDatos(f"No se pudo realizar la búsqueda: {e}")
@@ -175,3 +228,13 @@ class ClienteController:
             self.db.desconectar()
 
         return [Cliente(*f) for f in filas]
+
+    def _hay_indice_fts(self):
+        # Se llama con la conexión ya abierta
+        disponible = _fts_disponible.get(self.db.db_path)
+        if disponible is None:
+            disponible = bool(self.db.obtener_datos(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cliente_fts'"
+            ))
+            _fts_disponible[self.db.db_path] = disponible
+        return disponible
@@ -0,0 +1,140 @@
+"""
+Directorio compartido de clientes y aparatos.
+
+Los combos y las tablas sólo necesitan id, nombre, DNI/tipo y estado.
+Se leen una vez por proceso y se comparten entre todas las vistas; los
+controladores avisan al directorio cada vez que dan de alta, modifican
+o borran un cliente o aparato, y sólo se relee esa fila.
+
+Pasado VIGENCIA_SEGUNDOS se vuelve a leer todo, para ver también los
+cambios hechos desde otro equipo.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from data.gestor_bd import GestorBD
+from excepciones import DBConsultaError
+
+VIGENCIA_SEGUNDOS = 300
+
+EntradaCliente = namedtuple("EntradaCliente", "id_cliente nombre apellidos dni estado")
+EntradaAparato = namedtuple("EntradaAparato", "id_aparato nombre tipo estado")
+
+_CONSULTA_CLIENTES = "SELECT id_cliente, nombre, apellidos, dni, estado FROM Cliente"
+_CONSULTA_APARATOS = "SELECT id_aparato, nombre, tipo, estado FROM Aparato"
+
+_directorios = {}
+_lock_directorios = threading.Lock()
+
+
+def obtener_directorio(gestor):
+    """Devuelve el directorio compartido de la BD del gestor (uno por proceso)."""
+    with _lock_directorios:
+        directorio = _directorios.get(gestor.db_path)
+        if directorio is None:
+            directorio = Directorio(GestorBD(gestor.db_path))
+            _directorios[gestor.db_path] = directorio
+        return directorio
+
+
+class Directorio:
+    """id → datos básicos de clientes y aparatos, cargados bajo demanda."""
+
+    def __init__(self, gestor=None):
+        self.db = gestor or GestorBD()
+        self._lock = threading.RLock()
+
+        # tabla → (instante de carga, {id: entrada}). Los dicts publicados
+        # no se modifican nunca (se sustituyen), así que quien los recibe
+        # puede recorrerlos sin el lock aunque otro hilo refresque una fila
+        self._tablas = {}
+
+    # ---------------------------------------------------------
+    #   CLIENTES
+    # ---------------------------------------------------------
+    def clientes(self):
+        """Lista de clientes, del más reciente al más antiguo."""
+        return sorted(self._cargar("Cliente").values(), key=lambda c: c.id_cliente, reverse=True)
+
+    def cliente(self, id_cliente):
+        return self._cargar("Cliente").get(id_cliente)
+
+    def nombre_cliente(self, id_cliente, defecto="Desconocido"):
+        """'Nombre Apellidos' del cliente o `defecto` si no existe."""
+        c = self.cliente(id_cliente)
+        return f"{c.nombre} {c.apellidos}" if c else defecto
+
+    # ---------------------------------------------------------
+    #   APARATOS
+    # ---------------------------------------------------------
+    def aparatos(self, estado=None):
+        """Lista de aparatos por id (sólo los de ese estado si se indica)."""
+        aparatos = sorted(self._cargar("Aparato").values(), key=lambda a: a.id_aparato)
+        if estado is not None:
+            aparatos = [a for a in aparatos if a.estado == estado]
+        return aparatos
+
+    def aparato(self, id_aparato):
+        return self._cargar("Aparato").get(id_aparato)
+
+    # ---------------------------------------------------------
+    #   INVALIDACIÓN (la llaman los controladores al escribir)
+    # ---------------------------------------------------------
+    def refrescar_cliente(self, id_cliente):
+        """Relee un cliente tras crearlo o modificarlo (o lo quita si ya no está)."""
+        self._refrescar("Cliente", _CONSULTA_CLIENTES + " WHERE id_cliente = ?", id_cliente, EntradaCliente)
+
+    def refrescar_aparato(self, id_aparato):
+        """Relee un aparato tras crearlo o modificarlo (o lo quita si ya no está)."""
+        self._refrescar("Aparato", _CONSULTA_APARATOS + " WHERE id_aparato = ?", id_aparato, EntradaAparato)
+
+    def invalidar(self):
+        """Olvida todo; se relee en la próxima consulta."""
+        with self._lock:
+            self._tablas.clear()
+
+    # ---------------------------------------------------------
+    #   AUXILIARES
+    # ---------------------------------------------------------
+    def _cargar(self, tabla):
+        with self._lock:
+            cargada = self._tablas.get(tabla)
+            if cargada and time.monotonic() - cargada[0] < VIGENCIA_SEGUNDOS:
+                return cargada[1]
+
+            consulta, entrada = (
+                (_CONSULTA_CLIENTES, EntradaCliente) if tabla == "Cliente"
+                else (_CONSULTA_APARATOS, EntradaAparato)
+            )
+            filas = self._leer(consulta)
+
+            datos = {f[0]: entrada(*f) for f in filas}
+            self._tablas[tabla] = (time.monotonic(), datos)
+            return datos
+
+    def _refrescar(self, tabla, consulta, id_fila, entrada):
+        with self._lock:
+            cargada = self._tablas.get(tabla)
+            if cargada is None:
+                return   # aún no se ha cargado: ya se leerá entera
+
+            filas = self._leer(consulta, (id_fila,))
+
+            instante, datos = cargada
+            datos = dict(datos)
+            if filas:
+                datos[id_fila] = entrada(*filas[0])
+            else:
+                datos.pop(id_fila, None)
+            self._tablas[tabla] = (instante, datos)
+
+    def _leer(self, consulta, parametros=None):
+        try:
+            self.db.conectar()
+            return self.db.obtener_datos(consulta, parametros)
+        except Exception as e:
+            raise DBConsultaError(f"Error cargando el directorio: {e}") from e
+        finally:
+            self.db.desconectar()
@@ -0,0 +1,257 @@
+# ---------------------------------------------------------
+#   MÉTRICAS DE LOS CONTROLADORES
+#   Registro de contadores e histogramas en memoria y el
+#   decorador que mide los métodos públicos de cada
+#   controlador (llamadas, latencia y filas devueltas).
+#   Se puede volcar a JSON o a texto de Prometheus.
+# ---------------------------------------------------------
+
+import atexit
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+# Límites (ms) de los tramos del histograma de latencia
+LIMITES_LATENCIA_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Límites de los tramos del histograma de filas devueltas
+LIMITES_FILAS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+# Cada cuántos segundos se vuelca el fichero si se activa GFTM_METRICAS
+INTERVALO_EXPORTACION = 60
+
+
+class Histograma:
+    """Cuenta observaciones por tramos acumulados, como en Prometheus."""
+
+    def __init__(self, limites):
+        self.limites = tuple(limites)
+        self.cuentas = [0] * (len(self.limites) + 1)   # el último es +Inf
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def observar(self, valor):
+        self.cuentas[bisect.bisect_left(self.limites, valor)] += 1
+        self.total += 1
+        self.suma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def a_dict(self):
+        acumulado = 0
+        tramos = {}
+        for limite, cuenta in zip(self.limites + ("+Inf",), self.cuentas):
+            acumulado += cuenta
+            tramos[str(limite)] = acumulado
+
+        return {
+            "total": self.total,
+            "suma": round(self.suma, 3),
+            "media": round(self.suma / self.total, 3) if self.total else 0.0,
+            "maximo": round(self.maximo, 3),
+            "tramos": tramos,
+        }
+
+
+class RegistroMetricas:
+    """
+    Contadores e histogramas identificados por (nombre, etiquetas).
+    Las etiquetas son pares clave=valor, p. ej. (("metodo", "PagoController.obtener_pago"),).
+    """
+
+    def __init__(self):
+        self._contadores = {}
+        self._histogramas = {}
+        self._lock = threading.Lock()
+        self.inicio = time.time()
+
+    def incrementar(self, nombre, etiquetas=(), cantidad=1):
+        with self._lock:
+            clave = (nombre, etiquetas)
+            self._contadores[clave] = self._contadores.get(clave, 0) + cantidad
+
+    def observar(self, nombre, valor, etiquetas=(), limites=LIMITES_LATENCIA_MS):
+        with self._lock:
+            clave = (nombre, etiquetas)
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                histograma = self._histogramas[clave] = Histograma(limites)
+            histograma.observar(valor)
+
+    def reiniciar(self):
+        with self._lock:
+            self._contadores.clear()
+            self._histogramas.clear()
+            self.inicio = time.time()
+
+    # ---------------------------------------------------------
+    #   EXPORTACIÓN
+    # ---------------------------------------------------------
+    def a_dict(self):
+        with self._lock:
+            return {
+                "inicio": self.inicio,
+                "instante": time.time(),
+                "contadores": [
+                    {"nombre": n, "etiquetas": dict(e), "valor": v}
+                    for (n, e), v in sorted(self._contadores.items())
+                ],
+                "histogramas": [
+                    {"nombre": n, "etiquetas": dict(e), **h.a_dict()}
+                    for (n, e), h in sorted(self._histogramas.items(), key=lambda i: i[0])
+                ],
+            }
+
+    def texto_prometheus(self):
+        """Formato de exposición de texto de Prometheus."""
+        datos = self.a_dict()
+        lineas = []
+        vistos = set()
+
+        def cabecera(nombre, tipo):
+            if nombre not in vistos:
+                vistos.add(nombre)
+                lineas.append(f"# TYPE {nombre} {tipo}")
+
+        for c in datos["contadores"]:
+            cabecera(c["nombre"], "counter")
+            lineas.append(f"{c['nombre']}{_etiquetas(c['etiquetas'])} {c['valor']}")
+
+        for h in datos["histogramas"]:
+            nombre = h["nombre"]
+            cabecera(nombre, "histogram")
+            for limite, cuenta in h["tramos"].items():
+                etiquetas = _etiquetas(dict(h["etiquetas"], le=limite))
+                lineas.append(f"{nombre}_bucket{etiquetas} {cuenta}")
+            lineas.append(f"{nombre}_sum{_etiquetas(h['etiquetas'])} {h['suma']}")
+            lineas.append(f"{nombre}_count{_etiquetas(h['etiquetas'])} {h['total']}")
+
+        return "\n".join(lineas) + "\n"
+
+    def exportar(self, ruta):
+        """Vuelca las métricas a `ruta`: JSON si acaba en .json, si no texto de Prometheus."""
+        if ruta.endswith(".json"):
+            contenido = json.dumps(self.a_dict(), ensure_ascii=False, indent=2)
+        else:
+            contenido = self.texto_prometheus()
+
+        # Se escribe aparte y se renombra para no dejar nunca un fichero a medias
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(contenido)
+        os.replace(temporal, ruta)
+
+
+def _etiquetas(etiquetas):
+    if not etiquetas:
+        return ""
+    texto = ",".join(f'{k}="{_escapar(v)}"' for k, v in etiquetas.items())
+    return "{" + texto + "}"
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Registro único del proceso
+registro = RegistroMetricas()
+
+
+# ---------------------------------------------------------
+#   DECORADORES
+# ---------------------------------------------------------
+def _filas(resultado):
+    # Listas, dicts... cuentan sus elementos; un objeto suelto cuenta 1
+    if resultado is None or isinstance(resultado, (bool, str)):
+        return 0
+    try:
+        return len(resultado)
+    except TypeError:
+        return 1
+
+
+def medir_metodo(funcion, nombre=None):
+    """Mide cada llamada a `funcion`: llamadas, errores, latencia y filas."""
+    etiquetas = (("metodo", nombre or funcion.__qualname__),)
+
+    @functools.wraps(funcion)
+    def envoltorio(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            resultado = funcion(*args, **kwargs)
+        except Exception:
+            registro.incrementar("gftm_controlador_errores_total", etiquetas)
+            raise
+        finally:
+            registro.observar(
+                "gftm_controlador_latencia_ms", (time.perf_counter() - inicio) * 1000, etiquetas
+            )
+            registro.incrementar("gftm_controlador_llamadas_total", etiquetas)
+
+        registro.observar("gftm_controlador_filas", _filas(resultado), etiquetas, LIMITES_FILAS)
+        return resultado
+
+    return envoltorio
+
+
+def medir_controlador(clase):
+    """
+    Decorador de clase: aplica medir_metodo a todos sus métodos públicos.
+    Los @staticmethod / @classmethod se desenvuelven y se vuelven a
+    envolver con el mismo tipo para no perder su forma de enlazarse.
+    """
+    for nombre, atributo in list(vars(clase).items()):
+        if nombre.startswith("_"):
+            continue
+
+        etiqueta = f"{clase.__name__}.{nombre}"
+        if isinstance(atributo, (staticmethod, classmethod)):
+            envuelto = type(atributo)(medir_metodo(atributo.__func__, etiqueta))
+        elif inspect.isfunction(atributo):
+            envuelto = medir_metodo(atributo, etiqueta)
+        else:
+            continue   # propiedades, clases anidadas, constantes...
+
+        setattr(clase, nombre, envuelto)
+    return clase
+
+
+# ---------------------------------------------------------
+#   EXPORTACIÓN PERIÓDICA
+# ---------------------------------------------------------
+_exportador = None
+
+
+def iniciar_exportacion(ruta, intervalo=INTERVALO_EXPORTACION):
+    """
+    Vuelca las métricas a `ruta` cada `intervalo` segundos y al salir,
+    en un hilo aparte. Se activa desde main.py con GFTM_METRICAS=ruta.
+    """
+    global _exportador
+    if _exportador is not None:
+        return
+
+    parar = threading.Event()
+
+    def volcar():
+        try:
+            registro.exportar(ruta)
+        except OSError as e:
+            print(f"[AVISO] No se pudieron guardar las métricas en {ruta}: {e}")
+
+    def bucle():
+        while not parar.wait(intervalo):
+            volcar()
+
+    _exportador = threading.Thread(target=bucle, name="exportador-metricas", daemon=True)
+    _exportador.start()
+
+    def al_salir():
+        parar.set()
+        volcar()
+
+    atexit.register(al_salir)
@@ -0,0 +1,276 @@
+"""
+Motor de disponibilidad en memoria.
+
+Las reservas son tramos fijos de 30 minutos, así que la ocupación de un
+aparato en un día cabe en un entero de 48 bits: el bit i vale 1 si el
+tramo que empieza a las i*30 minutos está ocupado.
+
+Los días se cargan de la BD la primera vez que se consultan (una sola
+consulta para todos los aparatos) y se actualizan al crear, modificar o
+cancelar reservas. Pasado VIGENCIA_SEGUNDOS se vuelven a leer para ver
+también las reservas hechas desde otro equipo.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from data.gestor_bd import GestorBD
+from excepciones import DBConsultaError
+
+MINUTOS_TRAMO = 30
+TRAMOS_DIA = 24 * 60 // MINUTOS_TRAMO          # 48
+DIA_COMPLETO = (1 << TRAMOS_DIA) - 1
+
+# El último tramo (23:30) no se puede reservar: su fin sería 00:00
+# y las validaciones exigen hora_inicio < hora_fin en el mismo día.
+TRAMOS_RESERVABLES = DIA_COMPLETO >> 1
+
+VIGENCIA_SEGUNDOS = 30
+
+_motores = {}
+_lock_motores = threading.Lock()
+
+
+# ---------------------------------------------------------
+#   CONVERSIONES HORA <-> TRAMO
+# ---------------------------------------------------------
+def _minutos(hora):
+    h, m = hora.split(":")
+    return int(h) * 60 + int(m)
+
+
+def hora_a_tramo(hora):
+    """'09:30' → 19"""
+    return _minutos(hora) // MINUTOS_TRAMO
+
+
+def tramo_a_hora(tramo):
+    """19 → '09:30'"""
+    minutos = tramo * MINUTOS_TRAMO
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def mascara_intervalo(hora_inicio, hora_fin):
+    """Bits de todos los tramos que toca el intervalo [inicio, fin)."""
+    inicio = _minutos(hora_inicio)
+    fin = _minutos(hora_fin)
+    if fin <= inicio:
+        fin = 24 * 60
+
+    primero = inicio // MINUTOS_TRAMO
+    ultimo = (fin - 1) // MINUTOS_TRAMO
+    return ((1 << (ultimo - primero + 1)) - 1) << primero
+
+
+def indices_de_mascara(mascara):
+    """Recorre los índices de tramo de los bits a 1, de menor a mayor."""
+    while mascara:
+        bit = mascara & -mascara
+        yield bit.bit_length() - 1
+        mascara ^= bit
+
+
+def tramos_de_mascara(mascara):
+    """Lista de horas ('HH:MM') de los bits a 1 de la máscara."""
+    return [tramo_a_hora(i) for i in indices_de_mascara(mascara)]
+
+
+def obtener_motor(gestor):
+    """Devuelve el motor compartido de la BD del gestor (uno por proceso)."""
+    with _lock_motores:
+        motor = _motores.get(gestor.db_path)
+        if motor is None:
+            motor = MotorDisponibilidad(GestorBD(gestor.db_path))
+            _motores[gestor.db_path] = motor
+        return motor
+
+
+class MotorDisponibilidad:
+    """Ocupación por (aparato, fecha) en forma de bitmap de tramos."""
+
+    def __init__(self, gestor=None):
+        self.db = gestor or GestorBD()
+
+        # fecha → (instante de carga, {id_aparato: mascara})
+        self._dias = {}
+
+        # Cambios hechos mientras otra lectura puede estar en curso:
+        # fecha → (instante, {id_aparato: mascara reservada}, invalidado)
+        self._cambios = {}
+        self._invalidado_todo = float("-inf")
+        self._lock = threading.RLock()
+
+    # ---------------------------------------------------------
+    #   CARGA DESDE LA BD
+    # ---------------------------------------------------------
+    def cargar_rango(self, fecha_inicio, fecha_fin):
+        """
+        Carga (o recarga) todos los días del rango con una sola consulta.
+        Devuelve {fecha: {id_aparato: mascara}}.
+        """
+        leido_en = time.monotonic()
+        try:
+            self.db.conectar()
+            filas = self.db.obtener_datos(
+                """
+                SELECT fecha_reserva, id_aparato, hora_inicio, hora_fin
+                FROM Reserva
+                WHERE fecha_reserva BETWEEN ? AND ?
+                AND estado != 'cancelada'
+                """,
+                (fecha_inicio, fecha_fin)
+            )
+        except Exception as e:
+            raise DBConsultaError(f"Error cargando la ocupación de aparatos: {e}") from e
+        finally:
+            self.db.desconectar()
+
+        dias = {f: {} for f in _fechas_entre(fecha_inicio, fecha_fin)}
+
+        for fecha, id_aparato, h1, h2 in filas:
+            try:
+                mascara = mascara_intervalo(h1, h2)
+            except (ValueError, AttributeError):
+                continue
+            ocupacion = dias.setdefault(fecha, {})
+            ocupacion[id_aparato] = ocupacion.get(id_aparato, 0) | mascara
+
+        return self.guardar_dias(dias, leido_en)
+
+    def guardar_dias(self, dias, leido_en):
+        """
+        Guarda la ocupación ya calculada de varios días
+        ({fecha: {id_aparato: mascara}}), p. ej. desde el informe diario,
+        que lee las mismas reservas y así evita otra consulta.
+
+        `leido_en` es el time.monotonic() de antes de la consulta. La
+        lectura se hace fuera del lock, así que una reserva apuntada
+        mientras tanto puede no estar en ella: se le suma con OR. Si el
+        día se invalidó en ese intervalo no se guarda y se releerá.
+        """
+        ahora = time.monotonic()
+
+        with self._lock:
+            # Los días caducados ya no sirven: se descartan para no acumularlos
+            self._dias = {
+                f: cargado for f, cargado in self._dias.items()
+                if ahora - cargado[0] < VIGENCIA_SEGUNDOS
+            }
+            self._cambios = {
+                f: cambio for f, cambio in self._cambios.items()
+                if ahora - cambio[0] < VIGENCIA_SEGUNDOS
+            }
+            if self._invalidado_todo >= leido_en:
+                return dias
+
+            for fecha, ocupacion in dias.items():
+                cambio = self._cambios.get(fecha)
+                if cambio and cambio[0] >= leido_en:
+                    _, reservadas, invalidado = cambio
+                    for id_aparato, mascara in reservadas.items():
+                        ocupacion[id_aparato] = ocupacion.get(id_aparato, 0) | mascara
+                    if invalidado:
+                        continue
+
+                self._dias[fecha] = (leido_en, ocupacion)
+
+        return dias
+
+    def _dia(self, fecha):
+        with self._lock:
+            cargado = self._dias.get(fecha)
+            if cargado and time.monotonic() - cargado[0] < VIGENCIA_SEGUNDOS:
+                return cargado[1]
+
+        return self.cargar_rango(fecha, fecha)[fecha]
+
+    def ocupacion(self, id_aparato, fecha):
+        """Máscara de tramos ocupados del aparato ese día."""
+        return self._dia(fecha).get(id_aparato, 0)
+
+    # ---------------------------------------------------------
+    #   CONSULTAS
+    # ---------------------------------------------------------
+    def esta_libre(self, id_aparato, fecha, hora_inicio, hora_fin):
+        """True si ningún tramo del intervalo está ocupado."""
+        return self.ocupacion(id_aparato, fecha) & mascara_intervalo(hora_inicio, hora_fin) == 0
+
+    def mascara_libres(self, id_aparato, fecha):
+        """Máscara de tramos reservables que siguen libres."""
+        return ~self.ocupacion(id_aparato, fecha) & TRAMOS_RESERVABLES
+
+    def primer_tramo_libre(self, id_aparato, fecha, desde="00:00"):
+        """Primera hora libre a partir de `desde` o None si está lleno."""
+        inicio = -(-_minutos(desde) // MINUTOS_TRAMO)
+        libres = self.mascara_libres(id_aparato, fecha) >> inicio
+        if not libres:
+            return None
+        return tramo_a_hora(inicio + (libres & -libres).bit_length() - 1)
+
+    def tramos_libres(self, id_aparato, fecha):
+        """Horas de inicio libres del aparato ese día."""
+        return tramos_de_mascara(self.mascara_libres(id_aparato, fecha))
+
+    def tramos_libres_por_tipo(self, tipo, fecha):
+        """{id_aparato: [horas libres]} de los aparatos disponibles de un tipo."""
+        try:
+            self.db.conectar()
+            aparatos = self.db.obtener_datos(
+                "SELECT id_aparato FROM Aparato WHERE tipo = ? AND estado = 'disponible'",
+                (tipo,)
+            )
+        except Exception as e:
+            raise DBConsultaError(f"Error obteniendo aparatos de tipo {tipo}: {e}") from e
+        finally:
+            self.db.desconectar()
+
+        return {id_ap: self.tramos_libres(id_ap, fecha) for (id_ap,) in aparatos}
+
+    # ---------------------------------------------------------
+    #   ACTUALIZACIÓN TRAS CAMBIOS
+    # ---------------------------------------------------------
+    def reservar(self, id_aparato, fecha, hora_inicio, hora_fin):
+        """Marca como ocupado el intervalo (si el día está en memoria)."""
+        mascara = mascara_intervalo(hora_inicio, hora_fin)
+
+        with self._lock:
+            cargado = self._dias.get(fecha)
+            if cargado:
+                ocupacion = cargado[1]
+                ocupacion[id_aparato] = ocupacion.get(id_aparato, 0) | mascara
+
+            # Por si hay una lectura de ese día en curso (ver guardar_dias)
+            _, reservadas, invalidado = self._cambios.get(fecha, (None, {}, False))
+            reservadas = dict(reservadas)
+            reservadas[id_aparato] = reservadas.get(id_aparato, 0) | mascara
+            self._cambios[fecha] = (time.monotonic(), reservadas, invalidado)
+
+    def invalidar(self, fecha=None):
+        """
+        Olvida un día (o todos) para que se relea en la próxima consulta.
+        Se usa al liberar tramos: varias reservas antiguas pueden compartir
+        tramo, así que es más seguro releer que borrar bits.
+        """
+        with self._lock:
+            if fecha is None:
+                self._dias.clear()
+                self._cambios.clear()
+                self._invalidado_todo = time.monotonic()
+            else:
+                self._dias.pop(fecha, None)
+                self._cambios[fecha] = (time.monotonic(), {}, True)
+
+
+def _fechas_entre(fecha_inicio, fecha_fin):
+    try:
+        dia = datetime.strptime(fecha_inicio, "%Y-%m-%d")
+        fin = datetime.strptime(fecha_fin, "%Y-%m-%d")
+    except (ValueError, TypeError):
+        return [fecha_inicio]
+
+    fechas = []
+    while dia <= fin:
+        fechas.append(dia.strftime("%Y-%m-%d"))
+        dia += timedelta(days=1)
+    return fechas
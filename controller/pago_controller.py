@@ -4,11 +4,17 @@
 # ---------------------------------------------------------
 
 from data.gestor_bd import GestorBD
+from controller.metricas import medir_controlador
 from model.pago import Pago
-from excepciones import ErrorBaseDatos
+from excepciones import ErrorBaseDatos, ErrorValidacion
 from datetime import date
+import re
 
+# Formato de los meses de cobro: "YYYY-MM"
+PATRON_MES = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
 
+
+@medir_controlador
 class PagoController:
 
     def __init__(self):
@@ -23,60 +29,75 @@ class PagoController:
         Genera un pago pendiente para cada cliente activo.
         mes → string "YYYY-MM".
         Evita duplicados: sólo crea si NO existe un pago de ese mes.
+        Devuelve el número de pagos creados.
         """
-        try:
-            self.db.conectar()
+        return self.generar_pagos_periodo(mes)["creados"]
 
-            clientes = self.db.obtener_datos(
-                "SELECT id_cliente FROM Cliente WHERE estado = 'activo'"
-            )
+    def generar_pagos_periodo(self, mes_inicio, mes_fin=None, cuota=30):
+        """
+        Genera los pagos pendientes de todos los clientes activos para
+        cada mes entre mes_inicio y mes_fin (ambos "YYYY-MM", incluidos)
+        con una sola sentencia INSERT ... SELECT.
 
-            fecha_generacion = str(date.today())
-            creados = 0
+        Devuelve {"creados": n, "omitidos": m}, donde omitidos son los
+        pagos que ya existían para ese cliente y mes.
+        """
+        mes_fin = mes_fin or mes_inicio
 
-            for fila in clientes:
-                id_cliente = fila[0]
+        if not (PATRON_MES.match(mes_inicio) and PATRON_MES.match(mes_fin)):
+            raise ErrorValidacion("El mes debe tener formato YYYY-MM.")
 
-                # Verificar duplicados
-                existe = self.db.obtener_datos(
-                    """
-                    SELECT COUNT(*) FROM Pago
-                    WHERE id_cliente = ? AND mes = ?
-                    """,
-                    (id_cliente, mes)
-                )[0][0]
+        if mes_fin < mes_inicio:
+            raise ErrorValidacion("El mes final es anterior al inicial.")
 
-                if existe > 0:
-                    continue
+        anio_ini, num_ini = map(int, mes_inicio.split("-"))
+        anio_fin, num_fin = map(int, mes_fin.split("-"))
+        num_meses = (anio_fin - anio_ini) * 12 + (num_fin - num_ini) + 1
 
-                datos = {
-                    "id_cliente": id_cliente,
-                    "mes": mes,
-                    "fecha_generacion": fecha_generacion,
-                    "pagado": 0,
-                    "fecha_pago": None,
-                    "cuota": 30,
-                    "metodo_pago": None,
-                    "concepto": None
-                }
+        try:
+            with self.db.transaccion():
+                activos = self.db.obtener_datos(
+                    "SELECT COUNT(*) FROM Cliente WHERE estado = 'activo'"
+                )[0][0]
 
-                self.db.insertar("Pago", datos)
-                creados += 1
+                self.db.ejecutar_query(
+                    """
+                    WITH RECURSIVE meses(mes) AS (
+                        SELECT ?
+                        UNION ALL
+                        SELECT strftime('%Y-%m', mes || '-01', '+1 month')
+                        FROM meses
+                        WHERE mes < ?
+                    )
+                    INSERT INTO Pago (id_cliente, mes, fecha_generacion, pagado, cuota)
+                    SELECT c.id_cliente, m.mes, ?, 0, ?
+                    FROM Cliente c
+                    CROSS JOIN meses m
+                    WHERE c.estado = 'activo'
+                    AND NOT EXISTS (
+                        SELECT 1 FROM Pago p
+                        WHERE p.id_cliente = c.id_cliente AND p.mes = m.mes
+                    )
+                    """,
+                    (mes_inicio, mes_fin, str(date.today()), cuota)
+                )
+                creados = self.db.obtener_datos("SELECT changes()")[0][0]
 
-            return creados
+            return {
+                "creados": creados,
+                "omitidos": activos * num_meses - creados
+            }
 
         except Exception as e:
             raise ErrorBaseDatos(f"Error al generar pagos mensuales: {e}")
 
-        finally:
-            self.db.desconectar()
-
     # ---------------------------------------------------------
     #   MARCAR COMO PAGADO
     # ---------------------------------------------------------
     def marcar_pago_como_pagado(self, id_pago, fecha_pago, metodo_pago, concepto=""):
         """
         Marca un pago como pagado y registra fecha, método y concepto.
+        Devuelve el Pago ya modificado.
         """
         try:
             self.db.conectar()
@@ -88,7 +109,8 @@ class PagoController:
                 "concepto": concepto
             }
 
-            return self.db.actualizar("Pago", datos, f"id_pago = {id_pago}")
+            self.db.actualizar("Pago", datos, {"id_pago": id_pago})
+            return self.obtener_pago(id_pago)
 
         except Exception as e:
             raise ErrorBaseDatos(f"Error al registrar el pago: {e}")
@@ -101,7 +123,7 @@ class PagoController:
     # ---------------------------------------------------------
     def crear_pago(self, id_cliente, mes, fecha_pago, metodo_pago, concepto=""):
         """
-        Crea un pago manual (ya pagado).
+        Crea un pago manual (ya pagado) y lo devuelve.
         """
         try:
             self.db.conectar()
@@ -117,7 +139,7 @@ class PagoController:
                 "concepto": concepto
             }
 
-            return self.db.insertar("Pago", datos)
+            return self.obtener_pago(self.db.insertar("Pago", datos))
 
         except Exception as e:
             raise ErrorBaseDatos(f"Error al crear el pago manual: {e}")
@@ -150,12 +172,17 @@ class PagoController:
     # ---------------------------------------------------------
     #   OBTENER TODOS LOS PAGOS
     # ---------------------------------------------------------
-    def obtener_todos_pagos(self):
+    def obtener_todos_pagos(self, despues_de_id=None, limite=None):
+        """
+        Pagos del más reciente al más antiguo. Para paginar se pasa el
+        último id recibido (despues_de_id) y el tamaño de página (limite).
+        """
+        query, parametros = self.db.paginar(
+            "SELECT * FROM Pago", "id_pago", despues_de_id, limite
+        )
         try:
             self.db.conectar()
-            filas = self.db.obtener_datos(
-                "SELECT * FROM Pago ORDER BY id_pago DESC"
-            )
+            filas = self.db.obtener_datos(query, parametros)
         except Exception as e:
             raise ErrorBaseDatos(f"Error obteniendo los pagos: {e}")
         finally:
@@ -163,15 +190,72 @@ class PagoController:
 
         return [Pago(*f) for f in filas]
 
+    # ---------------------------------------------------------
+    #   FILTRAR PAGOS
+    # ---------------------------------------------------------
+    def filtrar_pagos(self, pagado=None, mes_desde=None, mes_hasta=None,
+                      id_cliente=None, metodo_pago=None,
+                      despues_de_id=None, limite=None):
+        """
+        Pagos que cumplen todos los filtros indicados (los que valen
+        None no filtran), del más reciente al más antiguo y paginados
+        igual que obtener_todos_pagos.
+
+        - pagado: True (cobrados) / False (pendientes)
+        - mes_desde / mes_hasta: "YYYY-MM", ambos incluidos
+        - id_cliente, metodo_pago: igualdad
+
+        El filtro se hace en la consulta: los pendientes salen del
+        índice ix_pago_pagado sin recorrer todo el histórico.
+        """
+        for mes in (mes_desde, mes_hasta):
+            if mes is not None and not PATRON_MES.match(mes):
+                raise ErrorValidacion("El mes debe tener formato YYYY-MM.")
+
+        condiciones = []
+        valores = []
+
+        if pagado is not None:
+            condiciones.append("pagado = ?")
+            valores.append(1 if pagado else 0)
+        if mes_desde is not None:
+            condiciones.append("mes >= ?")
+            valores.append(mes_desde)
+        if mes_hasta is not None:
+            condiciones.append("mes <= ?")
+            valores.append(mes_hasta)
+        if id_cliente is not None:
+            condiciones.append("id_cliente = ?")
+            valores.append(id_cliente)
+        if metodo_pago is not None:
+            condiciones.append("metodo_pago = ?")
+            valores.append(metodo_pago)
+
+        query, parametros = self.db.paginar(
+            "SELECT * FROM Pago", "id_pago", despues_de_id, limite,
+            condiciones, valores
+        )
+        try:
+            self.db.conectar()
+            filas = self.db.obtener_datos(query, parametros)
+        except Exception as e:
+            raise ErrorBaseDatos(f"Error filtrando pagos: {e}")
+        finally:
+            self.db.desconectar()
+
+        return [Pago(*f) for f in filas]
+
     # ---------------------------------------------------------
     #   ACTUALIZAR PAGO
     # ---------------------------------------------------------
     def actualizar_pago(self, id_pago, **kwargs):
+        """Actualiza los campos indicados y devuelve el Pago modificado."""
         if not kwargs:
-            return False
+            return None
         try:
             self.db.conectar()
-            return self.db.actualizar("Pago", kwargs, f"id_pago = {id_pago}")
+            self.db.actualizar("Pago", kwargs, {"id_pago": id_pago})
+            return self.obtener_pago(id_pago)
         except Exception as e:
             raise ErrorBaseDatos(f"Error actualizando pago: {e}")
         finally:
@@ -183,7 +267,7 @@ class PagoController:
     def eliminar_pago(self, id_pago):
         try:
             self.db.conectar()
-            return self.db.eliminar("Pago", f"id_pago = {id_pago}")
+            return self.db.eliminar("Pago", {"id_pago": id_pago})
         except Exception as e:
             raise ErrorBaseDatos(f"Error eliminando pago: {e}")
         finally:
@@ -3,11 +3,27 @@ Controlador de Reservas
 Gestiona la lógica de negocio relacionada con las reservas del gimnasio.
 """
 
+import heapq
+import time
+from datetime import datetime, timedelta
+
 from data.gestor_bd import GestorBD
 from model.reserva import Reserva
+from controller.aparato_controller import AparatoController
+from controller.metricas import medir_controlador
+from controller.motor_disponibilidad import (
+    obtener_motor,
+    mascara_intervalo,
+    indices_de_mascara,
+    tramos_de_mascara,
+    tramo_a_hora,
+    MINUTOS_TRAMO,
+    TRAMOS_RESERVABLES
+)
 from util.validaciones import (
     validar_fecha,
     validar_hora,
+    validar_hora_tramo,
     validar_dia_laboral,
     validar_duracion_30min
 )
@@ -17,10 +33,30 @@ from excepciones import (
     DBConsultaError,
     DBInsercionError,
     DBActualizacionError,
-    DBEliminacionError
+    DBEliminacionError,
+    ErrorValidacion,
+    ErrorConflictoReserva
 )
 
+# Campos que, si cambian, obligan a revisar solapes al actualizar
+CAMPOS_HORARIO = {"id_aparato", "fecha_reserva", "hora_inicio", "hora_fin", "estado"}
+
+# Reservas con el nombre del cliente y del aparato (lo que pinta la vista)
+CONSULTA_CON_NOMBRES = """
+    SELECT r.id_reserva,
+           c.nombre || ' ' || c.apellidos AS cliente,
+           a.nombre AS aparato,
+           r.fecha_reserva,
+           r.hora_inicio,
+           r.hora_fin,
+           r.estado
+    FROM Reserva r
+    JOIN Cliente c ON r.id_cliente = c.id_cliente
+    JOIN Aparato a ON r.id_aparato = a.id_aparato
+"""
+
 
+@medir_controlador
 class ReservaController:
     """Controlador responsable de operar sobre las reservas."""
 
@@ -30,6 +66,9 @@ class ReservaController:
     def __init__(self):
         self.db = GestorBD()
 
+        # Ocupación en memoria compartida por todos los controladores
+        self.motor = obtener_motor(self.db)
+
     # ---------------------------------------------------------
     #   VALIDACIÓN CENTRALIZADA
     # ---------------------------------------------------------
@@ -52,6 +91,10 @@ class ReservaController:
         if not validar_hora(hora_inicio):
             return False, "Hora de inicio inválida."
 
+        # Las reservas van por tramos: en punto o y media
+        if not validar_hora_tramo(hora_inicio):
+            return False, "La hora de inicio debe ser en punto o y media."
+
         if not validar_hora(hora_fin):
             return False, "Hora de fin inválida."
 
@@ -67,23 +110,20 @@ class ReservaController:
     def crear_reserva(self, id_cliente, id_aparato, fecha_reserva,
                       hora_inicio, hora_fin, estado="pendiente"):
         """
-        Intenta crear una reserva si el aparato está libre en ese horario.
-        Devuelve el ID de la reserva o None si no se puede.
+        Crea una reserva si el aparato está libre en ese horario.
+        Devuelve la reserva creada (dict como los de
+        obtener_reservas_con_nombres) o None si las horas no son válidas.
+
+        La comprobación de solapes y el INSERT van en la misma transacción
+        BEGIN IMMEDIATE: mientras dura, ningún otro puesto puede escribir,
+        así que dos recepciones no pueden reservar a la vez el mismo hueco.
+        Si el hueco está ocupado lanza ErrorConflictoReserva.
         """
 
         # Comprobación rápida de orden
         if hora_inicio >= hora_fin:
             return None
 
-        # Comprobar disponibilidad real
-        if not self.verificar_disponibilidad(id_aparato, fecha_reserva, hora_inicio, hora_fin):
-            return None
-
-        try:
-            self.db.conectar()
-        except Exception as e:
-            raise DBConexionError("No se pudo conectar para crear la reserva") from e
-
         datos = {
             "id_cliente": id_cliente,
             "id_aparato": id_aparato,
@@ -94,13 +134,162 @@ class ReservaController:
         }
 
         try:
-            nuevo_id = self.db.insertar("Reserva", datos)
-            self.db.desconectar()
-            return nuevo_id
+            with self.db.transaccion(inmediata=True):
+                if estado != "cancelada":
+                    self._comprobar_solape(id_aparato, fecha_reserva, hora_inicio, hora_fin)
+                nuevo_id = self.db.insertar("Reserva", datos)
+                reserva = self.obtener_reserva_con_nombres(nuevo_id)
+
+        except ErrorConflictoReserva:
+            # El motor no lo sabía: hay reservas de otro equipo sin leer
+            self.motor.invalidar(fecha_reserva)
+            raise
+        except DBConexionError:
+            raise
         except Exception as e:
-            self.db.desconectar()
             raise DBInsercionError("Ocurrió un error al insertar la reserva") from e
 
+        if estado != "cancelada":
+            self.motor.reservar(id_aparato, fecha_reserva, hora_inicio, hora_fin)
+
+        return reserva
+
+    def _comprobar_solape(self, id_aparato, fecha, hora_inicio, hora_fin, excluir_id=None):
+        """
+        Lanza ErrorConflictoReserva si otra reserva activa del aparato
+        se solapa con el intervalo. Se llama dentro de la transacción.
+        """
+        query = """
+            SELECT hora_inicio, hora_fin
+            FROM Reserva
+            WHERE id_aparato = ?
+            AND fecha_reserva = ?
+            AND estado != 'cancelada'
+            AND hora_inicio < ?
+            AND hora_fin > ?
+        """
+        parametros = [id_aparato, fecha, hora_fin, hora_inicio]
+
+        if excluir_id is not None:
+            query += " AND id_reserva != ?"
+            parametros.append(excluir_id)
+
+        filas = self.db.obtener_datos(query + " LIMIT 1", tuple(parametros))
+        if filas:
+            h1, h2 = filas[0]
+            raise ErrorConflictoReserva(
+                f"El aparato ya está reservado el {fecha} de {h1} a {h2}."
+            )
+
+    # ---------------------------------------------------------
+    #   CREAR SERIE DE RESERVAS (SEMANAL)
+    # ---------------------------------------------------------
+    def crear_serie_reservas(self, id_cliente, id_aparato, fecha_inicio, fecha_fin,
+                             dias_semana, hora_inicio, hora_fin,
+                             estado="pendiente", todo_o_nada=False):
+        """
+        Reserva el mismo aparato y horario los días de la semana indicados
+        (0=lunes ... 4=viernes) entre fecha_inicio y fecha_fin.
+
+        Los solapes de toda la serie se buscan con una sola consulta y las
+        reservas libres se insertan de una vez, todo en la misma
+        transacción BEGIN IMMEDIATE. Con todo_o_nada=True no se crea
+        ninguna si alguna fecha choca.
+
+        Devuelve {"creadas": [(fecha, id_reserva)],
+                  "conflictos": {fecha: [(hora_inicio, hora_fin)]}}.
+        """
+        if hora_inicio >= hora_fin:
+            raise ErrorValidacion("La hora de inicio debe ser anterior a la de fin.")
+
+        try:
+            inicio = datetime.strptime(fecha_inicio, "%Y-%m-%d")
+            fin = datetime.strptime(fecha_fin, "%Y-%m-%d")
+        except (ValueError, TypeError):
+            raise ErrorValidacion("Las fechas deben tener formato YYYY-MM-DD.")
+
+        if fin < inicio:
+            raise ErrorValidacion("La fecha final es anterior a la inicial.")
+
+        dias_semana = set(dias_semana)
+        fechas = []
+        dia = inicio
+        while dia <= fin:
+            fecha = dia.strftime("%Y-%m-%d")
+            if dia.weekday() in dias_semana and validar_dia_laboral(fecha):
+                fechas.append(fecha)
+            dia += timedelta(days=1)
+
+        resultado = {"creadas": [], "conflictos": {}}
+        if not fechas:
+            return resultado
+
+        try:
+            with self.db.transaccion(inmediata=True):
+                if estado != "cancelada":
+                    resultado["conflictos"] = self._solapes_en_fechas(
+                        id_aparato, fechas, hora_inicio, hora_fin
+                    )
+
+                libres = [f for f in fechas if f not in resultado["conflictos"]]
+                if todo_o_nada and resultado["conflictos"]:
+                    libres = []
+
+                ids = self.db.insertar_lote("Reserva", [
+                    {
+                        "id_cliente": id_cliente,
+                        "id_aparato": id_aparato,
+                        "fecha_reserva": f,
+                        "hora_inicio": hora_inicio,
+                        "hora_fin": hora_fin,
+                        "estado": estado
+                    }
+                    for f in libres
+                ])
+
+        except DBConexionError:
+            raise
+        except Exception as e:
+            raise DBInsercionError("Ocurrió un error al insertar la serie de reservas") from e
+
+        if ids:
+            resultado["creadas"] = list(zip(libres, range(ids[0], ids[1] + 1)))
+
+        for fecha, _ in resultado["creadas"]:
+            if estado != "cancelada":
+                self.motor.reservar(id_aparato, fecha, hora_inicio, hora_fin)
+        for fecha in resultado["conflictos"]:
+            self.motor.invalidar(fecha)
+
+        return resultado
+
+    def _solapes_en_fechas(self, id_aparato, fechas, hora_inicio, hora_fin):
+        """
+        {fecha: [(h1, h2)]} de las reservas activas del aparato que se
+        solapan con el horario en alguna de las fechas. Una sola consulta
+        sobre el rango (usa ix_reserva_aparato_fecha_hora).
+        """
+        filas = self.db.obtener_datos(
+            """
+            SELECT fecha_reserva, hora_inicio, hora_fin
+            FROM Reserva
+            WHERE id_aparato = ?
+            AND fecha_reserva BETWEEN ? AND ?
+            AND estado != 'cancelada'
+            AND hora_inicio < ?
+            AND hora_fin > ?
+            ORDER BY fecha_reserva, hora_inicio
+            """,
+            (id_aparato, fechas[0], fechas[-1], hora_fin, hora_inicio)
+        )
+
+        buscadas = set(fechas)
+        conflictos = {}
+        for fecha, h1, h2 in filas:
+            if fecha in buscadas:
+                conflictos.setdefault(fecha, []).append((h1, h2))
+        return conflictos
+
     # ---------------------------------------------------------
     #   OBTENER RESERVA POR ID
     # ---------------------------------------------------------
@@ -109,9 +298,10 @@ class ReservaController:
             self.db.conectar()
             query = "SELECT * FROM Reserva WHERE id_reserva = ?"
             resultado = self.db.obtener_datos(query, (id_reserva,))
-            self.db.desconectar()
         except Exception as e:
             raise DBConsultaError("Error al consultar la reserva por ID") from e
+        finally:
+            self.db.desconectar()
 
         if not resultado:
             return None
@@ -126,17 +316,21 @@ class ReservaController:
         try:
             self.db.conectar()
             filas = self.db.obtener_datos("SELECT * FROM Reserva")
-            self.db.desconectar()
         except Exception as e:
             raise DBConsultaError("Error al obtener todas las reservas") from e
+        finally:
+            self.db.desconectar()
 
         return [Reserva(*f) for f in filas]
 
     # ---------------------------------------------------------
     #   OBTENER RESERVAS CON NOMBRES (PARA LA VISTA)
     # ---------------------------------------------------------
-    def obtener_reservas_con_nombres(self):
+    def obtener_reservas_con_nombres(self, despues_de_id=None, limite=None):
         """
+        Para paginar se pasa el último id_reserva de la página anterior
+        (despues_de_id) y el tamaño de página (limite).
+
         Devuelve una lista de diccionarios:
         [
            {
@@ -150,62 +344,121 @@ class ReservaController:
            }
         ]
         """
+        query, parametros = self.db.paginar(
+            CONSULTA_CON_NOMBRES, "r.id_reserva", despues_de_id, limite
+        )
         try:
             self.db.conectar()
-            query = """
-                SELECT r.id_reserva,
-                       c.nombre || ' ' || c.apellidos AS cliente,
-                       a.nombre AS aparato,
-                       r.fecha_reserva,
-                       r.hora_inicio,
-                       r.hora_fin,
-                       r.estado
-                FROM Reserva r
-                JOIN Cliente c ON r.id_cliente = c.id_cliente
-                JOIN Aparato a ON r.id_aparato = a.id_aparato
-                ORDER BY r.id_reserva DESC
-            """
-            filas = self.db.obtener_datos(query)
-            self.db.desconectar()
+            filas = self.db.obtener_datos(query, parametros)
         except Exception as e:
             raise DBConsultaError("Error al obtener las reservas con nombres") from e
+        finally:
+            self.db.desconectar()
 
-        lista = []
-        for f in filas:
-            lista.append({
-                "id_reserva": f[0],
-                "cliente": f[1],
-                "aparato": f[2],
-                "fecha": f[3],
-                "inicio": f[4],
-                "fin": f[5],
-                "estado": f[6]
-            })
-        return lista
+        return [self._con_nombres_a_dict(f) for f in filas]
+
+    def obtener_reserva_con_nombres(self, id_reserva):
+        """Una reserva en el mismo formato (None si no existe)."""
+        try:
+            self.db.conectar()
+            filas = self.db.obtener_datos(
+                CONSULTA_CON_NOMBRES + " WHERE r.id_reserva = ?", (id_reserva,)
+            )
+        except Exception as e:
+            raise DBConsultaError("Error al obtener la reserva con nombres") from e
+        finally:
+            self.db.desconectar()
+
+        return self._con_nombres_a_dict(filas[0]) if filas else None
+
+    @staticmethod
+    def _con_nombres_a_dict(f):
+        return {
+            "id_reserva": f[0],
+            "cliente": f[1],
+            "aparato": f[2],
+            "fecha": f[3],
+            "inicio": f[4],
+            "fin": f[5],
+            "estado": f[6]
+        }
 
     # ---------------------------------------------------------
     #   ACTUALIZAR RESERVA
     # ---------------------------------------------------------
     def actualizar_reserva(self, id_reserva, **kwargs):
+        """
+        Actualiza los campos indicados. Si cambia el aparato, el día,
+        las horas o el estado, se comprueba el solape en la misma
+        transacción (ErrorConflictoReserva si choca con otra reserva).
+        Devuelve la reserva ya modificada (dict con nombres) o None si
+        no existe.
+        """
+        fecha_anterior = None
         try:
-            self.db.conectar()
-            ok = self.db.actualizar("Reserva", kwargs, f"id_reserva = {id_reserva}")
-            self.db.desconectar()
-            return ok
+            with self.db.transaccion(inmediata=True):
+                actual = self.db.obtener_datos(
+                    """
+                    SELECT id_aparato, fecha_reserva, hora_inicio, hora_fin, estado
+                    FROM Reserva WHERE id_reserva = ?
+                    """,
+                    (id_reserva,)
+                )
+                if not actual:
+                    return None
+
+                id_aparato, fecha_anterior, hora_inicio, hora_fin, estado = actual[0]
+
+                if CAMPOS_HORARIO & kwargs.keys():
+                    nuevo_estado = kwargs.get("estado", estado)
+                    if nuevo_estado != "cancelada":
+                        self._comprobar_solape(
+                            kwargs.get("id_aparato", id_aparato),
+                            kwargs.get("fecha_reserva", fecha_anterior),
+                            kwargs.get("hora_inicio", hora_inicio),
+                            kwargs.get("hora_fin", hora_fin),
+                            excluir_id=id_reserva
+                        )
+
+                self.db.actualizar("Reserva", kwargs, {"id_reserva": id_reserva})
+                reserva = self.obtener_reserva_con_nombres(id_reserva)
+
+        except ErrorConflictoReserva:
+            self.motor.invalidar(kwargs.get("fecha_reserva", fecha_anterior))
+            raise
         except Exception as e:
             raise DBActualizacionError("Error al actualizar la reserva") from e
 
+        # Puede haber cambiado de día, de hora o haberse cancelado
+        self.motor.invalidar(fecha_anterior)
+        if "fecha_reserva" in kwargs:
+            self.motor.invalidar(kwargs["fecha_reserva"])
+
+        return reserva
+
     # ---------------------------------------------------------
     #   ELIMINAR RESERVA
     # ---------------------------------------------------------
     def eliminar_reserva(self, id_reserva):
         try:
             self.db.conectar()
-            ok = self.db.eliminar("Reserva", f"id_reserva = {id_reserva}")
-            self.db.desconectar()
-            return ok
+            fecha = self._fecha_de_reserva(id_reserva)
+            ok = self.db.eliminar("Reserva", {"id_reserva": id_reserva})
         except Exception as e:
             raise DBEliminacionError("Error al eliminar la reserva") from e
+        finally:
+            self.db.desconectar()
+
+        self.motor.invalidar(fecha)
+        return ok
+
+    def _fecha_de_reserva(self, id_reserva):
+        # Se llama con la conexión ya abierta
+        filas = self.db.obtener_datos(
+            "SELECT fecha_reserva FROM Reserva WHERE id_reserva = ?",
+            (id_reserva,)
+        )
+        return filas[0][0] if filas else None
 
     # ---------------------------------------------------------
     #   RESERVAS FILTRADAS
@@ -217,10 +470,11 @@ class ReservaController:
                 "SELECT * FROM Reserva WHERE id_cliente = ?",
                 (id_cliente,)
             )
-            self.db.desconectar()
             return [Reserva(*f) for f in filas]
         except Exception as e:
             raise DBConsultaError("Error al obtener reservas del cliente") from e
+        finally:
+            self.db.desconectar()
 
     def obtener_reservas_por_aparato(self, id_aparato):
         try:
@@ -229,10 +483,11 @@ class ReservaController:
                 "SELECT * FROM Reserva WHERE id_aparato = ?",
                 (id_aparato,)
             )
-            self.db.desconectar()
             return [Reserva(*f) for f in filas]
         except Exception as e:
             raise DBConsultaError("Error al obtener reservas del aparato") from e
+        finally:
+            self.db.desconectar()
 
     def obtener_reservas_por_fecha(self, fecha):
         try:
@@ -241,10 +496,11 @@ class ReservaController:
                 "SELECT * FROM Reserva WHERE fecha_reserva = ?",
                 (fecha,)
             )
-            self.db.desconectar()
             return [Reserva(*f) for f in filas]
         except Exception as e:
             raise DBConsultaError("Error al obtener reservas por fecha") from e
+        finally:
+            self.db.desconectar()
 
     # ---------------------------------------------------------
     #   VERIFICAR DISPONIBILIDAD
@@ -252,64 +508,213 @@ class ReservaController:
     def verificar_disponibilidad(self, id_aparato, fecha, hora_inicio, hora_fin):
         """
         Verifica si existe solapamiento horario con reservas previas.
-        Un intervalo solapa si:
-                inicio1 < fin2   Y   inicio2 < fin1
+        Se resuelve con el motor en memoria: basta con comprobar que
+        ningún tramo de 30 minutos del intervalo esté ya ocupado.
         """
+        try:
+            return self.motor.esta_libre(id_aparato, fecha, hora_inicio, hora_fin)
+        except Exception as e:
+            raise DBConsultaError("Error al verificar disponibilidad del aparato") from e
+
+    def primer_tramo_libre(self, id_aparato, fecha, desde="00:00"):
+        """Primera hora libre del aparato ese día a partir de `desde` (o None)."""
+        try:
+            return self.motor.primer_tramo_libre(id_aparato, fecha, desde)
+        except Exception as e:
+            raise DBConsultaError("Error al buscar tramos libres del aparato") from e
+
+    def tramos_libres_por_tipo(self, tipo, fecha):
+        """{id_aparato: [horas libres]} de los aparatos disponibles de un tipo."""
+        try:
+            return self.motor.tramos_libres_por_tipo(tipo, fecha)
+        except Exception as e:
+            raise DBConsultaError("Error al buscar tramos libres por tipo") from e
+
+    # ---------------------------------------------------------
+    #   BUSCAR HUECOS LIBRES
+    # ---------------------------------------------------------
+    def buscar_huecos_libres(self, fecha_inicio, fecha_fin, hora_preferida,
+                             id_aparato=None, tipo=None, id_cliente=None,
+                             franja=None, limite=5):
+        """
+        Devuelve los `limite` tramos libres más cercanos a la hora preferida
+        del día fecha_inicio, buscando hasta fecha_fin (días laborables).
+
+        - id_aparato: busca en ese aparato; tipo: en todos los aparatos
+          disponibles de ese tipo.
+        - id_cliente: descarta los tramos en que el cliente ya tiene otra
+          reserva (no puede estar en dos aparatos a la vez).
+        - franja: ("HH:MM", "HH:MM") para limitar las horas candidatas.
+
+        La ocupación del rango se lee con una sola consulta y el resto es
+        un recorrido en memoria de los bitmaps. Cada hueco es un dict:
+        {"id_aparato", "fecha", "hora_inicio", "hora_fin", "distancia"}
+        con la distancia en minutos a la fecha/hora pedida.
+        """
+        if id_aparato is not None:
+            aparatos = [id_aparato]
+        elif tipo is not None:
+            aparatos = [
+                a.id_aparato
+                for a in AparatoController().obtener_aparatos_por_tipo(tipo)
+                if a.estado == "disponible"
+            ]
+        else:
+            raise ErrorValidacion("Indique un aparato o un tipo de aparato.")
+
+        permitidos = TRAMOS_RESERVABLES
+        if franja:
+            permitidos &= mascara_intervalo(*franja)
+
+        ocupacion = self.motor.cargar_rango(fecha_inicio, fecha_fin)
+        ocupacion_cliente = (
+            self._ocupacion_cliente(id_cliente, fecha_inicio, fecha_fin)
+            if id_cliente is not None else {}
+        )
+
+        origen = datetime.strptime(f"{fecha_inicio} {hora_preferida}", "%Y-%m-%d %H:%M")
+        ahora = datetime.now()
+
+        def candidatos():
+            for fecha, por_aparato in ocupacion.items():
+                if not validar_dia_laboral(fecha):
+                    continue
+
+                dia = datetime.strptime(fecha, "%Y-%m-%d")
+                bloqueados = ocupacion_cliente.get(fecha, 0)
+
+                for id_ap in aparatos:
+                    libres = ~(por_aparato.get(id_ap, 0) | bloqueados) & permitidos
+
+                    for tramo in indices_de_mascara(libres):
+                        inicio = dia + timedelta(minutes=tramo * MINUTOS_TRAMO)
+                        if inicio < ahora:
+                            continue
+
+                        distancia = abs(inicio - origen).total_seconds() // 60
+                        yield distancia, fecha, tramo, id_ap
+
+        return [
+            {
+                "id_aparato": id_ap,
+                "fecha": fecha,
+                "hora_inicio": tramo_a_hora(tramo),
+                "hora_fin": tramo_a_hora(tramo + 1),
+                "distancia": int(distancia)
+            }
+            for distancia, fecha, tramo, id_ap in heapq.nsmallest(limite, candidatos())
+        ]
+
+    def _ocupacion_cliente(self, id_cliente, fecha_inicio, fecha_fin):
+        """{fecha: mascara} con los tramos que el cliente ya tiene reservados."""
         try:
             self.db.conectar()
-            query = """
-                SELECT COUNT(*)
+            filas = self.db.obtener_datos(
+                """
+                SELECT fecha_reserva, hora_inicio, hora_fin
                 FROM Reserva
-                WHERE id_aparato = ?
-                AND fecha_reserva = ?
+                WHERE id_cliente = ?
+                AND fecha_reserva BETWEEN ? AND ?
                 AND estado != 'cancelada'
-                AND (
-                    hora_inicio < ?   -- fin nueva
-                    AND ? < hora_fin  -- inicio nueva
-                )
-            """
-            res = self.db.obtener_datos(query, (id_aparato, fecha, hora_fin, hora_inicio))
-            self.db.desconectar()
-            return res[0][0] == 0
+                """,
+                (id_cliente, fecha_inicio, fecha_fin)
+            )
         except Exception as e:
-            raise DBConsultaError("Error al verificar disponibilidad del aparato") from e
+            raise DBConsultaError(f"Error obteniendo reservas del cliente {id_cliente}: {e}") from e
+        finally:
+            self.db.desconectar()
+
+        ocupacion = {}
+        for fecha, h1, h2 in filas:
+            ocupacion[fecha] = ocupacion.get(fecha, 0) | mascara_intervalo(h1, h2)
+        return ocupacion
 
     # ---------------------------------------------------------
     #   INFORME DE DISPONIBILIDAD
     # ---------------------------------------------------------
     def generar_informe_disponibilidad(self, fecha):
-        try:
-            self.db.conectar()
+        """
+        Devuelve las reservas de un día agrupadas por aparato:
+        {id_aparato: {"nombre": ..., "reservas": [(inicio, fin, cliente), ...],
+                      "libres": [horas de inicio libres]}}
+        """
+        return self.generar_informe_disponibilidad_rango(fecha, fecha).get(fecha, {})
 
-            query_aparatos = "SELECT id_aparato, nombre FROM Aparato ORDER BY id_aparato"
-            aparatos = self.db.obtener_datos(query_aparatos)
+    def generar_informe_disponibilidad_rango(self, fecha_inicio, fecha_fin):
+        """
+        Versión de varios días del informe, resuelta con una sola consulta
+        ordenada por día, aparato y hora:
+        {fecha: {id_aparato: {"nombre": ..., "reservas": [...], "libres": [...]}}}
+
+        La primera parte da una fila vacía por día y aparato (sin hora, va
+        delante al ordenar) y la segunda las reservas del rango, que se
+        buscan por ix_reserva_fecha. Cruzar los días con Reserva en un
+        LEFT JOIN hacía que SQLite, con estadísticas de ANALYZE, montara
+        un índice automático sobre toda la tabla en cada llamada.
+
+        La ocupación leída se entrega también al motor de disponibilidad,
+        que así tiene esos días al día sin volver a consultar.
+        """
+        query = """
+            WITH RECURSIVE dias(fecha) AS (
+                SELECT ?
+                UNION ALL
+                SELECT date(fecha, '+1 day') FROM dias WHERE fecha < ?
+            )
+            SELECT d.fecha, a.id_aparato, a.nombre,
+                   NULL, NULL, NULL, NULL
+            FROM dias d
+            CROSS JOIN Aparato a
+            UNION ALL
+            SELECT r.fecha_reserva, a.id_aparato, a.nombre,
+                   r.hora_inicio, r.hora_fin, c.nombre, c.apellidos
+            FROM Reserva r
+            JOIN Aparato a ON a.id_aparato = r.id_aparato
+            LEFT JOIN Cliente c ON c.id_cliente = r.id_cliente
+            WHERE r.fecha_reserva BETWEEN ? AND ?
+              AND r.estado != 'cancelada'
+            ORDER BY 1, 2, 4
+        """
 
+        leido_en = time.monotonic()
+        try:
+            self.db.conectar()
             informe = {}
+            ocupacion = {}
+
+            for fecha, id_aparato, nombre_aparato, h1, h2, nom, ape in \
+                    self.db.iterar_datos(query, (fecha_inicio, fecha_fin) * 2):
+
+                aparatos = informe.setdefault(fecha, {})
+                datos = aparatos.get(id_aparato)
+                if datos is None:
+                    datos = aparatos[id_aparato] = {
+                        "nombre": nombre_aparato,
+                        "reservas": []
+                    }
+
+                mascaras = ocupacion.setdefault(fecha, {})
+                mascaras.setdefault(id_aparato, 0)
+
+                if h1 is not None:
+                    cliente = f"{nom} {ape}" if nom is not None else "Desconocido"
+                    datos["reservas"].append((h1, h2, cliente))
+                    try:
+                        mascaras[id_aparato] |= mascara_intervalo(h1, h2)
+                    except (ValueError, AttributeError):
+                        pass
 
-            for id_aparato, nombre_aparato in aparatos:
-                query_res = """
-                    SELECT r.hora_inicio, r.hora_fin, c.nombre, c.apellidos
-                    FROM Reserva r
-                    JOIN Cliente c ON r.id_cliente = c.id_cliente
-                    WHERE r.id_aparato = ?
-                    AND r.fecha_reserva = ?
-                    AND r.estado != 'cancelada'
-                    ORDER BY r.hora_inicio
-                """
-
-                filas = self.db.obtener_datos(query_res, (id_aparato, fecha))
-
-                lista = []
-                for h1, h2, nom, ape in filas:
-                    lista.append((h1, h2, f"{nom} {ape}"))
-
-                informe[id_aparato] = {
-                    "nombre": nombre_aparato,
-                    "reservas": lista
-                }
+        except Exception as e:
+            raise DBConsultaError(f"Error al generar informe de disponibilidad: {e}") from e
 
+        finally:
             self.db.desconectar()
-            return informe
 
-        except Exception as e:
-            raise DBConsultaError(f"Error al generar informe de disponibilidad: {e}") from e
+        for fecha, aparatos in informe.items():
+            for id_aparato, datos in aparatos.items():
+                datos["libres"] = tramos_de_mascara(
+                    ~ocupacion[fecha][id_aparato] & TRAMOS_RESERVABLES
+                )
+
+        self.motor.guardar_dias(ocupacion, leido_en)
+        return informe
@@ -9,6 +9,7 @@ seguridad.
 
 import hashlib
 from data.gestor_bd import GestorBD
+from controller.metricas import medir_controlador
 from model.usuario import Usuario
 
 # Excepciones del sistema
@@ -21,6 +22,7 @@ from excepciones import (
 )
 
 
+@medir_controlador
 class UsuarioController:
     """Controlador encargado de gestionar los usuarios del sistema."""
 
@@ -111,9 +113,7 @@ class UsuarioController:
 
             password_hash = self.hash_password(password_nueva)
             datos = {"password_hash": password_hash}
-            condicion = f"usuario = '{usuario}'"
-
-            return self.gestor.actualizar("Usuario", datos, condicion)
+            return self.gestor.actualizar("Usuario", datos, {"usuario": usuario})
 
         except (DBActualizacionError, ErrorBaseDatos) as e:
             raise ErrorLogin(f"No se pudo actualizar la contraseña: {e}")
@@ -6,54 +6,211 @@
 import sqlite3
 import os
 import hashlib
+import threading
+import time
+from contextlib import contextmanager
 
 # Excepciones personalizadas del sistema
 from excepciones import (
     ErrorBaseDatos,
-    DBConexionError,
     DBConsultaError,
     DBInsercionError,
     DBActualizacionError,
     DBEliminacionError
 )
 
+from data.pool_conexiones import obtener_pool, configurar_pool, configurar_perfil
+from data.migraciones import MIGRACIONES
+from data.versiones import marcar_cambio, marcar_cambio_query, versiones
+from data.sentencias import obtener_catalogo, desglosar_condicion, IGUAL
+from data import instrumentacion
+
 
 class GestorBD:
     """Gestor de base de datos para el proyecto GymForTheMoment."""
 
-    def __init__(self, db_name="gym.db"):
+    def __init__(self, db_name=None):
+        # GFTM_BD permite usar otro fichero (p. ej. el de las pruebas de
+        # rendimiento); una ruta absoluta se usa tal cual
+        db_name = db_name or os.environ.get("GFTM_BD", "gym.db")
         self.db_path = os.path.join(os.path.dirname(__file__), db_name)
-        self.conexion = None
-        self.cursor = None
+
+        # Tablas / columnas válidas y SQL ya construido de los CRUD auxiliares
+        self._catalogo = obtener_catalogo(self.db_path)
+
+        # Cada hilo guarda aquí su conexión prestada por el pool
+        self._local = threading.local()
+
+    # ---------------------------------------------------------
+    #   CONEXIÓN Y CURSOR DEL HILO ACTUAL
+    # ---------------------------------------------------------
+    @property
+    def conexion(self):
+        return getattr(self._local, "conexion", None)
+
+    @property
+    def cursor(self):
+        return getattr(self._local, "cursor", None)
+
+    # ---------------------------------------------------------
+    #   POOL DE CONEXIONES
+    # ---------------------------------------------------------
+    @staticmethod
+    def configurar_pool(max_inactivas=None, tiempo_inactivo=None, sentencias_en_cache=None):
+        """Ajusta las conexiones libres que se guardan, su inactividad y la caché de sentencias."""
+        configurar_pool(max_inactivas, tiempo_inactivo, sentencias_en_cache)
+
+    @staticmethod
+    def configurar_perfil(perfil):
+        """Elige el perfil de PRAGMAs: "seguro" (por defecto) o "rapido"."""
+        configurar_perfil(perfil)
+
+    # ---------------------------------------------------------
+    #   INSTRUMENTACIÓN
+    #   Cada sentencia se cronometra y se agrupa por su huella
+    #   (data/instrumentacion.py); las lentas van a un registro.
+    # ---------------------------------------------------------
+    @staticmethod
+    def configurar_instrumentacion(umbral_ms=None, ruta_log=None):
+        """Umbral (ms) a partir del cual una consulta es lenta y fichero donde se anotan."""
+        instrumentacion.configurar_instrumentacion(umbral_ms, ruta_log)
+
+    @staticmethod
+    def estadisticas_consultas():
+        """Llamadas, tiempo total / medio / máximo y filas por consulta."""
+        return instrumentacion.estadisticas()
+
+    @staticmethod
+    def reiniciar_estadisticas():
+        instrumentacion.reiniciar_estadisticas()
+
+    @staticmethod
+    def _medir(query, inicio, filas):
+        instrumentacion.registrar(query, (time.perf_counter() - inicio) * 1000, filas)
 
     # ---------------------------------------------------------
     #   CONEXIÓN / DESCONEXIÓN
+    #   conectar() toma prestada una conexión del pool y
+    #   desconectar() la devuelve. Si se anidan llamadas en el
+    #   mismo hilo se reutiliza la conexión ya prestada.
     # ---------------------------------------------------------
     def conectar(self):
-        try:
-            self.conexion = sqlite3.connect(self.db_path)
-            self.conexion.execute("PRAGMA foreign_keys = ON")
-            self.cursor = self.conexion.cursor()
+        estado = self._local
+
+        if getattr(estado, "conexion", None) is not None:
+            estado.nivel += 1
             return True
 
-        except sqlite3.Error as e:
-            raise DBConexionError(f"No se pudo conectar a la base de datos: {e}")
+        conexion = obtener_pool(self.db_path).obtener()
+
+        estado.conexion = conexion
+        estado.cursor = conexion.cursor()
+        estado.nivel = 1
+        return True
 
     def desconectar(self):
-        if self.conexion:
-            self.conexion.close()
+        estado = self._local
+        conexion = getattr(estado, "conexion", None)
+
+        if conexion is None:
+            return
+
+        estado.nivel -= 1
+        if estado.nivel > 0:
+            return
+
+        estado.cursor.close()
+        estado.conexion = None
+        estado.cursor = None
+        obtener_pool(self.db_path).devolver(conexion)
+
+    # ---------------------------------------------------------
+    #   TRANSACCIONES (UNIDAD DE TRABAJO)
+    # ---------------------------------------------------------
+    @property
+    def en_transaccion(self):
+        """Indica si el hilo actual tiene una transacción abierta."""
+        return getattr(self._local, "nivel_transaccion", 0) > 0
+
+    @contextmanager
+    def transaccion(self, inmediata=False):
+        """
+        Agrupa varias operaciones en una sola transacción:
+
+            with gestor.transaccion():
+                gestor.insertar(...)
+                gestor.actualizar(...)
+
+        Los CRUD auxiliares no confirman mientras esté abierta; se hace
+        un único COMMIT al salir del bloque o ROLLBACK si hay excepción.
+        Los bloques anidados usan SAVEPOINT, de modo que un fallo interno
+        sólo deshace su parte.
+
+        Con inmediata=True se usa BEGIN IMMEDIATE: se reserva la escritura
+        desde el principio y nadie más puede escribir hasta el COMMIT.
+        """
+        self.conectar()
+        estado = self._local
+        nivel = getattr(estado, "nivel_transaccion", 0)
+        punto = f"sp_{nivel}"
+
+        try:
+            if nivel == 0:
+                self.conexion.execute("BEGIN IMMEDIATE" if inmediata else "BEGIN")
+            else:
+                self.conexion.execute(f"SAVEPOINT {punto}")
+        except sqlite3.Error as e:
+            self.desconectar()
+            raise ErrorBaseDatos(f"No se pudo iniciar la transacción: {e}")
+
+        estado.nivel_transaccion = nivel + 1
+
+        try:
+            yield self
+
+        except BaseException:
+            estado.nivel_transaccion = nivel
+            try:
+                if nivel == 0:
+                    self.conexion.rollback()
+                else:
+                    self.conexion.execute(f"ROLLBACK TO {punto}")
+                    self.conexion.execute(f"RELEASE {punto}")
+            finally:
+                self.desconectar()
+            raise
+
+        else:
+            estado.nivel_transaccion = nivel
+            try:
+                if nivel == 0:
+                    self.conexion.commit()
+                else:
+                    self.conexion.execute(f"RELEASE {punto}")
+            except sqlite3.Error as e:
+                raise ErrorBaseDatos(f"No se pudo confirmar la transacción: {e}")
+            finally:
+                self.desconectar()
+
+    def _confirmar(self):
+        """Confirma los cambios salvo que haya una transacción abierta."""
+        if not self.en_transaccion:
+            self.conexion.commit()
 
     # ---------------------------------------------------------
     #   QUERIES GENÉRICAS
     # ---------------------------------------------------------
     def ejecutar_query(self, query, parametros=None):
         try:
+            inicio = time.perf_counter()
             if parametros:
                 self.cursor.execute(query, parametros)
             else:
                 self.cursor.execute(query)
 
-            self.conexion.commit()
+            self._confirmar()
+            self._medir(query, inicio, self.cursor.rowcount)
+            marcar_cambio_query(self.db_path, query)
             return True
 
         except sqlite3.Error as e:
@@ -61,55 +218,235 @@ class GestorBD:
 
     def obtener_datos(self, query, parametros=None):
         try:
+            inicio = time.perf_counter()
             if parametros:
                 self.cursor.execute(query, parametros)
             else:
                 self.cursor.execute(query)
 
-            return self.cursor.fetchall()
+            filas = self.cursor.fetchall()
+            self._medir(query, inicio, len(filas))
+            return filas
 
         except sqlite3.Error as e:
             raise DBConsultaError(f"Error obteniendo datos: {e}\nQUERY: {query}")
 
+    def iterar_datos(self, query, parametros=None, tamano_bloque=500):
+        """
+        Igual que obtener_datos pero devuelve las filas poco a poco
+        (fetchmany) en lugar de cargarlas todas en memoria.
+        Usa un cursor propio, así que puede combinarse con otras consultas.
+        """
+        cursor = self.conexion.cursor()
+
+        # Sólo cuenta el tiempo dentro de SQLite, no el de quien consume las filas
+        ms = 0.0
+        total = 0
+
+        try:
+            inicio = time.perf_counter()
+            if parametros:
+                cursor.execute(query, parametros)
+            else:
+                cursor.execute(query)
+
+            while True:
+                filas = cursor.fetchmany(tamano_bloque)
+                ms += (time.perf_counter() - inicio) * 1000
+                if not filas:
+                    break
+                total += len(filas)
+                yield from filas
+                inicio = time.perf_counter()
+
+            instrumentacion.registrar(query, ms, total)
+
+        except sqlite3.Error as e:
+            raise DBConsultaError(f"Error obteniendo datos: {e}\nQUERY: {query}")
+
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def paginar(query, columna_id, despues_de_id=None, limite=None,
+                condiciones=None, valores=()):
+        """
+        Añade paginación por clave (keyset) a un SELECT sin WHERE ni ORDER BY:
+        filas con `columna_id` < despues_de_id, de mayor a menor id.
+        A diferencia de OFFSET, cada página cuesta lo mismo aunque la
+        tabla tenga años de historia (se salta directo por la clave).
+
+        `condiciones` son filtros extra ("pagado = ?", ...) que se unen
+        con AND; `valores` son sus parámetros, en el mismo orden.
+        Devuelve (query, parametros).
+        """
+        condiciones = list(condiciones or [])
+        parametros = list(valores)
+
+        if despues_de_id is not None:
+            condiciones.append(f"{columna_id} < ?")
+            parametros.append(despues_de_id)
+
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+
+        query += f" ORDER BY {columna_id} DESC"
+
+        if limite is not None:
+            query += " LIMIT ?"
+            parametros.append(limite)
+
+        return query, tuple(parametros)
+
+    # ---------------------------------------------------------
+    #   VERSIONES DE TABLAS
+    # ---------------------------------------------------------
+    def versiones_tablas(self, *tablas):
+        """
+        {tabla: versión}. La versión sube con cada escritura hecha por
+        este proceso, así que si no ha cambiado los datos siguen igual.
+        """
+        return versiones(self.db_path, tablas)
+
     # ---------------------------------------------------------
     #   CRUD AUXILIAR
+    #   El SQL sale del catálogo (data/sentencias.py): se valida
+    #   contra el esquema y se construye una vez por tabla y
+    #   columnas; como el texto es siempre el mismo, sqlite3 lo
+    #   encuentra ya compilado en su caché de sentencias.
+    #
+    #   La condición de actualizar / eliminar es un dict
+    #   {columna: valor} (lista → IN, None → IS NULL) cuyos
+    #   valores van como parámetros; también se admite texto SQL
+    #   con ? y sus `parametros`, para rangos y casos especiales.
     # ---------------------------------------------------------
-    def insertar(self, tabla, datos):
-        columnas = ', '.join(datos.keys())
-        placeholders = ', '.join(['?' for _ in datos])
-        query = f"INSERT INTO {tabla} ({columnas}) VALUES ({placeholders})"
+    def _condicion(self, condicion, parametros):
+        """(forma del WHERE, texto añadido, valores) de la condición."""
+        if isinstance(condicion, str):
+            return (), condicion, tuple(parametros)
+        forma, valores = desglosar_condicion(condicion)
+        return forma, "", valores
 
+    def insertar(self, tabla, datos):
         try:
+            query = self._catalogo.insertar(self.conexion, tabla, tuple(datos))
+
+            inicio = time.perf_counter()
             self.cursor.execute(query, tuple(datos.values()))
-            self.conexion.commit()
+            self._confirmar()
+            self._medir(query, inicio, 1)
+            marcar_cambio(self.db_path, tabla)
             return self.cursor.lastrowid
 
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ErrorBaseDatos) as e:
             raise DBInsercionError(f"Error al insertar en {tabla}: {e}")
 
-    def actualizar(self, tabla, datos, condicion):
-        set_clause = ', '.join([f"{k} = ?" for k in datos.keys()])
-        query = f"UPDATE {tabla} SET {set_clause} WHERE {condicion}"
-
+    def actualizar(self, tabla, datos, condicion, parametros=()):
         try:
-            self.cursor.execute(query, tuple(datos.values()))
-            self.conexion.commit()
+            forma, texto, valores = self._condicion(condicion, parametros)
+            query = self._catalogo.actualizar(self.conexion, tabla, tuple(datos), forma) + texto
+
+            inicio = time.perf_counter()
+            self.cursor.execute(query, tuple(datos.values()) + valores)
+            self._confirmar()
+            self._medir(query, inicio, self.cursor.rowcount)
+            marcar_cambio(self.db_path, tabla)
             return True
 
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ErrorBaseDatos) as e:
             raise DBActualizacionError(f"Error al actualizar en {tabla}: {e}")
 
-    def eliminar(self, tabla, condicion):
-        query = f"DELETE FROM {tabla} WHERE {condicion}"
-
+    def eliminar(self, tabla, condicion, parametros=()):
         try:
-            self.cursor.execute(query)
-            self.conexion.commit()
+            forma, texto, valores = self._condicion(condicion, parametros)
+            query = self._catalogo.eliminar(self.conexion, tabla, forma) + texto
+
+            inicio = time.perf_counter()
+            self.cursor.execute(query, valores)
+            self._confirmar()
+            self._medir(query, inicio, self.cursor.rowcount)
+            marcar_cambio(self.db_path, tabla)
             return True
 
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ErrorBaseDatos) as e:
             raise DBEliminacionError(f"Error al eliminar en {tabla}: {e}")
 
+    # ---------------------------------------------------------
+    #   OPERACIONES EN LOTE
+    #   Construyen la sentencia una sola vez y la ejecutan con
+    #   executemany dentro de una única transacción.
+    # ---------------------------------------------------------
+    def insertar_lote(self, tabla, filas):
+        """
+        Inserta varias filas (lista de dicts con las mismas columnas).
+        Devuelve (primer_id, ultimo_id) de las filas insertadas
+        o None si no había nada que insertar.
+
+        Los IDs son consecutivos porque todas las filas se insertan en
+        la misma transacción; por eso las filas no deben traer su ID.
+        """
+        filas = list(filas)
+        if not filas:
+            return None
+
+        columnas = tuple(filas[0].keys())
+
+        try:
+            valores = [tuple(f[c] for c in columnas) for f in filas]
+
+            inicio = time.perf_counter()
+            with self.transaccion():
+                query = self._catalogo.insertar(self.conexion, tabla, columnas)
+                self.cursor.executemany(query, valores)
+                ultimo_id = self.cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+            self._medir(query, inicio, len(valores))
+            marcar_cambio(self.db_path, tabla)
+            return ultimo_id - len(valores) + 1, ultimo_id
+
+        except KeyError as e:
+            raise DBInsercionError(f"Error al insertar lote en {tabla}: falta la columna {e}")
+
+        except (sqlite3.Error, ErrorBaseDatos) as e:
+            raise DBInsercionError(f"Error al insertar lote en {tabla}: {e}")
+
+    def actualizar_lote(self, tabla, filas, clave):
+        """
+        Actualiza varias filas (lista de dicts con las mismas columnas).
+        `clave` es la columna, o tupla de columnas, que identifica cada
+        fila; el resto de columnas del dict son las que se actualizan.
+        Devuelve el número de filas modificadas.
+        """
+        filas = list(filas)
+        if not filas:
+            return 0
+
+        claves = (clave,) if isinstance(clave, str) else tuple(clave)
+        columnas = tuple(c for c in filas[0].keys() if c not in claves)
+
+        try:
+            valores = [
+                tuple(f[c] for c in columnas) + tuple(f[k] for k in claves)
+                for f in filas
+            ]
+
+            inicio = time.perf_counter()
+            with self.transaccion():
+                forma = tuple((k, IGUAL) for k in claves)
+                query = self._catalogo.actualizar(self.conexion, tabla, columnas, forma)
+                self.cursor.executemany(query, valores)
+                modificadas = self.cursor.rowcount
+
+            self._medir(query, inicio, modificadas)
+            marcar_cambio(self.db_path, tabla)
+            return modificadas
+
+        except KeyError as e:
+            raise DBActualizacionError(f"Error al actualizar lote en {tabla}: falta la columna {e}")
+
+        except (sqlite3.Error, ErrorBaseDatos) as e:
+            raise DBActualizacionError(f"Error al actualizar lote en {tabla}: {e}")
+
     # ---------------------------------------------------------
     #   CREACIÓN DE TABLAS
     # ---------------------------------------------------------
@@ -185,8 +522,134 @@ class GestorBD:
         for t in tablas:
             self.ejecutar_query(t)
 
+        self.aplicar_migraciones()
         self.insertar_usuario_por_defecto()
 
+    # ---------------------------------------------------------
+    #   MIGRACIONES
+    # ---------------------------------------------------------
+    def version_esquema(self):
+        """Devuelve la última migración aplicada (0 si ninguna)."""
+        return self.obtener_datos(
+            "SELECT COALESCE(MAX(version), 0) FROM schema_version"
+        )[0][0]
+
+    def aplicar_migraciones(self):
+        """
+        Aplica en orden las migraciones pendientes de data/migraciones.py.
+        Cada una va en su propia transacción (BEGIN IMMEDIATE, para que
+        dos equipos arrancando a la vez no la apliquen dos veces).
+        """
+        self.ejecutar_query(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                descripcion TEXT NOT NULL,
+                fecha_aplicacion TEXT NOT NULL
+            );
+            """
+        )
+
+        actual = self.version_esquema()
+
+        for version, descripcion, pasos in MIGRACIONES:
+            if version <= actual:
+                continue
+
+            with self.transaccion(inmediata=True):
+                # Otro equipo puede haberla aplicado mientras tanto
+                if version <= self.version_esquema():
+                    continue
+
+                for paso in pasos:
+                    if callable(paso):
+                        paso(self)
+                    else:
+                        self.ejecutar_query(paso)
+
+                self.ejecutar_query(
+                    """
+                    INSERT INTO schema_version (version, descripcion, fecha_aplicacion)
+                    VALUES (?, ?, datetime('now'))
+                    """,
+                    (version, descripcion)
+                )
+
+            print(f"[INFO] Migración {version} aplicada: {descripcion}")
+
+            # Puede haber tablas o columnas nuevas
+            self._catalogo.invalidar()
+
+    # ---------------------------------------------------------
+    #   UN SOLO RECIBO POR CLIENTE Y MES
+    # ---------------------------------------------------------
+    def crear_indice_pago_mes(self):
+        """
+        Crea el índice único (id_cliente, mes) en Pago.
+        Si la BD ya tiene recibos duplicados no se puede crear como
+        único: se crea normal y se avisa, para no perder datos.
+        """
+        try:
+            self.ejecutar_query(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_pago_cliente_mes ON Pago (id_cliente, mes)"
+            )
+        except DBConsultaError:
+            self.ejecutar_query(
+                "CREATE INDEX IF NOT EXISTS ix_pago_cliente_mes ON Pago (id_cliente, mes)"
+            )
+            print("[AVISO] Hay pagos duplicados por cliente y mes; el índice no es único")
+
+    def crear_indice_busqueda_clientes(self):
+        """
+        Crea cliente_fts, índice de texto completo (FTS5) sobre nombre,
+        apellidos y DNI de Cliente, sin distinguir mayúsculas ni tildes,
+        y los triggers que lo mantienen al día.
+        Devuelve False si este SQLite no trae FTS5 (se busca con LIKE).
+        """
+        try:
+            self.ejecutar_query(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS cliente_fts USING fts5(
+                    nombre, apellidos, dni,
+                    content='Cliente', content_rowid='id_cliente',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+                """
+            )
+        except DBConsultaError as e:
+            print(f"[AVISO] Búsqueda de clientes sin índice FTS5: {e}")
+            return False
+
+        for sentencia in (
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_cliente_fts_insert AFTER INSERT ON Cliente BEGIN
+                INSERT INTO cliente_fts (rowid, nombre, apellidos, dni)
+                VALUES (new.id_cliente, new.nombre, new.apellidos, new.dni);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_cliente_fts_delete AFTER DELETE ON Cliente BEGIN
+                INSERT INTO cliente_fts (cliente_fts, rowid, nombre, apellidos, dni)
+                VALUES ('delete', old.id_cliente, old.nombre, old.apellidos, old.dni);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_cliente_fts_update
+            AFTER UPDATE OF nombre, apellidos, dni ON Cliente BEGIN
+                INSERT INTO cliente_fts (cliente_fts, rowid, nombre, apellidos, dni)
+                VALUES ('delete', old.id_cliente, old.nombre, old.apellidos, old.dni);
+                INSERT INTO cliente_fts (rowid, nombre, apellidos, dni)
+                VALUES (new.id_cliente, new.nombre, new.apellidos, new.dni);
+            END
+            """,
+            # Indexa los clientes que ya existían
+            "INSERT INTO cliente_fts (cliente_fts) VALUES ('rebuild')",
+        ):
+            self.ejecutar_query(sentencia)
+
+        return True
+
     # ---------------------------------------------------------
     #   USUARIO POR DEFECTO
     # ---------------------------------------------------------
@@ -0,0 +1,154 @@
+# ---------------------------------------------------------
+#   INSTRUMENTACIÓN DE CONSULTAS
+#   Tiempo y filas de cada sentencia, agrupadas por su
+#   "huella" (la consulta sin valores concretos), y registro
+#   de las consultas lentas en un fichero que rota solo.
+# ---------------------------------------------------------
+
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+# Las sentencias que tarden más (ms) van al registro de consultas lentas.
+# Se puede cambiar sin tocar código con GFTM_CONSULTA_LENTA_MS (0 = todas)
+UMBRAL_LENTA_MS = float(os.environ.get("GFTM_CONSULTA_LENTA_MS", 200))
+
+RUTA_LOG = os.environ.get(
+    "GFTM_LOG_CONSULTAS",
+    os.path.join(os.path.dirname(__file__), "consultas_lentas.log")
+)
+LOG_TAMANO_MAXIMO = 1024 * 1024   # bytes por fichero
+LOG_COPIAS = 3                    # consultas_lentas.log.1 ... .3
+
+# Consultas distintas que se guardan en la tabla de estadísticas
+MAX_HUELLAS = 500
+
+# huella → [llamadas, total_ms, max_ms, filas]
+_estadisticas = {}
+_lock_estadisticas = threading.Lock()
+
+_log = logging.getLogger("gftm.consultas_lentas")
+_log.propagate = False
+_lock_log = threading.Lock()
+
+
+def configurar_instrumentacion(umbral_ms=None, ruta_log=None):
+    """Cambia el umbral de consulta lenta y/o el fichero de registro."""
+    global UMBRAL_LENTA_MS, RUTA_LOG
+
+    if umbral_ms is not None:
+        UMBRAL_LENTA_MS = umbral_ms
+
+    if ruta_log is not None and ruta_log != RUTA_LOG:
+        RUTA_LOG = ruta_log
+        with _lock_log:
+            for manejador in list(_log.handlers):
+                _log.removeHandler(manejador)
+                manejador.close()
+
+
+# ---------------------------------------------------------
+#   HUELLA DE UNA CONSULTA
+# ---------------------------------------------------------
+_COMENTARIOS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def huella(query):
+    """
+    Normaliza la consulta para agrupar las que sólo cambian en los
+    valores: literales y números pasan a ?, las listas IN (?, ?, ...)
+    a (?...) y los espacios se compactan.
+
+        huella("SELECT * FROM Pago WHERE id_pago = 7")
+        → "SELECT * FROM Pago WHERE id_pago = ?"
+    """
+    texto = _COMENTARIOS.sub(" ", query)
+    texto = _CADENAS.sub("?", texto)
+    texto = _NUMEROS.sub("?", texto)
+    texto = _LISTAS.sub("(?...)", texto)
+    return _ESPACIOS.sub(" ", texto).strip()
+
+
+# ---------------------------------------------------------
+#   REGISTRO DE CADA EJECUCIÓN
+# ---------------------------------------------------------
+def registrar(query, ms, filas):
+    """Suma una ejecución a las estadísticas y la anota si ha sido lenta."""
+    clave = huella(query)
+    filas = max(filas, 0)   # rowcount es -1 en sentencias que no son DML
+
+    with _lock_estadisticas:
+        datos = _estadisticas.get(clave)
+        if datos is None:
+            if len(_estadisticas) >= MAX_HUELLAS:
+                # Se olvida la consulta que menos tiempo ha sumado
+                menor = min(_estadisticas, key=lambda h: _estadisticas[h][1])
+                del _estadisticas[menor]
+            datos = _estadisticas[clave] = [0, 0.0, 0.0, 0]
+
+        datos[0] += 1
+        datos[1] += ms
+        datos[2] = max(datos[2], ms)
+        datos[3] += filas
+
+    if ms >= UMBRAL_LENTA_MS:
+        _anotar_lenta(clave, ms, filas)
+
+
+def _anotar_lenta(clave, ms, filas):
+    with _lock_log:
+        if not _log.handlers:
+            try:
+                manejador = RotatingFileHandler(
+                    RUTA_LOG, maxBytes=LOG_TAMANO_MAXIMO,
+                    backupCount=LOG_COPIAS, encoding="utf-8"
+                )
+            except OSError as e:
+                print(f"[AVISO] No se puede escribir el registro de consultas lentas: {e}")
+                _log.addHandler(logging.NullHandler())
+                return
+
+            manejador.setFormatter(logging.Formatter("%(asctime)s  %(message)s"))
+            _log.addHandler(manejador)
+            _log.setLevel(logging.INFO)
+
+    _log.info("%8.1f ms  %6d filas  %s", ms, filas, clave)
+
+
+# ---------------------------------------------------------
+#   CONSULTA DE LAS ESTADÍSTICAS
+# ---------------------------------------------------------
+def estadisticas():
+    """
+    Lista de dicts (huella, llamadas, total_ms, media_ms, max_ms, filas),
+    de la consulta que más tiempo ha sumado a la que menos.
+    """
+    with _lock_estadisticas:
+        copia = [(h, list(d)) for h, d in _estadisticas.items()]
+
+    filas = [
+        {
+            "huella": h,
+            "llamadas": llamadas,
+            "total_ms": round(total, 2),
+            "media_ms": round(total / llamadas, 2),
+            "max_ms": round(maximo, 2),
+            "filas": n_filas,
+        }
+        for h, (llamadas, total, maximo, n_filas) in copia
+    ]
+    filas.sort(key=lambda f: f["total_ms"], reverse=True)
+    return filas
+
+
+def reiniciar_estadisticas():
+    with _lock_estadisticas:
+        _estadisticas.clear()
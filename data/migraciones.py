@@ -0,0 +1,61 @@
+# ---------------------------------------------------------
+#   MIGRACIONES DEL ESQUEMA
+#   Cambios ordenados sobre las tablas base. Cada migración
+#   se aplica una sola vez y queda anotada en schema_version.
+#
+#   Un paso puede ser una sentencia SQL o una función que
+#   recibe el GestorBD. Los pasos deben ser idempotentes
+#   (IF NOT EXISTS) por si la BD ya tenía el cambio hecho.
+# ---------------------------------------------------------
+
+
+def _indice_pago_cliente_mes(gestor):
+    gestor.crear_indice_pago_mes()
+
+
+def _indice_busqueda_clientes(gestor):
+    gestor.crear_indice_busqueda_clientes()
+
+
+MIGRACIONES = [
+    (
+        1,
+        "Índice único de pagos por cliente y mes",
+        [
+            _indice_pago_cliente_mes,
+        ]
+    ),
+    (
+        2,
+        "Índices para disponibilidad, pagos y clientes",
+        [
+            # verificar_disponibilidad / informe de disponibilidad
+            """
+            CREATE INDEX IF NOT EXISTS ix_reserva_aparato_fecha_hora
+            ON Reserva (id_aparato, fecha_reserva, hora_inicio)
+            """,
+            # obtener_reservas_por_fecha / por_cliente
+            "CREATE INDEX IF NOT EXISTS ix_reserva_fecha ON Reserva (fecha_reserva)",
+            "CREATE INDEX IF NOT EXISTS ix_reserva_cliente ON Reserva (id_cliente)",
+            # obtener_pagos_por_fecha (por cliente ya usa ux_pago_cliente_mes)
+            "CREATE INDEX IF NOT EXISTS ix_pago_fecha_pago ON Pago (fecha_pago)",
+            # generación de pagos de clientes activos
+            "CREATE INDEX IF NOT EXISTS ix_cliente_estado ON Cliente (estado)",
+        ]
+    ),
+    (
+        3,
+        "Índice de texto completo (FTS5) para buscar clientes",
+        [
+            _indice_busqueda_clientes,
+        ]
+    ),
+    (
+        4,
+        "Índice de pagos por estado (pendientes)",
+        [
+            # filtrar_pagos(pagado=...): sigue el orden por id_pago de la paginación
+            "CREATE INDEX IF NOT EXISTS ix_pago_pagado ON Pago (pagado, id_pago)",
+        ]
+    ),
+]
@@ -0,0 +1,243 @@
+# ---------------------------------------------------------
+#   POOL DE CONEXIONES (SQLite)
+#   Reutiliza conexiones abiertas entre controladores para
+#   no abrir y cerrar el fichero en cada consulta.
+# ---------------------------------------------------------
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+from excepciones import ErrorBaseDatos, DBConexionError
+
+
+# Valores por defecto para los pools que se creen a partir de ahora.
+# No hay límite de conexiones prestadas a la vez: cada hilo (y cada
+# GestorBD dentro del hilo) tiene la suya mientras la usa. Esto sólo
+# limita cuántas libres se guardan abiertas para reutilizarlas.
+POOL_MAX_INACTIVAS = 5       # conexiones libres que se conservan abiertas
+POOL_TIEMPO_INACTIVO = 300   # segundos sin uso antes de cerrar una libre
+
+# Sentencias ya compiladas que guarda cada conexión (cached_statements de
+# sqlite3; por defecto 128). Repetir una consulta de la caché no la vuelve
+# a analizar. Se puede cambiar con la variable de entorno GFTM_SENTENCIAS_CACHE
+SENTENCIAS_EN_CACHE = int(os.environ.get("GFTM_SENTENCIAS_CACHE", 256))
+
+# ---------------------------------------------------------
+#   PERFILES DE RENDIMIENTO (PRAGMAs al abrir cada conexión)
+# ---------------------------------------------------------
+PERFILES = {
+    # Diario clásico y fsync completo en cada COMMIT.
+    # Es el único seguro si gym.db está en una carpeta compartida
+    # por red entre varios equipos.
+    "seguro": {
+        "busy_timeout": 5000,
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -8000,          # ~8 MB
+        "temp_store": "MEMORY",
+    },
+
+    # WAL: las lecturas no esperan a las escrituras y los COMMIT
+    # no hacen fsync completo. Requiere que gym.db esté en un disco
+    # local (WAL no funciona sobre carpetas de red).
+    "rapido": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,         # ~64 MB
+        "mmap_size": 268435456,       # 256 MB
+        "temp_store": "MEMORY",
+    },
+}
+
+# Se puede elegir sin tocar código con la variable de entorno GFTM_PERFIL_BD
+PERFIL_BD = os.environ.get("GFTM_PERFIL_BD", "seguro")
+
+_pools = {}
+_lock_pools = threading.Lock()
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones SQLite para un fichero concreto.
+
+    - Cada conexión se presta a un único hilo cada vez
+      (por eso se abre con check_same_thread=False).
+    - No limita las conexiones en uso: si no hay una libre se abre otra.
+    - Se guardan como máximo `max_inactivas` conexiones libres; las que
+      sobran se cierran al devolverlas.
+    - Las libres que superan `tiempo_inactivo` se cierran la próxima vez
+      que se presta o devuelve una (no hay un hilo que las vigile).
+    """
+
+    def __init__(self, db_path, max_inactivas=POOL_MAX_INACTIVAS,
+                 tiempo_inactivo=POOL_TIEMPO_INACTIVO):
+        self.db_path = db_path
+        self.max_inactivas = max_inactivas
+        self.tiempo_inactivo = tiempo_inactivo
+
+        # Lista de (conexion, instante en que se devolvió)
+        self._libres = []
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    #   PRÉSTAMO / DEVOLUCIÓN
+    # ---------------------------------------------------------
+    def obtener(self):
+        """Devuelve una conexión libre o abre una nueva si no hay."""
+        with self._lock:
+            self._cerrar_inactivas()
+            if self._libres:
+                conexion, _ = self._libres.pop()
+                return conexion
+
+        return self._abrir()
+
+    def devolver(self, conexion):
+        """Devuelve la conexión al pool (deshaciendo lo no confirmado)."""
+        try:
+            if conexion.in_transaction:
+                conexion.rollback()
+        except sqlite3.Error:
+            self._cerrar(conexion)
+            return
+
+        with self._lock:
+            self._cerrar_inactivas()
+            if len(self._libres) < self.max_inactivas:
+                self._libres.append((conexion, time.monotonic()))
+                return
+
+        self._cerrar(conexion)
+
+    def cerrar_todas(self):
+        """Cierra todas las conexiones libres del pool."""
+        with self._lock:
+            libres, self._libres = self._libres, []
+
+        for conexion, _ in libres:
+            self._cerrar(conexion)
+
+    # ---------------------------------------------------------
+    #   AUXILIARES
+    # ---------------------------------------------------------
+    def _abrir(self):
+        try:
+            conexion = sqlite3.connect(
+                self.db_path, check_same_thread=False,
+                cached_statements=SENTENCIAS_EN_CACHE
+            )
+            conexion.execute("PRAGMA foreign_keys = ON")
+
+        except sqlite3.Error as e:
+            raise DBConexionError(f"No se pudo conectar a la base de datos: {e}")
+
+        try:
+            aplicar_perfil(conexion, PERFIL_BD)
+        except ErrorBaseDatos:
+            self._cerrar(conexion)
+            raise
+
+        return conexion
+
+    def _cerrar_inactivas(self):
+        # Se llama con el lock tomado
+        ahora = time.monotonic()
+        vigentes = []
+
+        for conexion, instante in self._libres:
+            if ahora - instante > self.tiempo_inactivo:
+                self._cerrar(conexion)
+            else:
+                vigentes.append((conexion, instante))
+
+        self._libres = vigentes
+
+    @staticmethod
+    def _cerrar(conexion):
+        try:
+            conexion.close()
+        except sqlite3.Error:
+            pass
+
+
+# ---------------------------------------------------------
+#   REGISTRO DE POOLS (uno por fichero de base de datos)
+# ---------------------------------------------------------
+def obtener_pool(db_path):
+    """Devuelve el pool asociado a `db_path`, creándolo si no existe."""
+    with _lock_pools:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = PoolConexiones(db_path, POOL_MAX_INACTIVAS, POOL_TIEMPO_INACTIVO)
+            _pools[db_path] = pool
+        return pool
+
+
+def configurar_pool(max_inactivas=None, tiempo_inactivo=None, sentencias_en_cache=None):
+    """
+    Cambia cuántas conexiones libres se guardan y su tiempo de inactividad.
+    Afecta a los pools ya creados y a los que se creen después.
+
+    sentencias_en_cache sólo se aplica al abrir una conexión, así que
+    se cierran las libres para que las nuevas lo usen.
+    """
+    global POOL_MAX_INACTIVAS, POOL_TIEMPO_INACTIVO, SENTENCIAS_EN_CACHE
+
+    with _lock_pools:
+        if max_inactivas is not None:
+            POOL_MAX_INACTIVAS = max_inactivas
+        if tiempo_inactivo is not None:
+            POOL_TIEMPO_INACTIVO = tiempo_inactivo
+
+        for pool in _pools.values():
+            pool.max_inactivas = POOL_MAX_INACTIVAS
+            pool.tiempo_inactivo = POOL_TIEMPO_INACTIVO
+
+    if sentencias_en_cache is not None and sentencias_en_cache != SENTENCIAS_EN_CACHE:
+        SENTENCIAS_EN_CACHE = sentencias_en_cache
+        cerrar_pools()
+
+
+def aplicar_perfil(conexion, nombre):
+    """Ejecuta sobre la conexión los PRAGMAs del perfil indicado."""
+    perfil = PERFILES.get(nombre)
+    if perfil is None:
+        raise ErrorBaseDatos(f"Perfil de base de datos desconocido: {nombre}")
+
+    for pragma, valor in perfil.items():
+        try:
+            conexion.execute(f"PRAGMA {pragma} = {valor}")
+        except sqlite3.Error as e:
+            # Cambiar journal_mode falla si otro equipo tiene la BD abierta;
+            # en ese caso se sigue con el modo que ya tenga el fichero.
+            print(f"[AVISO] No se pudo aplicar PRAGMA {pragma}: {e}")
+
+
+def configurar_perfil(nombre):
+    """
+    Elige el perfil de rendimiento ("seguro" o "rapido").
+    Se cierran las conexiones libres para que las nuevas lo apliquen.
+    """
+    global PERFIL_BD
+
+    if nombre not in PERFILES:
+        raise ErrorBaseDatos(f"Perfil de base de datos desconocido: {nombre}")
+
+    PERFIL_BD = nombre
+    cerrar_pools()
+
+
+def cerrar_pools():
+    """Cierra todas las conexiones libres de todos los pools."""
+    with _lock_pools:
+        pools = list(_pools.values())
+
+    for pool in pools:
+        pool.cerrar_todas()
+
+
+atexit.register(cerrar_pools)
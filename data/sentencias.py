@@ -0,0 +1,164 @@
+# ---------------------------------------------------------
+#   CATÁLOGO DE SENTENCIAS
+#   Tablas y columnas permitidas (leídas del propio esquema)
+#   y el texto SQL de los CRUD auxiliares ya construido,
+#   por (tabla, columnas), para no rehacerlo en cada llamada.
+# ---------------------------------------------------------
+
+import threading
+
+from excepciones import ErrorBaseDatos
+
+_catalogos = {}
+_lock_catalogos = threading.Lock()
+
+
+def obtener_catalogo(db_path):
+    """Devuelve el catálogo compartido del fichero (lo crea si no existe)."""
+    with _lock_catalogos:
+        catalogo = _catalogos.get(db_path)
+        if catalogo is None:
+            catalogo = _catalogos[db_path] = CatalogoSentencias()
+        return catalogo
+
+
+class CatalogoSentencias:
+    """
+    Sólo se construye SQL para tablas y columnas que existen en el
+    esquema; así ningún nombre que venga de fuera acaba pegado en
+    la sentencia. Cada texto se valida y se construye una vez y
+    luego sale de un diccionario.
+    """
+
+    def __init__(self):
+        self._esquema = None        # {tabla: frozenset(columnas)}
+        self._sentencias = {}       # (operación, tabla, columnas, forma) → SQL
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    #   ESQUEMA
+    # ---------------------------------------------------------
+    def _cargar_esquema(self, conexion):
+        tablas = [
+            fila[0] for fila in conexion.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        self._esquema = {
+            tabla: frozenset(col[1] for col in conexion.execute(f'PRAGMA table_info("{tabla}")'))
+            for tabla in tablas
+        }
+
+    def invalidar(self):
+        """Vuelve a leer el esquema la próxima vez (tras crear o migrar tablas)."""
+        with self._lock:
+            self._esquema = None
+            self._sentencias.clear()
+
+    def columnas(self, conexion, tabla):
+        """Columnas de la tabla, o ErrorBaseDatos si no existe."""
+        with self._lock:
+            if self._esquema is None or tabla not in self._esquema:
+                # Puede ser una tabla creada después de la última lectura
+                self._cargar_esquema(conexion)
+
+            if tabla not in self._esquema:
+                raise ErrorBaseDatos(f"Tabla desconocida: {tabla}")
+            return self._esquema[tabla]
+
+    def _validar(self, conexion, tabla, columnas):
+        existentes = self.columnas(conexion, tabla)
+        desconocidas = [c for c in columnas if c not in existentes]
+        if desconocidas:
+            raise ErrorBaseDatos(f"Columnas desconocidas en {tabla}: {', '.join(desconocidas)}")
+
+    # ---------------------------------------------------------
+    #   SENTENCIAS
+    #   `columnas` es una tupla y `forma` la forma del WHERE que
+    #   devuelve desglosar_condicion (ambas forman parte de la clave).
+    # ---------------------------------------------------------
+    def _sentencia(self, conexion, operacion, tabla, columnas, forma, construir):
+        clave = (operacion, tabla, columnas, forma)
+        sql = self._sentencias.get(clave)
+        if sql is None:
+            self._validar(conexion, tabla, columnas + tuple(c for c, _ in forma))
+            sql = self._sentencias[clave] = construir()
+        return sql
+
+    def insertar(self, conexion, tabla, columnas):
+        """INSERT INTO tabla (c1, c2) VALUES (?, ?)"""
+        return self._sentencia(
+            conexion, "insertar", tabla, columnas, (),
+            lambda: f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+                    f"VALUES ({', '.join('?' * len(columnas))})"
+        )
+
+    def actualizar(self, conexion, tabla, columnas, forma=()):
+        """
+        UPDATE tabla SET c1 = ?, c2 = ? WHERE ...
+        Sin forma la sentencia acaba en "WHERE " y se le añade la condición.
+        """
+        return self._sentencia(
+            conexion, "actualizar", tabla, columnas, forma,
+            lambda: f"UPDATE {tabla} SET {', '.join(f'{c} = ?' for c in columnas)} "
+                    f"WHERE {_where(forma)}"
+        )
+
+    def eliminar(self, conexion, tabla, forma=()):
+        """DELETE FROM tabla WHERE ... (sin forma se le añade la condición)"""
+        return self._sentencia(
+            conexion, "eliminar", tabla, (), forma,
+            lambda: f"DELETE FROM {tabla} WHERE {_where(forma)}"
+        )
+
+
+# ---------------------------------------------------------
+#   CONDICIONES ESTRUCTURADAS
+#   {"id_pago": 7}            → id_pago = ?
+#   {"estado": ["a", "b"]}    → estado IN (?, ?)
+#   {"fecha_pago": None}      → fecha_pago IS NULL
+#   Varias columnas se unen con AND. También vale una tupla
+#   de pares (("id_pago", 7), ...).
+# ---------------------------------------------------------
+IGUAL = "="
+NULO = "nulo"
+
+
+def desglosar_condicion(condicion):
+    """
+    Separa la condición en su forma (columnas y operador, lo que
+    decide el texto SQL) y sus valores, que van como parámetros.
+    Devuelve (forma, valores).
+    """
+    pares = condicion.items() if isinstance(condicion, dict) else condicion
+    forma = []
+    valores = []
+
+    for columna, valor in pares:
+        if valor is None:
+            forma.append((columna, NULO))
+        elif isinstance(valor, (list, tuple, set, frozenset)):
+            valor = tuple(valor)
+            forma.append((columna, len(valor)))
+            valores.extend(valor)
+        else:
+            forma.append((columna, IGUAL))
+            valores.append(valor)
+
+    if not forma:
+        # Sin condición se tocarían todas las filas
+        raise ErrorBaseDatos("La condición está vacía")
+
+    return tuple(forma), tuple(valores)
+
+
+def _where(forma):
+    partes = []
+    for columna, operador in forma:
+        if operador == IGUAL:
+            partes.append(f"{columna} = ?")
+        elif operador == NULO:
+            partes.append(f"{columna} IS NULL")
+        else:
+            partes.append(f"{columna} IN ({', '.join('?' * operador)})")
+    return " AND ".join(partes)
@@ -0,0 +1,41 @@
+# ---------------------------------------------------------
+#   VERSIONES DE TABLAS
+#   Contador por tabla que sube cada vez que este proceso
+#   escribe en ella. Sirve para saber si lo que muestra una
+#   pantalla se ha quedado viejo sin tener que consultar la BD.
+# ---------------------------------------------------------
+
+import re
+import threading
+
+# (db_path, tabla) → número de escrituras
+_versiones = {}
+_lock_versiones = threading.Lock()
+
+# Tabla afectada por un INSERT / UPDATE / DELETE escrito a mano,
+# también si va detrás de un WITH ... AS (...) (p. ej. generar pagos)
+_TABLA_ESCRITA = re.compile(
+    r"^\s*(?:WITH\b.*?\)\s*)?"
+    r"(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(\w+)",
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def marcar_cambio(db_path, tabla):
+    """Anota que la tabla ha cambiado."""
+    with _lock_versiones:
+        clave = (db_path, tabla)
+        _versiones[clave] = _versiones.get(clave, 0) + 1
+
+
+def marcar_cambio_query(db_path, query):
+    """Anota el cambio si la sentencia escribe en una tabla."""
+    encontrada = _TABLA_ESCRITA.match(query)
+    if encontrada:
+        marcar_cambio(db_path, encontrada.group(1))
+
+
+def versiones(db_path, tablas):
+    """{tabla: versión} de las tablas indicadas (0 si nunca se ha escrito)."""
+    with _lock_versiones:
+        return {t: _versiones.get((db_path, t), 0) for t in tablas}
@@ -26,6 +26,11 @@ class ErrorLogin(Exception):
     pass
 
 
+class ErrorConflictoReserva(ErrorValidacion):
+    """El aparato ya está reservado (total o parcialmente) en ese horario."""
+    pass
+
+
 # ---------------------------------------------------------
 # Excepciones específicas de la base de datos
 # ---------------------------------------------------------
@@ -3,9 +3,11 @@ GymForTheMoment - Sistema de Gestión de Gimnasio
 Punto de entrada principal de la aplicación
 """
 
+import os
 import tkinter as tk
 from view.login_view import LoginView
 from data.gestor_bd import GestorBD
+from controller.metricas import iniciar_exportacion
 
 
 def main():
@@ -19,6 +21,11 @@ def main():
     gestor.crear_tablas()
     gestor.desconectar()
 
+    # Con GFTM_METRICAS=ruta (.json o texto de Prometheus) se vuelcan
+    # las métricas de los controladores cada minuto y al salir
+    if os.environ.get("GFTM_METRICAS"):
+        iniciar_exportacion(os.environ["GFTM_METRICAS"])
+
     # ---------------------------------------------------------
     #   INICIAR INTERFAZ
     # ---------------------------------------------------------
@@ -0,0 +1,21 @@
+# ---------------------------------------------------------
+#   FIXTURES COMUNES
+# ---------------------------------------------------------
+
+import pytest
+
+from data.gestor_bd import GestorBD
+
+
+@pytest.fixture
+def gestor(tmp_path, monkeypatch):
+    """GestorBD sobre una BD vacía recién creada (también la usan los controladores)."""
+    monkeypatch.setenv("GFTM_BD", str(tmp_path / "gym.db"))
+
+    gestor = GestorBD()
+    gestor.conectar()
+    try:
+        gestor.crear_tablas()
+    finally:
+        gestor.desconectar()
+    return gestor
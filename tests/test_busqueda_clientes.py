@@ -0,0 +1,54 @@
+# ---------------------------------------------------------
+#   BÚSQUEDA DE CLIENTES (FTS5 y LIKE)
+# ---------------------------------------------------------
+
+import pytest
+
+from controller import cliente_controller
+from controller.cliente_controller import ClienteController
+
+
+@pytest.fixture
+def clientes(gestor):
+    controlador = ClienteController()
+    controlador.crear_cliente("Martín", "García López", "00000001R", fecha_alta="2024-01-01")
+    controlador.crear_cliente("Marta", "Ruiz", "00000002W", fecha_alta="2024-01-01")
+    controlador.crear_cliente("Pedro", "Martínez", "00000003A", fecha_alta="2024-01-01")
+    return controlador
+
+
+def _nombres(resultado):
+    return sorted(f"{c.nombre} {c.apellidos}" for c in resultado)
+
+
+def test_fts_busca_por_prefijo_sin_tildes(clientes):
+    assert _nombres(clientes.buscar_clientes("mart gar")) == ["Martín García López"]
+    assert _nombres(clientes.buscar_clientes("MARTIN")) == ["Martín García López", "Pedro Martínez"]
+    assert _nombres(clientes.buscar_clientes("00000002")) == ["Marta Ruiz"]
+    assert len(clientes.buscar_clientes("mar", limite=2)) == 2
+    assert clientes.buscar_clientes("  ") == []
+
+
+def test_fts_sigue_los_cambios_de_cliente(clientes):
+    (marta,) = clientes.buscar_clientes("marta")
+    clientes.actualizar_cliente(marta.id_cliente, apellidos="Sanz")
+
+    assert _nombres(clientes.buscar_clientes("sanz")) == ["Marta Sanz"]
+    assert clientes.buscar_clientes("ruiz") == []
+
+
+def test_sin_indice_fts_busca_con_like(gestor, clientes, monkeypatch):
+    gestor.conectar()
+    try:
+        gestor.ejecutar_query("DROP TABLE cliente_fts")
+        for trigger in ("insert", "delete", "update"):
+            gestor.ejecutar_query(f"DROP TRIGGER tr_cliente_fts_{trigger}")
+    finally:
+        gestor.desconectar()
+
+    # El controlador recuerda si la BD tenía el índice: se olvida
+    monkeypatch.setitem(cliente_controller._fts_disponible, gestor.db_path, None)
+
+    assert _nombres(clientes.buscar_clientes("Mart")) == ["Marta Ruiz", "Martín García López", "Pedro Martínez"]
+    assert _nombres(clientes.buscar_clientes("0003A")) == ["Pedro Martínez"]
+    assert len(clientes.buscar_clientes("Mart", limite=1)) == 1
@@ -0,0 +1,49 @@
+# ---------------------------------------------------------
+#   MÉTRICAS DE LOS CONTROLADORES
+# ---------------------------------------------------------
+
+from controller.metricas import medir_controlador, registro
+
+
+@medir_controlador
+class ControladorPrueba:
+    FACTOR = 3
+
+    def __init__(self):
+        self.base = 10
+
+    def normal(self, x):
+        return self.base + x
+
+    @staticmethod
+    def estatico(x):
+        return x * 2
+
+    @classmethod
+    def de_clase(cls, x):
+        return cls.FACTOR * x
+
+
+def _llamadas(metodo):
+    etiquetas = {"metodo": f"ControladorPrueba.{metodo}"}
+    return next(
+        (c["valor"] for c in registro.a_dict()["contadores"]
+         if c["nombre"] == "gftm_controlador_llamadas_total" and c["etiquetas"] == etiquetas),
+        0
+    )
+
+
+def test_mide_metodos_estaticos_y_de_clase_sin_romperlos():
+    antes = {m: _llamadas(m) for m in ("normal", "estatico", "de_clase")}
+    controlador = ControladorPrueba()
+
+    assert controlador.normal(1) == 11
+    assert controlador.estatico(4) == 8
+    assert ControladorPrueba.estatico(4) == 8
+    assert controlador.de_clase(2) == 6
+    assert ControladorPrueba.de_clase(2) == 6
+
+    assert _llamadas("normal") == antes["normal"] + 1
+    assert _llamadas("estatico") == antes["estatico"] + 2
+    assert _llamadas("de_clase") == antes["de_clase"] + 2
+    assert ControladorPrueba.FACTOR == 3
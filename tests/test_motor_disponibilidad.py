@@ -0,0 +1,52 @@
+# ---------------------------------------------------------
+#   MOTOR DE DISPONIBILIDAD
+# ---------------------------------------------------------
+
+from controller.motor_disponibilidad import MotorDisponibilidad, mascara_intervalo
+
+FECHA = "2024-03-04"
+
+
+class GestorLento:
+    """Devuelve `filas` y, a mitad de la lectura, ejecuta `durante()`."""
+
+    def __init__(self, filas):
+        self.filas = filas
+        self.durante = None
+
+    def conectar(self):
+        pass
+
+    def desconectar(self):
+        pass
+
+    def obtener_datos(self, query, parametros=None):
+        if self.durante:
+            durante, self.durante = self.durante, None
+            durante()
+        return list(self.filas)
+
+
+def test_reserva_durante_la_lectura_no_se_pierde():
+    gestor = GestorLento([(FECHA, 1, "09:00", "10:00")])
+    motor = MotorDisponibilidad(gestor)
+    gestor.durante = lambda: motor.reservar(1, FECHA, "11:00", "11:30")
+
+    motor.cargar_rango(FECHA, FECHA)
+
+    assert not motor.esta_libre(1, FECHA, "11:00", "11:30")
+    assert motor.ocupacion(1, FECHA) == (
+        mascara_intervalo("09:00", "10:00") | mascara_intervalo("11:00", "11:30")
+    )
+
+
+def test_invalidacion_durante_la_lectura_obliga_a_releer():
+    gestor = GestorLento([(FECHA, 1, "09:00", "10:00")])
+    motor = MotorDisponibilidad(gestor)
+    gestor.durante = lambda: motor.invalidar(FECHA)
+
+    motor.cargar_rango(FECHA, FECHA)
+
+    # La lectura anterior no se guardó: la siguiente consulta va a la BD
+    gestor.filas = []
+    assert motor.esta_libre(1, FECHA, "09:00", "10:00")
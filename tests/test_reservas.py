@@ -0,0 +1,68 @@
+# ---------------------------------------------------------
+#   RESERVAS: CONFLICTOS AL CREAR
+# ---------------------------------------------------------
+
+import pytest
+
+from controller.aparato_controller import AparatoController
+from controller.cliente_controller import ClienteController
+from controller.reserva_controller import ReservaController
+from excepciones import ErrorConflictoReserva
+
+FECHA = "2024-03-04"
+
+
+@pytest.fixture
+def reservas(gestor):
+    cliente = ClienteController().crear_cliente("Ana", "López", "00000001R", fecha_alta="2024-01-01")
+    aparato = AparatoController().crear_aparato("Cinta 1", "cardio")
+    return ReservaController(), cliente.id_cliente, aparato.id_aparato
+
+
+def _total_reservas(gestor):
+    gestor.conectar()
+    try:
+        return gestor.obtener_datos("SELECT COUNT(*) FROM Reserva")[0][0]
+    finally:
+        gestor.desconectar()
+
+
+def test_solape_lanza_error_conflicto_y_no_inserta(gestor, reservas):
+    controlador, id_cliente, id_aparato = reservas
+    controlador.crear_reserva(id_cliente, id_aparato, FECHA, "09:00", "10:00")
+
+    with pytest.raises(ErrorConflictoReserva, match="09:00 a 10:00"):
+        controlador.crear_reserva(id_cliente, id_aparato, FECHA, "09:30", "10:30")
+
+    assert _total_reservas(gestor) == 1
+
+
+def test_tramo_contiguo_y_reservas_canceladas_no_chocan(gestor, reservas):
+    controlador, id_cliente, id_aparato = reservas
+    controlador.crear_reserva(id_cliente, id_aparato, FECHA, "09:00", "10:00", estado="cancelada")
+    controlador.crear_reserva(id_cliente, id_aparato, FECHA, "09:00", "10:00")
+    controlador.crear_reserva(id_cliente, id_aparato, FECHA, "10:00", "10:30")
+
+    assert _total_reservas(gestor) == 3
+
+
+def test_conflicto_con_reserva_de_otro_equipo_invalida_el_motor(gestor, reservas):
+    controlador, id_cliente, id_aparato = reservas
+
+    # El motor carga el día libre...
+    assert controlador.verificar_disponibilidad(id_aparato, FECHA, "11:00", "11:30")
+
+    # ...y otro puesto reserva ese tramo sin que el motor se entere
+    gestor.conectar()
+    try:
+        gestor.insertar("Reserva", {
+            "id_cliente": id_cliente, "id_aparato": id_aparato, "fecha_reserva": FECHA,
+            "hora_inicio": "11:00", "hora_fin": "11:30", "estado": "pendiente"
+        })
+    finally:
+        gestor.desconectar()
+
+    with pytest.raises(ErrorConflictoReserva):
+        controlador.crear_reserva(id_cliente, id_aparato, FECHA, "11:00", "11:30")
+
+    assert not controlador.verificar_disponibilidad(id_aparato, FECHA, "11:00", "11:30")
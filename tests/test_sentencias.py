@@ -0,0 +1,116 @@
+# ---------------------------------------------------------
+#   CATÁLOGO DE SENTENCIAS Y CONDICIONES ESTRUCTURADAS
+# ---------------------------------------------------------
+
+import pytest
+
+from data.sentencias import desglosar_condicion, IGUAL, NULO
+from excepciones import (
+    ErrorBaseDatos,
+    DBInsercionError,
+    DBActualizacionError,
+    DBEliminacionError,
+)
+
+
+def _crear_pagos(gestor):
+    """Tres pagos del mismo cliente; sólo el tercero está cobrado."""
+    gestor.conectar()
+    try:
+        id_cliente = gestor.insertar("Cliente", {
+            "nombre": "Ana", "apellidos": "López", "dni": "00000001R",
+            "fecha_alta": "2024-01-01", "estado": "activo"
+        })
+        ids = [
+            gestor.insertar("Pago", {
+                "id_cliente": id_cliente, "mes": mes, "fecha_generacion": f"{mes}-01",
+                "cuota": 30, "concepto": ""
+            })
+            for mes in ("2024-01", "2024-02", "2024-03")
+        ]
+        gestor.actualizar("Pago", {"pagado": 1, "fecha_pago": "2024-03-05"}, {"id_pago": ids[2]})
+        return ids
+    finally:
+        gestor.desconectar()
+
+
+def _pagos(gestor):
+    gestor.conectar()
+    try:
+        return gestor.obtener_datos("SELECT id_pago, concepto FROM Pago ORDER BY id_pago")
+    finally:
+        gestor.desconectar()
+
+
+# ---------------------------------------------------------
+#   NOMBRES NO PERMITIDOS
+# ---------------------------------------------------------
+@pytest.mark.parametrize("operacion, error", [
+    (lambda g: g.insertar("Pago", {"mes": "2024-01", "cuota; DROP TABLE Pago": 1}), DBInsercionError),
+    (lambda g: g.actualizar("Pago", {"no_existe": 1}, {"id_pago": 1}), DBActualizacionError),
+    (lambda g: g.actualizar("Pago", {"concepto": "x"}, {"no_existe": 1}), DBActualizacionError),
+    (lambda g: g.eliminar("Pago", {"id_pago = 1 OR 1": 1}), DBEliminacionError),
+    (lambda g: g.insertar("NoExiste", {"mes": "2024-01"}), DBInsercionError),
+])
+def test_rechaza_tablas_y_columnas_desconocidas(gestor, operacion, error):
+    _crear_pagos(gestor)
+
+    gestor.conectar()
+    try:
+        with pytest.raises(error, match="desconocida"):
+            operacion(gestor)
+    finally:
+        gestor.desconectar()
+
+    assert len(_pagos(gestor)) == 3
+
+
+def test_condicion_vacia_no_toca_todas_las_filas(gestor):
+    _crear_pagos(gestor)
+
+    gestor.conectar()
+    try:
+        with pytest.raises(DBEliminacionError):
+            gestor.eliminar("Pago", {})
+    finally:
+        gestor.desconectar()
+
+    assert len(_pagos(gestor)) == 3
+
+
+# ---------------------------------------------------------
+#   IN / IS NULL
+# ---------------------------------------------------------
+def test_desglosar_condicion():
+    forma, valores = desglosar_condicion({"id_pago": 7, "estado": ["a", "b"], "fecha_pago": None})
+
+    assert forma == (("id_pago", IGUAL), ("estado", 2), ("fecha_pago", NULO))
+    assert valores == (7, "a", "b")
+
+    with pytest.raises(ErrorBaseDatos):
+        desglosar_condicion(())
+
+
+def test_actualizar_con_in_e_is_null(gestor):
+    ids = _crear_pagos(gestor)
+
+    gestor.conectar()
+    try:
+        # Los tres están en la lista, pero sólo dos siguen sin fecha de pago
+        gestor.actualizar("Pago", {"concepto": "revisado"}, {"id_pago": ids, "fecha_pago": None})
+    finally:
+        gestor.desconectar()
+
+    assert _pagos(gestor) == [(ids[0], "revisado"), (ids[1], "revisado"), (ids[2], "")]
+
+
+def test_eliminar_con_in(gestor):
+    ids = _crear_pagos(gestor)
+
+    gestor.conectar()
+    try:
+        gestor.eliminar("Pago", (("id_pago", [ids[0], ids[2]]),))
+    finally:
+        gestor.desconectar()
+
+    assert [f[0] for f in _pagos(gestor)] == [ids[1]]
@@ -0,0 +1,54 @@
+# ---------------------------------------------------------
+#   TRANSACCIONES (GestorBD.transaccion)
+# ---------------------------------------------------------
+
+import pytest
+
+from excepciones import ErrorValidacion
+
+
+def _aparato(nombre):
+    return {"nombre": nombre, "tipo": "cardio", "descripcion": "", "estado": "disponible"}
+
+
+def _nombres(gestor):
+    gestor.conectar()
+    try:
+        return {f[0] for f in gestor.obtener_datos("SELECT nombre FROM Aparato")}
+    finally:
+        gestor.desconectar()
+
+
+def test_fallo_anidado_solo_deshace_su_savepoint(gestor):
+    with gestor.transaccion():
+        gestor.insertar("Aparato", _aparato("Cinta"))
+
+        with pytest.raises(ErrorValidacion):
+            with gestor.transaccion():
+                gestor.insertar("Aparato", _aparato("Remo"))
+                raise ErrorValidacion("falla el bloque interno")
+
+        gestor.insertar("Aparato", _aparato("Bici"))
+
+    assert _nombres(gestor) == {"Cinta", "Bici"}
+    assert not gestor.en_transaccion
+
+
+def test_fallo_externo_deshace_tambien_lo_anidado(gestor):
+    with pytest.raises(ErrorValidacion):
+        with gestor.transaccion():
+            gestor.insertar("Aparato", _aparato("Cinta"))
+            with gestor.transaccion():
+                gestor.insertar("Aparato", _aparato("Remo"))
+            raise ErrorValidacion("falla el bloque externo")
+
+    assert _nombres(gestor) == set()
+    assert gestor.conexion is None   # la conexión se devolvió al pool
+
+
+def test_no_se_confirma_hasta_salir_del_bloque(gestor):
+    with gestor.transaccion():
+        gestor.insertar("Aparato", _aparato("Cinta"))
+        assert gestor.conexion.in_transaction
+
+    assert _nombres(gestor) == {"Cinta"}
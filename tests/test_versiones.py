@@ -0,0 +1,40 @@
+# ---------------------------------------------------------
+#   VERSIONES DE TABLAS
+# ---------------------------------------------------------
+
+from data.gestor_bd import GestorBD
+from data.versiones import marcar_cambio_query
+from controller.pago_controller import PagoController
+
+
+def test_generar_pagos_sube_version_de_pago(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "gym.db")
+    monkeypatch.setenv("GFTM_BD", ruta)
+
+    gestor = GestorBD()
+    gestor.conectar()
+    try:
+        gestor.crear_tablas()
+        gestor.insertar("Cliente", {
+            "nombre": "Ana", "apellidos": "López", "dni": "00000001R",
+            "fecha_alta": "2024-01-01", "estado": "activo"
+        })
+    finally:
+        gestor.desconectar()
+
+    antes = gestor.versiones_tablas("Pago")["Pago"]
+    assert PagoController().generar_pagos_mensuales("2024-02") == 1
+    assert gestor.versiones_tablas("Pago")["Pago"] > antes
+
+
+def test_escritura_tras_with_marca_su_tabla():
+    ruta = "versiones-prueba.db"
+    antes = GestorBD(ruta).versiones_tablas("Pago")["Pago"]
+
+    marcar_cambio_query(GestorBD(ruta).db_path, """
+        WITH RECURSIVE meses(mes) AS (SELECT '2024-01' UNION ALL SELECT mes FROM meses)
+        INSERT INTO Pago (id_cliente, mes) SELECT 1, mes FROM meses
+    """)
+    marcar_cambio_query(GestorBD(ruta).db_path, "WITH x AS (SELECT 1) SELECT * FROM x")
+
+    assert GestorBD(ruta).versiones_tablas("Pago")["Pago"] == antes + 1
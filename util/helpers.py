@@ -3,6 +3,7 @@ Helpers del sistema
 Funciones auxiliares
 """
 
+import unicodedata
 from datetime import datetime, timedelta
 
 
@@ -69,3 +70,12 @@ def calcular_hora_fin(hora_inicio):
         return fin.strftime('%H:%M')
     except (ValueError, TypeError):
         return ""
+
+
+def normalizar_texto(texto):
+    """
+    Pasa a minúsculas y quita tildes: 'Martín' → 'martin'.
+    Sirve para comparar igual que la búsqueda de clientes de la BD.
+    """
+    descompuesto = unicodedata.normalize("NFKD", str(texto or ""))
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower()
@@ -64,6 +64,16 @@ def validar_hora(hora):
     return bool(re.match(patron, hora.strip()))
 
 
+def validar_hora_tramo(hora):
+    """
+    Valida que la hora sea el inicio de un tramo de 30 minutos
+    (en punto o y media). Formato esperado: HH:MM
+    """
+    if not validar_hora(hora):
+        return False
+    return hora.strip()[3:] in ("00", "30")
+
+
 def validar_cuota(cuota):
     """Valida que la cuota sea un número positivo."""
     try:
@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from controller.aparato_controller import AparatoController
 from resources.style.colores import *
+from view.tareas import IndicadorCarga
 
 # --- ESTILOS MATRIX / NEON REFINADOS ---
 R_COLOR_PANEL = "#151C25"
@@ -20,6 +21,9 @@ R_COLOR_TABLA_BG = "#10171E"
 R_COLOR_TABLA_HEAD = "#1D2630"
 
 class AparatoView(tk.Frame):
+    # Tablas cuyos cambios obligan a refrescar la vista (ver MainWindow)
+    TABLAS = ("Aparato",)
+
     def __init__(self, parent, main_window):
         super().__init__(parent, bg=COLOR_FONDO)
         self.main_window = main_window
@@ -162,6 +166,7 @@ class AparatoView(tk.Frame):
             
         self.tree.pack(fill="both", expand=True)
         self.tree.bind("<<TreeviewSelect>>", self.seleccionar_aparato)
+        self.indicador = IndicadorCarga(self.tree)
 
     def _crear_input_moderno(self, parent, label, row, col):
         frame = tk.Frame(parent, bg=R_COLOR_PANEL)
@@ -226,26 +231,51 @@ class AparatoView(tk.Frame):
     def guardar_aparato(self):
         nombre = self.entry_nombre.get().strip()
         if not nombre: return
-        self.controller.crear_aparato(nombre, self.combo_tipo.get(), self.text_descripcion.get("1.0", tk.END).strip(), self.combo_estado.get())
+        aparato = self.controller.crear_aparato(nombre, self.combo_tipo.get(), self.text_descripcion.get("1.0", tk.END).strip(), self.combo_estado.get())
         self.limpiar_formulario()
-        self._cargar_aparatos()
+        self._pintar_aparato(aparato)
 
     def modificar_aparato(self):
         if not self.id_aparato_seleccionado: return
-        self.controller.actualizar_aparato(self.id_aparato_seleccionado, nombre=self.entry_nombre.get(), tipo=self.combo_tipo.get(), estado=self.combo_estado.get(), descripcion=self.text_descripcion.get("1.0", tk.END).strip())
-        self._cargar_aparatos()
+        aparato = self.controller.actualizar_aparato(self.id_aparato_seleccionado, nombre=self.entry_nombre.get(), tipo=self.combo_tipo.get(), estado=self.combo_estado.get(), descripcion=self.text_descripcion.get("1.0", tk.END).strip())
+        if aparato: self._pintar_aparato(aparato)
 
     def eliminar_aparato(self):
         if not self.id_aparato_seleccionado: return
         if messagebox.askyesno("Confirmar", "¿Eliminar?"):
-            self.controller.eliminar_aparato(self.id_aparato_seleccionado)
+            id_aparato = self.id_aparato_seleccionado
+            self.controller.eliminar_aparato(id_aparato)
             self.limpiar_formulario()
-            self._cargar_aparatos()
+            if self.tree.exists(id_aparato): self.tree.delete(id_aparato)
 
     def _cargar_aparatos(self):
+        # La consulta va en segundo plano; la tabla se pinta al llegar
+        self.main_window.tareas.ejecutar(
+            self.controller.obtener_todos_aparatos,
+            al_terminar=self._pintar_aparatos,
+            al_fallar=lambda e: messagebox.showerror("Error cargando aparatos", str(e)),
+            grupo=self,
+            indicador=self.indicador
+        )
+
+    def refrescar(self, cambiadas):
+        self._cargar_aparatos()
+
+    def _pintar_aparatos(self, aparatos):
         for item in self.tree.get_children(): self.tree.delete(item)
-        for a in self.controller.obtener_todos_aparatos():
-            self.tree.insert("", "end", values=(a.id_aparato, a.nombre, a.tipo, a.estado, a.descripcion))
+        for a in aparatos:
+            self.tree.insert("", "end", iid=a.id_aparato, values=self._fila_aparato(a))
+
+    def _pintar_aparato(self, a):
+        # Tras crear o modificar: sólo se toca su fila (el iid es el id)
+        if self.tree.exists(a.id_aparato):
+            self.tree.item(a.id_aparato, values=self._fila_aparato(a))
+        else:
+            self.tree.insert("", "end", iid=a.id_aparato, values=self._fila_aparato(a))
+
+    @staticmethod
+    def _fila_aparato(a):
+        return (a.id_aparato, a.nombre, a.tipo, a.estado, a.descripcion)
 
     def seleccionar_aparato(self, event):
         sel = self.tree.selection()
@@ -3,12 +3,14 @@ Vista de Clientes
 Pantalla para gestionar los socios del gimnasio.
 """
 
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
 from controller.cliente_controller import ClienteController
-from util.helpers import formatear_fecha, obtener_fecha_actual
+from util.helpers import formatear_fecha, obtener_fecha_actual, normalizar_texto
 from util.validaciones import validar_dni, validar_email, validar_telefono
 from resources.style.colores import *
+from view.tabla_virtual import TablaVirtual
 
 # Colores propios de esta vista (modo oscuro)
 R_COLOR_PANEL = "#151C25"
@@ -24,14 +26,29 @@ R_COLOR_TABLA_BG = "#10171E"
 R_COLOR_TABLA_LINES = "#2B3440"
 R_COLOR_TABLA_HEAD = "#1D2630"
 
+# Búsqueda mientras se escribe
+RETARDO_BUSQUEDA_MS = 250   # pausa al teclear antes de consultar
+MAX_RESULTADOS = 50         # coincidencias que se pintan
+MAX_CACHE = 500             # coincidencias que se piden y se guardan
+ENTRADAS_CACHE = 20         # búsquedas recordadas
+
 
 class ClienteView(tk.Frame):
+    # Tablas cuyos cambios obligan a refrescar la vista (ver MainWindow)
+    TABLAS = ("Cliente",)
+
     def __init__(self, parent, main_window):
         super().__init__(parent, bg=COLOR_FONDO)
         self.main_window = main_window
         self.controller = ClienteController()
         self.id_cliente_seleccionado = None
 
+        # Búsqueda en vivo: after() pendiente, consulta en curso y
+        # caché {criterio normalizado: (clientes, completa)}
+        self._busqueda_programada = None
+        self._tarea_busqueda = None
+        self._cache_busqueda = {}
+
         self._configurar_estilos_treeview()
         self._configurar_interfaz()
         self._cargar_clientes()
@@ -195,6 +212,8 @@ class ClienteView(tk.Frame):
             bd=8
         )
         self.entry_buscar.pack(fill="x")
+        self.entry_buscar.bind("<KeyRelease>", self._programar_busqueda)
+        self.entry_buscar.bind("<Return>", lambda e: self._buscar_clientes())
 
         self._crear_boton_refinado(
             search_frame, "BUSCAR", self._buscar_clientes, "#3498db"
@@ -204,34 +223,23 @@ class ClienteView(tk.Frame):
             search_frame, "VER TODOS", self._cargar_clientes, "#95a5a6"
         ).pack(side="left", padx=(10, 0))
 
-        # -------- TABLA --------
-        table_frame = tk.Frame(card, bg=R_COLOR_PANEL)
-        table_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
-
-        scrollbar_y = ttk.Scrollbar(table_frame, orient="vertical")
-        scrollbar_y.pack(side="right", fill="y")
-
-        scrollbar_x = ttk.Scrollbar(table_frame, orient="horizontal")
-        scrollbar_x.pack(side="bottom", fill="x")
-
+        # -------- TABLA (virtual: sólo pinta las filas visibles) --------
         cols = ("ID", "Nombre", "Apellidos", "DNI", "Email", "Teléfono", "Fecha", "Estado")
-        self.tree = ttk.Treeview(
-            table_frame,
-            columns=cols,
-            show="headings",
-            yscrollcommand=scrollbar_y.set,
-            xscrollcommand=scrollbar_x.set
-        )
-        scrollbar_y.config(command=self.tree.yview)
-        scrollbar_x.config(command=self.tree.xview)
 
-        for col in cols:
-            self.tree.heading(col, text=col)
-            width = 60 if col == "ID" else 160
-            self.tree.column(col, width=width)
+        self.tabla = TablaVirtual(
+            card, cols,
+            anchos={col: 60 if col == "ID" else 160 for col in cols},
+            origen=self.controller.obtener_todos_clientes,
+            a_fila=self._fila_cliente,
+            clave=lambda c: c.id_cliente,
+            bg=R_COLOR_PANEL,
+            tareas=self.main_window.tareas,
+            al_fallar=lambda e: messagebox.showerror("Error cargando clientes", str(e))
+        )
+        self.tabla.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-        self.tree.pack(fill="both", expand=True)
-        self.tree.bind("<<TreeviewSelect>>", self._seleccionar_cliente)
+        self.tree = self.tabla.tree
+        self.tree.bind("<<TreeviewSelect>>", self._seleccionar_cliente, add="+")
 
     # Crea un input con su etiqueta y borde turquesa
     def _crear_input_refinado(self, parent, label, row, col):
@@ -326,7 +334,7 @@ class ClienteView(tk.Frame):
             return
 
         try:
-            self.controller.crear_cliente(
+            cliente = self.controller.crear_cliente(
                 self.entry_nombre.get(),
                 self.entry_apellidos.get(),
                 self.entry_dni.get(),
@@ -336,7 +344,8 @@ class ClienteView(tk.Frame):
             )
             messagebox.showinfo("Éxito", "Cliente creado.")
             self._limpiar_formulario()
-            self._cargar_clientes()
+            self._cache_busqueda.clear()
+            self.tabla.insertar_fila(cliente)
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -344,7 +353,7 @@ class ClienteView(tk.Frame):
         if not self.id_cliente_seleccionado:
             return
         try:
-            self.controller.actualizar_cliente(
+            cliente = self.controller.actualizar_cliente(
                 self.id_cliente_seleccionado,
                 nombre=self.entry_nombre.get(),
                 apellidos=self.entry_apellidos.get(),
@@ -354,7 +363,9 @@ class ClienteView(tk.Frame):
                 estado=self.combo_estado.get()
             )
             messagebox.showinfo("Éxito", "Cliente actualizado.")
-            self._cargar_clientes()
+            self._cache_busqueda.clear()
+            if cliente:
+                self.tabla.actualizar_fila(cliente)
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -362,58 +373,112 @@ class ClienteView(tk.Frame):
         if not self.id_cliente_seleccionado:
             return
         if messagebox.askyesno("Confirmar", "¿Eliminar cliente?"):
-            self.controller.eliminar_cliente(self.id_cliente_seleccionado)
+            id_cliente = self.id_cliente_seleccionado
+            self.controller.eliminar_cliente(id_cliente)
             self._limpiar_formulario()
-            self._cargar_clientes()
+            self._cache_busqueda.clear()
+            self.tabla.eliminar_fila(id_cliente)
 
     # ---------------------------------------------------------
     #   TABLA
     # ---------------------------------------------------------
     def _cargar_clientes(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        clientes = self.controller.obtener_todos_clientes()
-        for c in clientes:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    c.id_cliente,
-                    c.nombre,
-                    c.apellidos,
-                    c.dni,
-                    c.email,
-                    c.telefono,
-                    c.fecha_alta,
-                    c.estado
-                )
-            )
+        # Primera página; el resto se pide al desplazarse.
+        # Los datos se vuelven a leer: la caché de búsquedas ya no vale
+        self._cache_busqueda.clear()
+        self.tabla.recargar()
+
+    def refrescar(self, cambiadas):
+        """Vuelve a pedir los datos (respetando la búsqueda escrita)."""
+        self._cache_busqueda.clear()
+        self._buscar_clientes()
+
+    @staticmethod
+    def _fila_cliente(c):
+        return (
+            c.id_cliente,
+            c.nombre,
+            c.apellidos,
+            c.dni,
+            c.email,
+            c.telefono,
+            c.fecha_alta,
+            c.estado
+        )
+
+    # ---------------------------------------------------------
+    #   BÚSQUEDA MIENTRAS SE ESCRIBE
+    # ---------------------------------------------------------
+    def _programar_busqueda(self, event=None):
+        # Sólo se busca cuando se deja de teclear un momento
+        if self._busqueda_programada:
+            self.after_cancel(self._busqueda_programada)
+        self._busqueda_programada = self.after(RETARDO_BUSQUEDA_MS, self._buscar_clientes)
 
     def _buscar_clientes(self):
-        criterio = self.entry_buscar.get()
-        if not criterio:
+        if self._busqueda_programada:
+            self.after_cancel(self._busqueda_programada)
+            self._busqueda_programada = None
+
+        # La búsqueda anterior que siga en curso ya no interesa
+        if self._tarea_busqueda:
+            self._tarea_busqueda.cancelar()
+            self._tarea_busqueda = None
+
+        texto = self.entry_buscar.get()
+        palabras = re.findall(r"\w+", normalizar_texto(texto))
+        if not palabras:
+            self._cargar_clientes()
             return
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        clientes = self.controller.buscar_clientes(criterio)
-        for c in clientes:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    c.id_cliente,
-                    c.nombre,
-                    c.apellidos,
-                    c.dni,
-                    c.email,
-                    c.telefono,
-                    c.fecha_alta,
-                    c.estado
-                )
-            )
+        clave = " ".join(palabras)
+        en_cache = self._buscar_en_cache(clave, palabras)
+        if en_cache is not None:
+            self.tabla.mostrar(en_cache[:MAX_RESULTADOS])
+            return
+
+        def recibidos(clientes):
+            self._tarea_busqueda = None
+            self._guardar_en_cache(clave, clientes, len(clientes) < MAX_CACHE)
+            self.tabla.mostrar(clientes[:MAX_RESULTADOS])
+
+        self._tarea_busqueda = self.main_window.tareas.ejecutar(
+            self.controller.buscar_clientes, texto, MAX_CACHE,
+            al_terminar=recibidos,
+            al_fallar=lambda e: messagebox.showerror("Error buscando clientes", str(e)),
+            grupo=self,
+            indicador=self.tabla.indicador
+        )
+
+    def _buscar_en_cache(self, clave, palabras):
+        """
+        Resultados sin ir a la BD: los de la misma búsqueda o, si se ha
+        seguido escribiendo, los de una búsqueda anterior más corta
+        filtrados aquí (sólo si aquella no se quedó cortada por MAX_CACHE).
+        """
+        if clave in self._cache_busqueda:
+            return self._cache_busqueda[clave][0]
+
+        for previa in sorted(self._cache_busqueda, key=len, reverse=True):
+            clientes, completa = self._cache_busqueda[previa]
+            if completa and clave.startswith(previa):
+                filtrados = [c for c in clientes if self._coincide(c, palabras)]
+                self._guardar_en_cache(clave, filtrados, True)
+                return filtrados
+
+        return None
+
+    def _guardar_en_cache(self, clave, clientes, completa):
+        self._cache_busqueda[clave] = (clientes, completa)
+        if len(self._cache_busqueda) > ENTRADAS_CACHE:
+            del self._cache_busqueda[next(iter(self._cache_busqueda))]
+
+    @staticmethod
+    def _coincide(cliente, palabras):
+        # Mismo criterio que el índice FTS: cada palabra es prefijo de alguna
+        texto = normalizar_texto(f"{cliente.nombre} {cliente.apellidos} {cliente.dni}")
+        tokens = re.findall(r"\w+", texto)
+        return all(any(t.startswith(p) for t in tokens) for p in palabras)
 
     def _seleccionar_cliente(self, event):
         sel = self.tree.selection()
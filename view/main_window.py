@@ -5,11 +5,21 @@ Interfaz principal del sistema tras iniciar sesión.
 ---------------------------------------------------------
 """
 
+import time
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import messagebox
 from data.gestor_bd import GestorBD
 from excepciones import ErrorBaseDatos
 from resources.style.colores import *
+from view.tareas import GestorTareas
+
+# Vistas que se mantienen construidas (ocultas) para volver a ellas al instante
+MAX_VISTAS_VIVAS = 3
+
+# Una vista oculta más tiempo que esto se refresca entera al volver
+# (así se ven también los cambios hechos desde otro equipo)
+VIGENCIA_VISTA_SEGUNDOS = 300
 
 class MainWindow:
     """Ventana principal con navegación entre módulos."""
@@ -27,9 +37,22 @@ class MainWindow:
         self.root.configure(bg=COLOR_FONDO)
 
         self.inicializar_bd()
+        self.db = GestorBD()
         self.vista_actual = None
+
+        # clase → vista construida, de la menos a la más usada recientemente
+        self.vistas = OrderedDict()
+        # clase → (versiones de sus tablas, instante) al ocultarla
+        self._estado_vistas = {}
+
+        # Consultas de las vistas en segundo plano (la ventana no se congela)
+        self.tareas = GestorTareas(self.root)
         self.configurar_interfaz()
 
+        # Atajo oculto de administración: estadísticas de consultas
+        self.ventana_estadisticas = None
+        self.root.bind("<Control-Shift-D>", self.mostrar_estadisticas)
+
         # Vista inicial
         self.mostrar_clientes()
 
@@ -199,16 +222,70 @@ class MainWindow:
     # ---------------------------------------------------------
     # CAMBIO DE VISTAS
     # ---------------------------------------------------------
+    #   Las vistas no se destruyen al salir de ellas: se ocultan y,
+    #   al volver, sólo se recargan si sus tablas han cambiado.
+    # ---------------------------------------------------------
     def cambiar_vista(self, clase_vista):
-        if self.vista_actual:
-            self.vista_actual.destroy()
+        if self.vista_actual is not None:
+            self._ocultar_vista(self.vista_actual)
+            self.vista_actual = None
+
+        vista = self.vistas.pop(clase_vista, None)
 
         try:
-            self.vista_actual = clase_vista(self.frame_contenido, self)
-            self.vista_actual.pack(fill="both", expand=True, padx=30, pady=30)
+            if vista is None:
+                vista = clase_vista(self.frame_contenido, self)
+            else:
+                self._reactivar_vista(vista)
+
+            self.vistas[clase_vista] = vista
+            vista.pack(fill="both", expand=True, padx=30, pady=30)
+            self.vista_actual = vista
         except Exception as e:
             messagebox.showerror("Error", f"Error cargando vista: {e}")
 
+        self._descartar_vistas_sobrantes()
+
+    def _ocultar_vista(self, vista):
+        vista.pack_forget()
+
+        # Lo que siguiera cargando no se ve: se cancela y, si quedaba algo
+        # a medias, al volver se recarga todo (versiones vacías)
+        if self.tareas.cancelar(vista):
+            versiones = {}
+        else:
+            versiones = self.db.versiones_tablas(*getattr(vista, "TABLAS", ()))
+        self._estado_vistas[type(vista)] = (versiones, time.monotonic())
+
+    def _reactivar_vista(self, vista):
+        # Los estilos de ttk son globales y cada vista pone los suyos
+        vista._configurar_estilos_treeview()
+
+        tablas = getattr(vista, "TABLAS", ())
+        versiones, instante = self._estado_vistas.pop(type(vista), ({}, 0))
+
+        if time.monotonic() - instante > VIGENCIA_VISTA_SEGUNDOS:
+            cambiadas = set(tablas)
+        else:
+            actuales = self.db.versiones_tablas(*tablas)
+            cambiadas = {t for t in tablas if actuales[t] != versiones.get(t)}
+
+        if cambiadas:
+            vista.refrescar(cambiadas)
+
+    def _descartar_vistas_sobrantes(self):
+        # Se destruyen las menos usadas (nunca la actual)
+        while len(self.vistas) > MAX_VISTAS_VIVAS:
+            clase, vista = self.vistas.popitem(last=False)
+            if vista is self.vista_actual:
+                self.vistas[clase] = vista
+                break
+
+            # Lo que siguiera cargando esa vista ya no interesa
+            self.tareas.cancelar(vista)
+            self._estado_vistas.pop(clase, None)
+            vista.destroy()
+
     # Rutas a vistas
     def mostrar_clientes(self):
         from view.cliente_view import ClienteView
@@ -226,6 +303,15 @@ class MainWindow:
         from view.aparato_view import AparatoView
         self.cambiar_vista(AparatoView)
 
+    def mostrar_estadisticas(self, event=None):
+        from view.ventana_estadisticas import VentanaEstadisticas
+
+        if self.ventana_estadisticas is not None and self.ventana_estadisticas.winfo_exists():
+            self.ventana_estadisticas.lift()
+            return
+
+        self.ventana_estadisticas = VentanaEstadisticas(self.root)
+
     # ---------------------------------------------------------
     # CERRAR SESIÓN
     # ---------------------------------------------------------
@@ -7,10 +7,11 @@ from tkinter import ttk, messagebox
 from datetime import datetime
 
 from controller.pago_controller import PagoController
-from controller.cliente_controller import ClienteController
+from controller.directorio import obtener_directorio
 from util.helpers import formatear_fecha, formatear_cuota
 from util.validaciones import validar_fecha
 from view.ventana_pago import VentanaPago
+from view.tabla_virtual import TablaVirtual
 from resources.style.colores import *
 
 # Paleta usada en el resto de vistas dark
@@ -29,19 +30,26 @@ R_COLOR_TABLA_HEAD = "#1D2630"
 
 
 class PagoView(tk.Frame):
+    # Tablas cuyos cambios obligan a refrescar la vista (ver MainWindow)
+    TABLAS = ("Pago", "Cliente")
+
     def __init__(self, parent, main_window):
         super().__init__(parent, bg=COLOR_FONDO)
         self.main_window = main_window
 
         self.controller = PagoController()
-        self.cliente_controller = ClienteController()
 
-        # id_cliente → "Nombre Apellidos"
-        self.clientes_dict = {}
+        # Nombres de cliente compartidos con el resto de vistas
+        self.directorio = obtener_directorio(self.controller.db)
         self.id_pago_seleccionado = None
+        self.cliente_seleccionado = None
+
+        # Filtros de filtrar_pagos que se aplican a la tabla ({} = todos)
+        self.filtro = {}
 
         self._configurar_estilos_treeview()
         self._configurar_interfaz()
+        # Los nombres de cliente se resuelven junto a cada página de pagos
         self.cargar_clientes()
         self.cargar_pagos()
 
@@ -225,38 +233,24 @@ class PagoView(tk.Frame):
             frame_acciones, "ELIMINAR", self.eliminar_pago, R_COLOR_BTN_ELIMINAR
         ).pack(side="left")
 
-        # --- Tabla ---
-        table_frame = tk.Frame(card, bg=R_COLOR_PANEL)
-        table_frame.pack(fill="both", expand=True, padx=20, pady=(10, 20))
-
-        scrollbar_y = ttk.Scrollbar(table_frame, orient="vertical")
-        scrollbar_y.pack(side="right", fill="y")
-
-        scrollbar_x = ttk.Scrollbar(table_frame, orient="horizontal")
-        scrollbar_x.pack(side="bottom", fill="x")
-
+        # --- Tabla (virtual: sólo pinta las filas visibles) ---
         columnas = ("ID", "Cliente", "Mes", "Estado", "Cuota", "F. Pago", "Método")
 
-        self.tree = ttk.Treeview(
-            table_frame,
-            columns=columnas,
-            show="headings",
-            yscrollcommand=scrollbar_y.set,
-            xscrollcommand=scrollbar_x.set
+        self.tabla = TablaVirtual(
+            card, columnas,
+            anchos={"ID": 60, "Cliente": 250, "Mes": 120, "Estado": 120,
+                    "Cuota": 120, "F. Pago": 120, "Método": 150},
+            origen=self._pagos_filtrados,
+            a_fila=self._fila_pago,
+            clave=lambda e: e[0].id_pago,
+            bg=R_COLOR_PANEL,
+            tareas=self.main_window.tareas,
+            al_fallar=lambda e: messagebox.showerror("Error cargando pagos", str(e))
         )
-        scrollbar_y.config(command=self.tree.yview)
-        scrollbar_x.config(command=self.tree.xview)
+        self.tabla.pack(fill="both", expand=True, padx=20, pady=(10, 20))
 
-        for col in columnas:
-            self.tree.heading(col, text=col)
-            width = 120 # aumentamos base
-            if col == "ID": width = 60
-            if col == "Cliente": width = 250
-            if col == "Método": width = 150
-            self.tree.column(col, width=width)
-
-        self.tree.pack(fill="both", expand=True)
-        self.tree.bind("<<TreeviewSelect>>", self.seleccionar_pago)
+        self.tree = self.tabla.tree
+        self.tree.bind("<<TreeviewSelect>>", self.seleccionar_pago, add="+")
 
     # --------- BOTONES ---------
     def _crear_boton_refinado(self, parent, text, cmd, bg_color):
@@ -296,90 +290,88 @@ class PagoView(tk.Frame):
         }
         return hover_map.get(color, color)
 
+    # --------- TAREAS EN SEGUNDO PLANO ---------
+    def _tarea(self, funcion, *args, al_terminar, error="Error"):
+        """Ejecuta la consulta fuera del hilo de Tk y pinta el resultado al llegar."""
+        return self.main_window.tareas.ejecutar(
+            funcion, *args,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: messagebox.showerror(error, str(e)),
+            grupo=self,
+            indicador=self.tabla.indicador
+        )
+
     # --------- CARGA DE CLIENTES Y PAGOS ---------
-    def cargar_clientes(self):
-        try:
-            clientes = self.cliente_controller.obtener_todos_clientes()
+    def cargar_clientes(self, despues=None):
+        def pintar(clientes):
             valores = []
 
             for c in clientes:
-                texto = f"{c.id_cliente} - {c.nombre} {c.apellidos}"
-                valores.append(texto)
-                self.clientes_dict[c.id_cliente] = f"{c.nombre} {c.apellidos}"
+                valores.append(f"{c.id_cliente} - {c.nombre} {c.apellidos}")
 
             self.combo_filtro_cliente["values"] = valores
+            if despues:
+                despues()
 
-        except Exception as e:
-            messagebox.showerror("Error cargando clientes", str(e))
+        # Sólo consulta la BD la primera vez; luego sale del directorio
+        self._tarea(self.directorio.clientes,
+                    al_terminar=pintar, error="Error cargando clientes")
 
     def generar_pagos_mes(self):
-        try:
-            mes_num = self.combo_mes.get().split(" ")[0]
-            anio = self.combo_anio.get()
-            mes_formato = f"{anio}-{mes_num}"
-
-            cantidad = self.controller.generar_pagos_mensuales(mes_formato)
+        mes_num = self.combo_mes.get().split(" ")[0]
+        anio = self.combo_anio.get()
+        mes_formato = f"{anio}-{mes_num}"
 
+        def terminado(resultado):
             messagebox.showinfo(
                 "Pagos generados",
-                f"Se han creado {cantidad} pagos pendientes.",
+                f"Se han creado {resultado['creados']} pagos pendientes.\n"
+                f"Ya existían {resultado['omitidos']}.",
             )
             self.cargar_pagos()
 
-        except Exception as e:
-            messagebox.showerror("Error generando pagos", str(e))
+        self._tarea(self.controller.generar_pagos_periodo, mes_formato,
+                    al_terminar=terminado, error="Error generando pagos")
 
     def cargar_pagos(self):
-        try:
-            self.tree.delete(*self.tree.get_children())
-            pagos = self.controller.obtener_todos_pagos()
-
-            for p in pagos:
-                nombre = self.clientes_dict.get(p.id_cliente, "Desconocido")
-                estado = "Pagado" if p.pagado else "Pendiente"
-
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        p.id_pago,
-                        nombre,
-                        p.mes,
-                        estado,
-                        formatear_cuota(p.cuota),
-                        formatear_fecha(p.fecha_pago),
-                        p.metodo_pago or "",
-                    ),
-                )
-
-        except Exception as e:
-            messagebox.showerror("Error cargando pagos", str(e))
+        self._aplicar_filtro()
+
+    def _aplicar_filtro(self, **filtro):
+        # Primera página (en segundo plano); el resto se pide al desplazarse
+        self.filtro = filtro
+        self.tabla.recargar()
+
+    def _pagos_filtrados(self, despues_de_id, limite):
+        # Corre en segundo plano: el nombre del cliente se busca aquí y no
+        # al pintar, porque si el directorio ha caducado se relee entero
+        pagos = self.controller.filtrar_pagos(
+            despues_de_id=despues_de_id, limite=limite, **self.filtro
+        )
+        return [(p, self.directorio.nombre_cliente(p.id_cliente)) for p in pagos]
+
+    def refrescar(self, cambiadas):
+        """Recarga lo que haya cambiado mientras la vista estaba oculta."""
+        if "Cliente" in cambiadas:
+            self.cargar_clientes(despues=self.tabla.recargar)
+        else:
+            self.tabla.recargar()
+
+    def _fila_pago(self, elemento):
+        p, nombre = elemento
+        estado = "Pagado" if p.pagado else "Pendiente"
+
+        return (
+            p.id_pago,
+            nombre,
+            p.mes,
+            estado,
+            formatear_cuota(p.cuota),
+            formatear_fecha(p.fecha_pago),
+            p.metodo_pago or "",
+        )
 
     def mostrar_pendientes(self):
-        try:
-            self.tree.delete(*self.tree.get_children())
-            pagos = self.controller.obtener_todos_pagos()
-
-            for p in pagos:
-                if not p.pagado:
-                    nombre = self.clientes_dict.get(p.id_cliente, "Desconocido")
-
-                    self.tree.insert(
-                        "",
-                        "end",
-                        values=(
-                            p.id_pago,
-                            nombre,
-                            p.mes,
-                            "Pendiente",
-                            formatear_cuota(p.cuota),
-                            "",
-                            "",
-                        ),
-                    )
-
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._aplicar_filtro(pagado=False)
 
     # --------- FILTROS ---------
     def filtrar_por_cliente(self):
@@ -387,32 +379,7 @@ class PagoView(tk.Frame):
         if not texto:
             return
 
-        try:
-            id_cliente = int(texto.split(" ")[0])
-            self.tree.delete(*self.tree.get_children())
-
-            pagos = self.controller.obtener_pagos_por_cliente(id_cliente)
-
-            for p in pagos:
-                estado = "Pagado" if p.pagado else "Pendiente"
-                nombre = self.clientes_dict.get(id_cliente, "Desconocido")
-
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        p.id_pago,
-                        nombre,
-                        p.mes,
-                        estado,
-                        formatear_cuota(p.cuota),
-                        formatear_fecha(p.fecha_pago),
-                        p.metodo_pago or "",
-                    ),
-                )
-
-        except Exception as e:
-            messagebox.showerror("Error filtrando pagos", str(e))
+        self._aplicar_filtro(id_cliente=int(texto.split(" ")[0]))
 
     # --------- SELECCIÓN / ACCIONES ---------
     def seleccionar_pago(self, event):
@@ -420,6 +387,7 @@ class PagoView(tk.Frame):
         if seleccion:
             valores = self.tree.item(seleccion[0])["values"]
             self.id_pago_seleccionado = valores[0]
+            self.cliente_seleccionado = str(valores[1])
 
     def marcar_pagado(self):
         if not self.id_pago_seleccionado:
@@ -437,9 +405,7 @@ class PagoView(tk.Frame):
 
             datos_pago = {
                 "id_pago": pago_obj.id_pago,
-                "cliente": self.clientes_dict.get(
-                    pago_obj.id_cliente, "Desconocido"
-                ),
+                "cliente": self.cliente_seleccionado,
                 "mes": pago_obj.mes,
                 "cuota": pago_obj.cuota,
             }
@@ -458,7 +424,7 @@ class PagoView(tk.Frame):
                     return
 
                 try:
-                    self.controller.marcar_pago_como_pagado(
+                    pago = self.controller.marcar_pago_como_pagado(
                         self.id_pago_seleccionado,
                         fecha,
                         metodo,
@@ -467,7 +433,11 @@ class PagoView(tk.Frame):
                     messagebox.showinfo(
                         "Éxito", "Pago marcado correctamente."
                     )
-                    self.cargar_pagos()
+                    if pago and self.filtro.get("pagado") is False:
+                        # Ya no es un pendiente: sale de la lista
+                        self.tabla.eliminar_fila(pago.id_pago)
+                    elif pago:
+                        self.tabla.actualizar_fila((pago, datos_pago["cliente"]))
 
                 except Exception as e:
                     messagebox.showerror(
@@ -489,7 +459,7 @@ class PagoView(tk.Frame):
 
         try:
             self.controller.eliminar_pago(self.id_pago_seleccionado)
-            self.cargar_pagos()
+            self.tabla.eliminar_fila(self.id_pago_seleccionado)
             self.id_pago_seleccionado = None
 
         except Exception as e:
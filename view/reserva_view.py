@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import date
+from datetime import date, datetime, timedelta
 from tkcalendar import DateEntry
 
 from controller.reserva_controller import ReservaController
@@ -9,6 +9,8 @@ from controller.aparato_controller import AparatoController
 
 from util.helpers import calcular_hora_fin
 from util.validaciones import validar_fecha, validar_hora
+from excepciones import ErrorConflictoReserva
+from view.tabla_virtual import TablaVirtual
 
 # === COLORES DARK/NEON ===
 COLOR_FONDO = "#0e1217"
@@ -27,6 +29,8 @@ COLOR_TABLA_HEAD = "#1D2630"
 
 
 class ReservaView(tk.Frame):
+    # Tablas cuyos cambios obligan a refrescar la vista (ver MainWindow)
+    TABLAS = ("Reserva", "Cliente", "Aparato")
 
     def __init__(self, parent, main_window):
         super().__init__(parent, bg=COLOR_FONDO)
@@ -36,10 +40,16 @@ class ReservaView(tk.Frame):
         self.cliente_controller = ClienteController()
         self.aparato_controller = AparatoController()
 
+        # Clientes y aparatos compartidos con el resto de vistas
+        self.directorio = self.cliente_controller.directorio
+
         self.id_reserva_seleccionada = None
         self.clientes_dict = {}
         self.aparatos_dict = {}
 
+        # Consulta de disponibilidad en curso (se cancela si cambia el tramo)
+        self._tarea_disponibilidad = None
+
         self._configurar_estilos_treeview()
         self._configurar_interfaz()
         self.cargar_clientes()
@@ -138,9 +148,11 @@ class ReservaView(tk.Frame):
         self.combo_estado = self._crear_combo(form, "Estado",
                                               ["pendiente", "confirmada", "cancelada"],
                                               2, 0)
+        self.combo_aparato.bind("<<ComboboxSelected>>", self._actualizar_disponibilidad)
 
         # FECHA
         self.entry_fecha = self._crear_date_entry(form, "Fecha", 0, 2)
+        self.entry_fecha.bind("<<DateEntrySelected>>", self._actualizar_disponibilidad)
 
         # HORAS
         hora_frame = tk.Frame(form, bg=COLOR_PANEL)
@@ -175,6 +187,14 @@ class ReservaView(tk.Frame):
         )
         self.label_hora_fin.grid(row=1, column=1, sticky="w", padx=(20, 0))
 
+        # Aviso de disponibilidad del tramo elegido (motor en memoria)
+        self.label_disponibilidad = tk.Label(
+            hora_frame, text="",
+            bg=COLOR_PANEL, fg="#A9B4C6",
+            font=("Segoe UI", 9)
+        )
+        self.label_disponibilidad.grid(row=2, column=0, columnspan=2, sticky="w", pady=(4, 0))
+
         # BOTONES CRUD
         btns = tk.Frame(card, bg=COLOR_PANEL)
         btns.pack(fill="x", padx=20, pady=(0, 15))
@@ -184,38 +204,25 @@ class ReservaView(tk.Frame):
         self._crear_btn(btns, "MODIFICAR", self.modificar_reserva, COLOR_BTN_NARANJA).pack(side="left", padx=6)
         self._crear_btn(btns, "ELIMINAR", self.eliminar_reserva, COLOR_BTN_ROJO).pack(side="left", padx=6)
         self._crear_btn(btns, "DISPONIBILIDAD", self.abrir_informe_disponibilidad, COLOR_BTN_MORADO).pack(side="left", padx=6)
+        self._crear_btn(btns, "SERIE", self.abrir_serie_reservas, COLOR_BTN_TURQ).pack(side="left", padx=6)
 
-        # TABLA
-        table_frame = tk.Frame(card, bg=COLOR_PANEL)
-        table_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
-
-        scrollbar_y = ttk.Scrollbar(table_frame, orient="vertical")
-        scrollbar_y.pack(side="right", fill="y")
-
-        scrollbar_x = ttk.Scrollbar(table_frame, orient="horizontal")
-        scrollbar_x.pack(side="bottom", fill="x")
-
+        # TABLA (virtual: sólo pinta las filas visibles y carga por páginas)
         cols = ("ID", "Cliente", "Aparato", "Fecha", "Inicio", "Fin", "Estado")
 
-        self.tree = ttk.Treeview(
-            table_frame, columns=cols, show="headings",
-            yscrollcommand=scrollbar_y.set,
-            xscrollcommand=scrollbar_x.set
+        self.tabla = TablaVirtual(
+            card, cols,
+            anchos={"ID": 60, "Cliente": 220, "Aparato": 220},
+            origen=self.controller.obtener_reservas_con_nombres,
+            a_fila=self._fila_reserva,
+            clave=lambda r: r["id_reserva"],
+            bg=COLOR_PANEL,
+            tareas=self.main_window.tareas,
+            al_fallar=lambda e: messagebox.showerror("Error cargando reservas", str(e))
         )
-        scrollbar_y.config(command=self.tree.yview)
-        scrollbar_x.config(command=self.tree.xview)
+        self.tabla.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-        for col in cols:
-            self.tree.heading(col, text=col)
-            # Anchos ampliados
-            w = 140
-            if col == "ID": w = 60
-            if col in ("Cliente", "Aparato"):
-                w = 220
-            self.tree.column(col, width=w)
-
-        self.tree.pack(fill="both", expand=True)
-        self.tree.bind("<<TreeviewSelect>>", self.seleccionar_reserva)
+        self.tree = self.tabla.tree
+        self.tree.bind("<<TreeviewSelect>>", self.seleccionar_reserva, add="+")
 
     # ---------------------------------------------------------
     #   CREAR COMBOS Y ENTRIES
@@ -264,37 +271,67 @@ class ReservaView(tk.Frame):
     # ---------------------------------------------------------
     #   CRUD Y CARGAS
     # ---------------------------------------------------------
+    def _tarea(self, funcion, *args, al_terminar, error="Error"):
+        """Ejecuta la consulta fuera del hilo de Tk y pinta el resultado al llegar."""
+        return self.main_window.tareas.ejecutar(
+            funcion, *args,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: messagebox.showerror(error, str(e)),
+            grupo=self,
+            indicador=self.tabla.indicador
+        )
+
     def cargar_clientes(self):
-        clientes = self.cliente_controller.obtener_todos_clientes()
-        valores = []
-        for c in clientes:
-            t = f"{c.id_cliente} - {c.nombre} {c.apellidos}"
-            valores.append(t)
-            self.clientes_dict[t] = c.id_cliente
-        self.combo_cliente["values"] = valores
+        def pintar(clientes):
+            self.clientes_dict.clear()
+            valores = []
+            for c in clientes:
+                t = f"{c.id_cliente} - {c.nombre} {c.apellidos}"
+                valores.append(t)
+                self.clientes_dict[t] = c.id_cliente
+            self.combo_cliente["values"] = valores
+
+        # Sólo consulta la BD la primera vez; luego sale del directorio
+        self._tarea(self.directorio.clientes,
+                    al_terminar=pintar, error="Error cargando clientes")
 
     def cargar_aparatos(self):
-        aparatos = self.aparato_controller.obtener_aparatos_disponibles()
-        valores = []
-        for a in aparatos:
-            t = f"{a.id_aparato} - {a.nombre}"
-            valores.append(t)
-            self.aparatos_dict[t] = a.id_aparato
-        self.combo_aparato["values"] = valores
+        def pintar(aparatos):
+            self.aparatos_dict.clear()
+            valores = []
+            for a in aparatos:
+                t = f"{a.id_aparato} - {a.nombre}"
+                valores.append(t)
+                self.aparatos_dict[t] = a.id_aparato
+            self.combo_aparato["values"] = valores
+
+        self._tarea(self.directorio.aparatos, "disponible",
+                    al_terminar=pintar, error="Error cargando aparatos")
 
     def cargar_reservas(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for r in self.controller.obtener_reservas_con_nombres():
-            self.tree.insert("", "end", values=(
-                r["id_reserva"],
-                r["cliente"],
-                r["aparato"],
-                r["fecha"],
-                r["inicio"],
-                r["fin"],
-                r["estado"]
-            ))
+        # Primera página; el resto se pide al desplazarse
+        self.tabla.recargar()
+
+    def refrescar(self, cambiadas):
+        """Recarga lo que haya cambiado mientras la vista estaba oculta."""
+        if "Cliente" in cambiadas:
+            self.cargar_clientes()
+        if "Aparato" in cambiadas:
+            self.cargar_aparatos()
+        # La tabla muestra nombres de clientes y aparatos: se recarga siempre
+        self.cargar_reservas()
+
+    @staticmethod
+    def _fila_reserva(r):
+        return (
+            r["id_reserva"],
+            r["cliente"],
+            r["aparato"],
+            r["fecha"],
+            r["inicio"],
+            r["fin"],
+            r["estado"]
+        )
 
     # ---------------------------------------------------------
     #   INFORME DE DISPONIBILIDAD (DARK + FUNCIONAL)
@@ -374,12 +411,25 @@ class ReservaView(tk.Frame):
                 messagebox.showerror("Error", "Formato inválido YYYY-MM-DD", parent=v)
                 return
 
-            try:
-                informe = self.controller.generar_informe_disponibilidad(fecha)
-            except Exception as e:
+            txt.config(state="normal")
+            txt.delete("1.0", tk.END)
+            txt.insert("1.0", "Cargando…")
+            txt.config(state="disabled")
+            btn.config(state="disabled")
+
+            def fallo(e):
+                btn.config(state="normal")
                 messagebox.showerror("Error", f"Fallo al generar: {e}", parent=v)
-                return
 
+            self.main_window.tareas.ejecutar(
+                self.controller.generar_informe_disponibilidad, fecha,
+                al_terminar=lambda informe: pintar(fecha, informe),
+                al_fallar=fallo,
+                grupo=v
+            )
+
+        def pintar(fecha, informe):
+            btn.config(state="normal")
             txt.config(state="normal")
             txt.delete("1.0", tk.END)
 
@@ -394,6 +444,12 @@ class ReservaView(tk.Frame):
                 else:
                     for h1, h2, cli in datos["reservas"]:
                         texto += f"   {h1}-{h2} → {cli}\n"
+
+                    libres = datos["libres"]
+                    if libres:
+                        texto += f"   Libre: {len(libres)} tramos (primero a las {libres[0]})\n"
+                    else:
+                        texto += "   Completo\n"
                     texto += "\n"
 
             txt.insert("1.0", texto)
@@ -404,6 +460,93 @@ class ReservaView(tk.Frame):
         # generar al abrir
         v.after(50, generar)
 
+    # ---------------------------------------------------------
+    #   SERIE SEMANAL (usa cliente, aparato, fecha y hora del formulario)
+    # ---------------------------------------------------------
+    def abrir_serie_reservas(self):
+        if not self.combo_cliente.get() or not self.combo_aparato.get():
+            messagebox.showwarning("Advertencia", "Seleccione cliente y aparato.")
+            return
+
+        v = tk.Toplevel(self)
+        v.title("Reserva semanal")
+        v.configure(bg=COLOR_FONDO, padx=20, pady=20)
+        v.transient(self.winfo_toplevel())
+
+        tk.Label(v, text=f"Desde {self.entry_fecha.get()} a las {self.entry_hora_inicio.get().strip()}",
+                 bg=COLOR_FONDO, fg="white",
+                 font=("Segoe UI", 11, "bold")).grid(row=0, column=0, columnspan=5, sticky="w")
+
+        tk.Label(v, text="HASTA", font=("Segoe UI", 8, "bold"),
+                 fg="#A9B4C6", bg=COLOR_FONDO).grid(row=1, column=0, sticky="w", pady=(10, 0))
+
+        entry_hasta = DateEntry(
+            v,
+            width=15,
+            date_pattern='yyyy-mm-dd',
+            locale='es_ES',
+            background="#00d4aa",
+            foreground="white",
+            fieldbackground="#161b22",
+            fieldforeground="white",
+            borderwidth=0
+        )
+        entry_hasta.set_date(self.entry_fecha.get_date() + timedelta(weeks=12))
+        entry_hasta.grid(row=2, column=0, columnspan=5, sticky="w")
+
+        dias = []
+        for i, nombre in enumerate(("Lun", "Mar", "Mié", "Jue", "Vie")):
+            var = tk.BooleanVar(value=False)
+            tk.Checkbutton(v, text=nombre, variable=var,
+                           bg=COLOR_FONDO, fg="white", selectcolor=COLOR_INPUT_BG,
+                           activebackground=COLOR_FONDO,
+                           font=("Segoe UI", 10)).grid(row=3, column=i, pady=10)
+            dias.append(var)
+
+        def crear():
+            seleccion = [i for i, var in enumerate(dias) if var.get()]
+            if not seleccion:
+                messagebox.showwarning("Advertencia", "Marque al menos un día.", parent=v)
+                return
+            if self._crear_serie(entry_hasta.get(), seleccion, parent=v):
+                v.destroy()
+
+        self._crear_btn(v, "CREAR SERIE", crear, COLOR_BTN_VERDE).grid(
+            row=4, column=0, columnspan=5, sticky="w")
+
+    def _crear_serie(self, fecha_fin, dias_semana, parent):
+        id_cli = self.clientes_dict[self.combo_cliente.get()]
+        id_apa = self.aparatos_dict[self.combo_aparato.get()]
+
+        fecha = self.entry_fecha.get()
+        inicio = self.entry_hora_inicio.get().strip()
+        fin = self.label_hora_fin.cget("text")
+        estado = self.combo_estado.get()
+
+        ok, err = self.controller.validar_reserva(id_cli, id_apa, fecha, inicio, fin)
+        if not ok:
+            messagebox.showerror("Error", err, parent=parent)
+            return False
+
+        try:
+            resultado = self.controller.crear_serie_reservas(
+                id_cli, id_apa, fecha, fecha_fin, dias_semana, inicio, fin, estado
+            )
+        except Exception as e:
+            messagebox.showerror("Error", str(e), parent=parent)
+            return False
+
+        texto = f"Se han creado {len(resultado['creadas'])} reservas."
+        if resultado["conflictos"]:
+            texto += "\n\nNo se pudieron reservar:\n" + "\n".join(
+                f"  {f}  (ocupado {', '.join(f'{h1}-{h2}' for h1, h2 in tramos)})"
+                for f, tramos in resultado["conflictos"].items()
+            )
+
+        messagebox.showinfo("Serie de reservas", texto, parent=parent)
+        self.cargar_reservas()
+        return True
+
     # ---------------------------------------------------------
     #   CRUD
     # ---------------------------------------------------------
@@ -420,6 +563,7 @@ class ReservaView(tk.Frame):
 
         self.combo_estado.current(0)
         self.id_reserva_seleccionada = None
+        self._actualizar_disponibilidad()
 
     def guardar_reserva(self):
         if not self.combo_cliente.get() or not self.combo_aparato.get():
@@ -439,13 +583,39 @@ class ReservaView(tk.Frame):
             messagebox.showerror("Error", err)
             return
 
-        if self.controller.crear_reserva(id_cli, id_apa, fecha, inicio, fin, estado):
+        try:
+            creada = self.controller.crear_reserva(id_cli, id_apa, fecha, inicio, fin, estado)
+        except ErrorConflictoReserva as e:
+            self._avisar_no_disponible(id_cli, id_apa, fecha, inicio, e)
+            return
+
+        if creada:
             messagebox.showinfo("Éxito", "Reserva creada.")
-            self.cargar_reservas()
+            self.tabla.insertar_fila(creada)
             self.limpiar_formulario()
         else:
             messagebox.showerror("Error", "No disponible.")
 
+    def _avisar_no_disponible(self, id_cli, id_apa, fecha, inicio, motivo="No disponible."):
+        """Error con los huecos libres más cercanos (próximos 7 días), buscados en segundo plano."""
+        def mostrar(huecos):
+            if not huecos:
+                messagebox.showerror("Error", str(motivo))
+                return
+
+            lineas = [f"  {h['fecha']}  {h['hora_inicio']}-{h['hora_fin']}" for h in huecos]
+            messagebox.showerror("Error", f"{motivo}\nHuecos más cercanos:\n" + "\n".join(lineas))
+
+        fin_rango = (datetime.strptime(fecha, "%Y-%m-%d") + timedelta(days=6)).strftime("%Y-%m-%d")
+        self.main_window.tareas.ejecutar(
+            self.controller.buscar_huecos_libres,
+            fecha, fin_rango, inicio, id_aparato=id_apa, id_cliente=id_cli, limite=5,
+            al_terminar=mostrar,
+            al_fallar=lambda e: mostrar([]),
+            grupo=self,
+            indicador=self.tabla.indicador
+        )
+
     def modificar_reserva(self):
         if not self.id_reserva_seleccionada:
             messagebox.showwarning("Advertencia", "Seleccione una reserva.")
@@ -464,17 +634,22 @@ class ReservaView(tk.Frame):
             messagebox.showerror("Error", err)
             return
 
-        if self.controller.actualizar_reserva(
+        try:
+            modificada = self.controller.actualizar_reserva(
                 self.id_reserva_seleccionada,
                 id_cliente=id_cli,
                 id_aparato=id_apa,
                 fecha_reserva=fecha,
                 hora_inicio=inicio,
                 hora_fin=fin,
-                estado=estado):
+                estado=estado)
+        except ErrorConflictoReserva as e:
+            messagebox.showerror("Error", str(e))
+            return
 
+        if modificada:
             messagebox.showinfo("Éxito", "Modificada.")
-            self.cargar_reservas()
+            self.tabla.actualizar_fila(modificada)
             self.limpiar_formulario()
         else:
             messagebox.showerror("Error", "No se pudo modificar.")
@@ -486,7 +661,7 @@ class ReservaView(tk.Frame):
 
         if messagebox.askyesno("Confirmar", "¿Eliminar reserva?"):
             self.controller.eliminar_reserva(self.id_reserva_seleccionada)
-            self.cargar_reservas()
+            self.tabla.eliminar_fila(self.id_reserva_seleccionada)
             self.id_reserva_seleccionada = None
 
     # ---------------------------------------------------------
@@ -501,3 +676,52 @@ class ReservaView(tk.Frame):
     def _actualizar_hora_fin(self, e=None):
         h = self.entry_hora_inicio.get().strip()
         self.label_hora_fin.config(text=calcular_hora_fin(h) or "--:--")
+        self._actualizar_disponibilidad()
+
+    def _actualizar_disponibilidad(self, e=None):
+        """Indica si el tramo elegido está libre o cuál es el siguiente hueco."""
+        texto_aparato = self.combo_aparato.get()
+        fecha = self.entry_fecha.get()
+        inicio = self.entry_hora_inicio.get().strip()
+        fin = calcular_hora_fin(inicio)
+
+        if texto_aparato not in self.aparatos_dict or not validar_fecha(fecha) \
+                or not validar_hora(inicio) or not fin:
+            self._cancelar_disponibilidad()
+            self.label_disponibilidad.config(text="")
+            return
+
+        id_apa = self.aparatos_dict[texto_aparato]
+
+        def consultar():
+            # Hilo del pool: si el motor no tiene el día, aquí se lee de la BD
+            if self.controller.verificar_disponibilidad(id_apa, fecha, inicio, fin):
+                return True, None
+            return False, self.controller.primer_tramo_libre(id_apa, fecha, inicio)
+
+        def pintar(resultado):
+            libre, siguiente = resultado
+            if libre:
+                self.label_disponibilidad.config(text="● Tramo libre", fg=COLOR_BTN_VERDE)
+            elif siguiente:
+                self.label_disponibilidad.config(
+                    text=f"● Ocupado · siguiente hueco a las {siguiente}", fg=COLOR_BTN_ROJO
+                )
+            else:
+                self.label_disponibilidad.config(
+                    text="● Ocupado · sin huecos el resto del día", fg=COLOR_BTN_ROJO
+                )
+
+        self._cancelar_disponibilidad()
+        self._tarea_disponibilidad = self.main_window.tareas.ejecutar(
+            consultar,
+            al_terminar=pintar,
+            al_fallar=lambda e: self.label_disponibilidad.config(text=""),
+            grupo=self
+        )
+
+    def _cancelar_disponibilidad(self):
+        # Cada tecla lanza otra consulta: la respuesta de la anterior ya no vale
+        if self._tarea_disponibilidad is not None:
+            self._tarea_disponibilidad.cancelar()
+            self._tarea_disponibilidad = None
@@ -0,0 +1,426 @@
+"""
+Tabla virtual basada en ttk.Treeview.
+
+El Treeview sólo contiene las filas que caben en pantalla: al desplazarse
+se reutilizan esos mismos items cambiando sus valores, así que da igual
+que la tabla tenga 100 o 100.000 registros. Los datos se piden por
+páginas a una función (origen) a medida que el usuario se acerca al
+final de lo ya cargado. La ordenación por columna se hace en memoria,
+así que antes se cargan todas las páginas que falten.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from view.tareas import IndicadorCarga
+
+TAMANO_PAGINA = 100
+
+# Filas de margen: se pide otra página cuando faltan menos que esto
+MARGEN_CARGA = 50
+
+# Tamaño de las páginas que se piden para completar una ordenación
+TAMANO_PAGINA_ORDEN = 1000
+
+ALTO_FILA_DEFECTO = 25
+
+
+class TablaVirtual(tk.Frame):
+    """
+    - columnas: nombres de las columnas (cabeceras)
+    - anchos: {columna: ancho} opcional
+    - origen(despues_de_id, limite) → lista de elementos (una página)
+    - a_fila(elemento) → tupla de valores a mostrar
+    - clave(elemento) → id del elemento (para pedir la página siguiente)
+    - tareas: GestorTareas opcional; si se pasa, las páginas se piden en
+      segundo plano y mientras llega la primera se ve "Cargando…"
+    - al_fallar(excepcion): qué hacer si el origen falla
+
+    `tree` es el Treeview interno: la selección y los valores de la fila
+    seleccionada se leen de él como en cualquier Treeview.
+
+    Tras crear, modificar o borrar un elemento se usa insertar_fila /
+    actualizar_fila / eliminar_fila, que tocan sólo esa fila y conservan
+    el desplazamiento y la selección (recargar() los pierde).
+    """
+
+    def __init__(self, parent, columnas, anchos=None, origen=None, a_fila=None,
+                 clave=None, tamano_pagina=TAMANO_PAGINA, bg=None,
+                 tareas=None, al_fallar=None):
+        super().__init__(parent, bg=bg)
+
+        self.columnas = tuple(columnas)
+        self.origen = origen
+        self.a_fila = a_fila or tuple
+        self.clave = clave
+        self.tamano_pagina = tamano_pagina
+        self.tareas = tareas
+        self.al_fallar = al_fallar
+
+        self._filas = []          # valores de todas las filas cargadas
+        self._por_clave = {}      # id del elemento → su fila en _filas
+        self._inicio = 0          # índice de la primera fila visible
+        self._visibles = 1        # filas que caben en pantalla
+        self._items = []          # items del Treeview (uno por fila visible)
+        self._seleccionada = None # fila seleccionada (aunque salga de pantalla)
+
+        self._ultimo_id = None
+        self._hay_mas = False
+
+        # Página pedida en segundo plano; la generación cambia al recargar
+        # para descartar las respuestas que lleguen tarde
+        self._cargando = False
+        self._generacion = 0
+
+        # (índice de columna, descendente) o None si se respeta el orden de
+        # origen. Mientras queden páginas la ordenación está pendiente: las
+        # filas siguen en el orden de origen y la cabecera lo indica con "…"
+        self._orden = None
+
+        self._crear_widgets(anchos or {})
+
+    # ---------------------------------------------------------
+    #   WIDGETS
+    # ---------------------------------------------------------
+    def _crear_widgets(self, anchos):
+        self.scrollbar_y = ttk.Scrollbar(self, orient="vertical", command=self._scroll_y)
+        self.scrollbar_y.pack(side="right", fill="y")
+
+        self.scrollbar_x = ttk.Scrollbar(self, orient="horizontal")
+        self.scrollbar_x.pack(side="bottom", fill="x")
+
+        self.tree = ttk.Treeview(
+            self, columns=self.columnas, show="headings",
+            xscrollcommand=self.scrollbar_x.set
+        )
+        self.scrollbar_x.config(command=self.tree.xview)
+
+        for col in self.columnas:
+            self.tree.heading(col, text=col, command=lambda c=col: self.ordenar_por(c))
+            self.tree.column(col, width=anchos.get(col, 140))
+
+        self.tree.pack(fill="both", expand=True)
+        self.indicador = IndicadorCarga(self.tree)
+
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar, add="+")
+        self.tree.bind("<MouseWheel>", self._rueda)
+        self.tree.bind("<Button-4>", lambda e: self._desplazar(-3))
+        self.tree.bind("<Button-5>", lambda e: self._desplazar(3))
+        self.tree.bind("<Up>", lambda e: self._tecla(-1))
+        self.tree.bind("<Down>", lambda e: self._tecla(1))
+        self.tree.bind("<Prior>", lambda e: self._desplazar(-self._visibles) or "break")
+        self.tree.bind("<Next>", lambda e: self._desplazar(self._visibles) or "break")
+
+    # ---------------------------------------------------------
+    #   CARGA DE DATOS
+    # ---------------------------------------------------------
+    def recargar(self):
+        """Olvida lo cargado y pide la primera página al origen."""
+        self._descartar_pendiente()
+        self._filas = []
+        self._por_clave = {}
+        self._inicio = 0
+        self._seleccionada = None
+        self._ultimo_id = None
+        self._hay_mas = self.origen is not None
+        self._pintar_cabeceras()
+        self._pintar()
+        self._cargar_si_hace_falta()
+
+    def mostrar(self, elementos):
+        """Muestra una lista ya filtrada (sin paginar contra el origen)."""
+        self._descartar_pendiente()
+        self._filas = self._indexar(elementos, nuevo=True)
+        self._inicio = 0
+        self._seleccionada = None
+        self._hay_mas = False
+        self._aplicar_orden()
+        self._pintar()
+
+    def _cargar_si_hace_falta(self):
+        # Pide páginas hasta tener cubierta la pantalla más el margen, o
+        # todas si hay una ordenación pendiente
+        while (self._hay_mas and not self._cargando
+               and (self._orden or self._inicio + self._visibles + MARGEN_CARGA > len(self._filas))):
+
+            limite = TAMANO_PAGINA_ORDEN if self._orden else self.tamano_pagina
+
+            if self.tareas is None:
+                self._anadir_pagina(self.origen(self._ultimo_id, limite), limite)
+                continue
+
+            self._cargando = True
+            generacion = self._generacion
+            self.tareas.ejecutar(
+                self.origen, self._ultimo_id, limite,
+                al_terminar=lambda elementos: self._pagina_recibida(generacion, elementos, limite),
+                al_fallar=lambda e: self._pagina_fallida(generacion, e),
+                grupo=self,
+                indicador=None if self._filas else self.indicador
+            )
+
+    def _pagina_recibida(self, generacion, elementos, limite):
+        if generacion != self._generacion:
+            return
+        self._cargando = False
+        self._anadir_pagina(elementos, limite)
+        self._pintar()
+        self._cargar_si_hace_falta()
+
+    def _pagina_fallida(self, generacion, error):
+        if generacion != self._generacion:
+            return
+        self._cargando = False
+        self._hay_mas = False
+        # Se ordena lo que haya llegado
+        self._aplicar_orden()
+        self._pintar()
+        if self.al_fallar:
+            self.al_fallar(error)
+        else:
+            print(f"[ERROR] Cargando la tabla: {error}")
+
+    def _descartar_pendiente(self):
+        self._generacion += 1
+        self._cargando = False
+
+    def _anadir_pagina(self, elementos, limite):
+        self._hay_mas = len(elementos) == limite
+        if elementos:
+            self._ultimo_id = self.clave(elementos[-1])
+            self._filas.extend(self._indexar(elementos))
+
+        # Con la última página ya se puede ordenar de verdad
+        self._aplicar_orden()
+
+    def _indexar(self, elementos, nuevo=False):
+        # Convierte los elementos en filas y las apunta por su id
+        if nuevo:
+            self._por_clave = {}
+        filas = []
+        for e in elementos:
+            fila = self.a_fila(e)
+            filas.append(fila)
+            if self.clave:
+                self._por_clave[self.clave(e)] = fila
+        return filas
+
+    # ---------------------------------------------------------
+    #   CAMBIOS FILA A FILA
+    # ---------------------------------------------------------
+    def insertar_fila(self, elemento):
+        """
+        Añade un elemento recién creado: arriba del todo (los orígenes
+        van del id más alto al más bajo) o en su sitio si está ordenada.
+        """
+        if self.clave(elemento) in self._por_clave:
+            self.actualizar_fila(elemento)
+            return
+
+        fila = self.a_fila(elemento)
+        posicion = self._posicion_ordenada(fila) if self._ordenada() else 0
+
+        self._filas.insert(posicion, fila)
+        self._por_clave[self.clave(elemento)] = fila
+
+        # Si entra por encima de lo visible, la ventana baja con ella
+        if posicion < self._inicio:
+            self._inicio += 1
+        self._pintar()
+
+    def actualizar_fila(self, elemento):
+        """Cambia los valores de la fila del elemento (si está cargada)."""
+        clave = self.clave(elemento)
+        anterior = self._por_clave.get(clave)
+        if anterior is None:
+            return False
+
+        posicion = self._posicion(anterior)
+        fila = self.a_fila(elemento)
+        self._filas[posicion] = fila
+        self._por_clave[clave] = fila
+
+        if self._seleccionada is anterior:
+            self._seleccionada = fila
+
+        # Sólo se repinta su item, y sólo si está en pantalla
+        if self._inicio <= posicion < self._inicio + len(self._items):
+            self.tree.item(self._items[posicion - self._inicio], values=fila)
+        return True
+
+    def eliminar_fila(self, clave):
+        """Quita la fila del elemento con ese id (si está cargada)."""
+        fila = self._por_clave.pop(clave, None)
+        if fila is None:
+            return False
+
+        posicion = self._posicion(fila)
+        del self._filas[posicion]
+
+        if self._seleccionada is fila:
+            self._seleccionada = None
+        if posicion < self._inicio:
+            self._inicio -= 1
+
+        self._inicio = max(0, min(self._inicio, len(self._filas) - self._visibles))
+        self._pintar()
+        return True
+
+    def _posicion(self, fila):
+        # Por identidad: dos filas pueden tener los mismos valores
+        return next(i for i, f in enumerate(self._filas) if f is fila)
+
+    def _posicion_ordenada(self, fila):
+        clave = self._clave_orden()
+        valor = clave(fila)
+        descendente = self._orden[1]
+        return next(
+            (i for i, f in enumerate(self._filas)
+             if (clave(f) < valor if descendente else clave(f) > valor)),
+            len(self._filas)
+        )
+
+    # ---------------------------------------------------------
+    #   ORDENACIÓN
+    # ---------------------------------------------------------
+    def ordenar_por(self, columna):
+        """
+        Ordena por la columna (un segundo clic invierte el orden).
+        Si quedan páginas por cargar se piden todas primero; ordenar sólo
+        las cargadas haría saltar filas por encima al ir llegando el resto.
+        """
+        indice = self.columnas.index(columna)
+        descendente = bool(self._orden and self._orden[0] == indice and not self._orden[1])
+        self._orden = (indice, descendente)
+
+        self._aplicar_orden()
+        self._pintar()
+        self._cargar_si_hace_falta()
+
+    def _ordenada(self):
+        return self._orden is not None and not self._hay_mas
+
+    def _aplicar_orden(self):
+        # Ordena las filas si ya están todas; si no, sólo marca la cabecera
+        if self._ordenada():
+            self._filas.sort(key=self._clave_orden(), reverse=self._orden[1])
+            self._inicio = 0
+        self._pintar_cabeceras()
+
+    def _pintar_cabeceras(self):
+        indice, descendente = self._orden or (None, False)
+        for i, col in enumerate(self.columnas):
+            flecha = ""
+            if i == indice:
+                flecha = " ▼" if descendente else " ▲"
+                if self._hay_mas:
+                    flecha += "…"   # ordenación parcial: faltan páginas
+            self.tree.heading(col, text=col + flecha)
+
+    def _clave_orden(self):
+        indice = self._orden[0]
+
+        def clave(fila):
+            valor = fila[indice]
+            # Números antes que textos; los textos sin distinguir mayúsculas
+            try:
+                return (0, float(valor), "")
+            except (TypeError, ValueError):
+                return (1, 0, str(valor or "").lower())
+
+        return clave
+
+    # ---------------------------------------------------------
+    #   DESPLAZAMIENTO Y PINTADO
+    # ---------------------------------------------------------
+    def _al_redimensionar(self, event):
+        alto_fila = ttk.Style().lookup("Treeview", "rowheight")
+        try:
+            alto_fila = int(alto_fila)
+        except (TypeError, ValueError):
+            alto_fila = ALTO_FILA_DEFECTO
+
+        # Se descuenta la cabecera (aprox. una fila)
+        visibles = max(1, event.height // alto_fila - 1)
+        if visibles != self._visibles:
+            self._visibles = visibles
+            self._cargar_si_hace_falta()
+            self._pintar()
+
+    def _al_seleccionar(self, event=None):
+        seleccion = self.tree.selection()
+        if seleccion and seleccion[0] in self._items:
+            self._seleccionada = self._filas[self._inicio + self._items.index(seleccion[0])]
+
+    def _rueda(self, event):
+        self._desplazar(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _tecla(self, paso):
+        # Las flechas mueven la selección; en los bordes desplazan la tabla
+        seleccion = self.tree.selection()
+        if not seleccion or not self._items:
+            return None
+
+        posicion = self._items.index(seleccion[0]) if seleccion[0] in self._items else -1
+        destino = posicion + paso
+
+        if 0 <= destino < len(self._items):
+            return None   # el Treeview lo gestiona solo
+
+        self._desplazar(paso)
+        borde = self._items[0] if paso < 0 else self._items[-1]
+        self.tree.selection_set(borde)
+        self.tree.focus(borde)
+        return "break"
+
+    def _scroll_y(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self._ir_a(int(float(cantidad) * self._total_estimado()))
+        elif accion == "scroll":
+            paso = int(cantidad) * (self._visibles if unidad == "pages" else 1)
+            self._desplazar(paso)
+
+    def _desplazar(self, filas):
+        self._ir_a(self._inicio + filas)
+
+    def _ir_a(self, inicio):
+        self._inicio = max(0, inicio)
+        self._cargar_si_hace_falta()
+        self._inicio = max(0, min(self._inicio, len(self._filas) - self._visibles))
+        self._pintar()
+
+    def _total_estimado(self):
+        # Si quedan páginas se suma una más para que la barra no llegue al final
+        return len(self._filas) + (self.tamano_pagina if self._hay_mas else 0)
+
+    def _pintar(self):
+        """Vuelca en los items del Treeview las filas de la ventana visible."""
+        ventana = self._filas[self._inicio:self._inicio + self._visibles]
+
+        # Reutiliza los items existentes; sólo crea o borra la diferencia
+        while len(self._items) < len(ventana):
+            self._items.append(self.tree.insert("", "end"))
+        while len(self._items) > len(ventana):
+            self.tree.delete(self._items.pop())
+
+        for item, valores in zip(self._items, ventana):
+            self.tree.item(item, values=valores)
+
+        # Los items se reutilizan: la selección sigue a la fila, no al item
+        marcado = next(
+            (item for item, fila in zip(self._items, ventana) if fila is self._seleccionada),
+            None
+        )
+        if marcado is None:
+            if self.tree.selection():
+                self.tree.selection_remove(self.tree.selection())
+        elif self.tree.selection() != (marcado,):
+            self.tree.selection_set(marcado)
+
+        total = self._total_estimado()
+        if total:
+            self.scrollbar_y.set(self._inicio / total, (self._inicio + len(ventana)) / total)
+        else:
+            self.scrollbar_y.set(0, 1)
@@ -0,0 +1,163 @@
+"""
+Tareas en segundo plano para las vistas.
+
+Tkinter no es seguro entre hilos: las consultas a la BD se ejecutan en
+un pool de hilos y el resultado se entrega en el hilo de Tk mediante
+after(), que es el único que toca los widgets.
+"""
+
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+HILOS = 3
+INTERVALO_MS = 40
+
+
+class Tarea:
+    """Una llamada en segundo plano. Si se cancela, su resultado se descarta."""
+
+    def __init__(self, funcion, args, kwargs, al_terminar, al_fallar, grupo, indicador):
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.grupo = grupo
+        self.indicador = indicador
+        self.cancelada = False
+
+    def cancelar(self):
+        self.cancelada = True
+
+
+class GestorTareas:
+    """
+    Ejecuta funciones bloqueantes fuera del hilo de Tk:
+
+        tareas.ejecutar(controller.obtener_todos_pagos,
+                        al_terminar=self._pintar, grupo=self)
+
+    - al_terminar(resultado) / al_fallar(excepcion) se llaman en el hilo de Tk.
+    - grupo: widget dueño de la tarea. cancelar(widget) cancela las de ese
+      widget y las de todos sus hijos (al cambiar de vista).
+    - indicador: IndicadorCarga que se muestra mientras la tarea esté en curso.
+    """
+
+    def __init__(self, root, hilos=HILOS):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="tarea")
+        self._resultados = queue.Queue()
+        self._activas = set()
+
+        self.root.after(INTERVALO_MS, self._sondear)
+
+    def ejecutar(self, funcion, *args, al_terminar=None, al_fallar=None,
+                 grupo=None, indicador=None, **kwargs):
+        tarea = Tarea(funcion, args, kwargs, al_terminar, al_fallar, grupo, indicador)
+        self._activas.add(tarea)
+
+        if indicador is not None:
+            indicador.mostrar()
+
+        self._pool.submit(self._trabajar, tarea)
+        return tarea
+
+    def cancelar(self, grupo):
+        """
+        Cancela las tareas del widget `grupo` y de sus descendientes.
+        Devuelve cuántas había en curso.
+        """
+        ruta = str(grupo)
+        canceladas = 0
+        for tarea in list(self._activas):
+            if tarea.grupo is None:
+                continue
+            ruta_tarea = str(tarea.grupo)
+            if ruta_tarea == ruta or ruta_tarea.startswith(ruta + "."):
+                tarea.cancelar()
+                self._terminar(tarea)
+                canceladas += 1
+        return canceladas
+
+    def cerrar(self):
+        for tarea in list(self._activas):
+            tarea.cancelar()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------------------------------------------
+    #   AUXILIARES
+    # ---------------------------------------------------------
+    def _trabajar(self, tarea):
+        # Hilo del pool: no se toca ningún widget aquí
+        if tarea.cancelada:
+            # Se entrega igualmente (y se descarta) para ocultar su indicador
+            self._resultados.put((tarea, True, None))
+            return
+        try:
+            resultado = tarea.funcion(*tarea.args, **tarea.kwargs)
+            self._resultados.put((tarea, True, resultado))
+        except Exception as e:
+            self._resultados.put((tarea, False, e))
+
+    def _sondear(self):
+        # Hilo de Tk: entrega los resultados que hayan llegado
+        try:
+            while True:
+                tarea, ok, valor = self._resultados.get_nowait()
+                self._entregar(tarea, ok, valor)
+        except queue.Empty:
+            pass
+
+        try:
+            self.root.after(INTERVALO_MS, self._sondear)
+        except tk.TclError:
+            # La ventana principal ya no existe
+            self.cerrar()
+
+    def _entregar(self, tarea, ok, valor):
+        self._terminar(tarea)
+        if tarea.cancelada:
+            return
+
+        if tarea.grupo is not None and not tarea.grupo.winfo_exists():
+            return
+
+        if ok:
+            if tarea.al_terminar:
+                tarea.al_terminar(valor)
+        elif tarea.al_fallar:
+            tarea.al_fallar(valor)
+        else:
+            print(f"[ERROR] Tarea en segundo plano: {valor}")
+
+    def _terminar(self, tarea):
+        # Puede llamarse dos veces (cancelada y luego entregada): sólo cuenta la primera
+        if tarea not in self._activas:
+            return
+        self._activas.discard(tarea)
+        if tarea.indicador is not None:
+            tarea.indicador.ocultar()
+
+
+class IndicadorCarga:
+    """Rótulo 'Cargando…' superpuesto en el centro de un widget."""
+
+    def __init__(self, widget, texto="Cargando…", bg="#151C25", fg="#00d4aa"):
+        self.widget = widget
+        self.label = tk.Label(widget, text=texto, bg=bg, fg=fg,
+                              font=("Segoe UI", 11, "bold"), padx=16, pady=8)
+        self._pendientes = 0
+
+    def mostrar(self):
+        self._pendientes += 1
+        if self._pendientes == 1:
+            self.label.place(relx=0.5, rely=0.5, anchor="center")
+            self.label.lift()
+            self.widget.configure(cursor="watch")
+
+    def ocultar(self):
+        self._pendientes = max(0, self._pendientes - 1)
+        if self._pendientes == 0 and self.label.winfo_exists():
+            self.label.place_forget()
+            self.widget.configure(cursor="")
@@ -0,0 +1,130 @@
+"""
+---------------------------------------------------------
+VENTANA DE ESTADÍSTICAS DE CONSULTAS (ADMINISTRACIÓN)
+Oculta: se abre con Ctrl+Shift+D desde la ventana principal.
+---------------------------------------------------------
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from data.gestor_bd import GestorBD
+from data import instrumentacion
+from resources.style.colores import *
+
+COLUMNAS = (
+    ("llamadas", "Llamadas", 80),
+    ("total_ms", "Total ms", 90),
+    ("media_ms", "Media ms", 90),
+    ("max_ms", "Máx ms", 90),
+    ("filas", "Filas", 80),
+    ("huella", "Consulta", 620),
+)
+
+# Cada cuánto se actualiza la tabla sola mientras la ventana está abierta
+REFRESCO_MS = 2000
+
+
+class VentanaEstadisticas(tk.Toplevel):
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Estadísticas de consultas")
+        self.geometry("1100x520")
+        self.configure(bg=COLOR_FONDO)
+
+        self._programado = None
+        self.configurar_interfaz()
+        self.refrescar()
+
+        self.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+    def configurar_interfaz(self):
+        tk.Label(
+            self,
+            text="Consultas a la base de datos",
+            font=("Segoe UI", 16, "bold"),
+            bg=COLOR_FONDO,
+            fg=COLOR_SECUNDARIO
+        ).pack(pady=(15, 5))
+
+        self.label_info = tk.Label(
+            self, font=("Segoe UI", 9), bg=COLOR_FONDO, fg=COLOR_TEXTO_SECUNDARIO
+        )
+        self.label_info.pack(pady=(0, 10))
+
+        # ---------------------------------------
+        # TABLA
+        # ---------------------------------------
+        frame_tabla = tk.Frame(self, bg=COLOR_FONDO)
+        frame_tabla.pack(fill="both", expand=True, padx=15)
+
+        self.tabla = ttk.Treeview(
+            frame_tabla, columns=[c[0] for c in COLUMNAS], show="headings"
+        )
+        for clave, titulo, ancho in COLUMNAS:
+            self.tabla.heading(clave, text=titulo)
+            self.tabla.column(
+                clave, width=ancho, anchor="w" if clave == "huella" else "e",
+                stretch=clave == "huella"
+            )
+
+        scroll = ttk.Scrollbar(frame_tabla, orient="vertical", command=self.tabla.yview)
+        self.tabla.configure(yscrollcommand=scroll.set)
+        self.tabla.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+
+        # ---------------------------------------
+        # BOTONES
+        # ---------------------------------------
+        frame_btn = tk.Frame(self, bg=COLOR_FONDO)
+        frame_btn.pack(pady=15)
+
+        for columna, (texto, comando, color) in enumerate((
+            ("Actualizar", self.refrescar, COLOR_SECUNDARIO),
+            ("Poner a cero", self.reiniciar, COLOR_ADVERTENCIA),
+            ("Cerrar", self.cerrar, COLOR_NEUTRAL),
+        )):
+            tk.Button(
+                frame_btn,
+                text=texto,
+                command=comando,
+                bg=color,
+                fg="white" if color != COLOR_SECUNDARIO else "#151C25",
+                activebackground="white",
+                activeforeground=color,
+                font=("Segoe UI", 10, "bold"),
+                relief="flat",
+                cursor="hand2",
+                width=15,
+                pady=5
+            ).grid(row=0, column=columna, padx=10)
+
+    # ---------------------------------------------------------
+    # DATOS
+    # ---------------------------------------------------------
+    def refrescar(self):
+        if self._programado is not None:
+            self.after_cancel(self._programado)
+
+        filas = GestorBD.estadisticas_consultas()
+
+        self.tabla.delete(*self.tabla.get_children())
+        for fila in filas:
+            self.tabla.insert("", "end", values=[fila[c[0]] for c in COLUMNAS])
+
+        self.label_info.config(
+            text=f"{len(filas)} consultas distintas  ·  lentas (≥ {instrumentacion.UMBRAL_LENTA_MS:g} ms) "
+                 f"en {instrumentacion.RUTA_LOG}"
+        )
+
+        self._programado = self.after(REFRESCO_MS, self.refrescar)
+
+    def reiniciar(self):
+        GestorBD.reiniciar_estadisticas()
+        self.refrescar()
+
+    def cerrar(self):
+        if self._programado is not None:
+            self.after_cancel(self._programado)
+            self._programado = None
+        self.destroy()